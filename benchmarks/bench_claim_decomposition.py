@@ -0,0 +1,115 @@
+# /home/ubuntu/fact_checker_backend/benchmarks/bench_claim_decomposition.py
+"""
+Benchmark: wall time of verifying compound statements, whole vs split into sub-claims.
+
+Drives verify_statement() against the fixture server (see fixture_server.py) with the
+caches and verdict store disabled, for statements that decompose into several sub-claims,
+in three modes:
+
+    whole       decomposition off: the statement is one search and one verdict (the old behaviour)
+    sequential  every sub-claim verified with its own verify_statement() call, one after another
+    parallel    verify_statement() on the statement: sub-claims verified concurrently, merged
+
+Reports p50/p95 wall time per statement, and per statement the searches and page fetches
+that reached the fixture server.
+
+Usage:
+    python benchmarks/bench_claim_decomposition.py [--iterations 10] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_pipeline import configure_environment, summarize  # noqa: E402
+from benchmarks.fixture_server import FixtureServer  # noqa: E402
+
+STATEMENTS = [
+    "The Eiffel Tower was completed in 1889 and later became the most visited monument in Paris.",
+    "Water boils at 100 degrees Celsius at sea level; ice melts at 0 degrees Celsius.",
+    "The moon is made of rock and was formed about 4.5 billion years ago, but it has no atmosphere.",
+    "The Great Wall of China was built over many centuries and is not visible from space with the naked eye.",
+]
+MODES = ("whole", "sequential", "parallel")
+
+
+async def run_benchmark(server: FixtureServer, iterations: int, modes: list[str]) -> dict:
+    from src.services import claim_decomposition
+    from src.services.claim_decomposition import decompose_statement
+    from src.services.cpu_executor import cpu_executor
+    from src.services.http_client import close_http_client
+    from src.services.verification_service import verify_statement
+
+    report = {}
+    try:
+        for statement in STATEMENTS: # Warm up connections and the executor
+            await verify_statement(statement)
+        for mode in modes:
+            latencies, searches, fetches, errors = [], 0, 0, 0
+            for i in range(iterations):
+                statement = STATEMENTS[i % len(STATEMENTS)]
+                server.reset_counters()
+                started = time.perf_counter()
+                if mode == "whole":
+                    claim_decomposition.DECOMPOSE_CLAIMS = False
+                    try:
+                        results = [await verify_statement(statement)]
+                    finally:
+                        claim_decomposition.DECOMPOSE_CLAIMS = True
+                elif mode == "sequential":
+                    results = [await verify_statement(sub_claim) for sub_claim in decompose_statement(statement)]
+                else:
+                    results = [await verify_statement(statement)]
+                latencies.append(time.perf_counter() - started)
+                if any(result["is_true"] is None and not result.get("sources") for result in results):
+                    errors += 1
+                searches += server.searches
+                fetches += server.requests - server.searches
+            report[mode] = {**summarize(latencies), "searches_per_statement": round(searches / iterations, 1),
+                            "fetches_per_statement": round(fetches / iterations, 1), "failed": errors}
+    finally:
+        await close_http_client()
+        cpu_executor.shutdown()
+    return report
+
+
+def print_report(report: dict):
+    print(f"{'mode':<12}{'p50 ms':>10}{'p95 ms':>10}{'searches':>10}{'fetches':>9}{'failed':>8}")
+    for mode, row in report.items():
+        print(f"{mode:<12}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['searches_per_statement']:>10.1f}"
+              f"{row['fetches_per_statement']:>9.1f}{row['failed']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=12, help="Statements verified per mode")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Delay the fixture server adds to every response")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+
+    server = FixtureServer(latency_ms=args.latency_ms).start()
+    configure_environment(server.base_url, warm=False)
+    try:
+        report = asyncio.run(run_benchmark(server, args.iterations, modes))
+    finally:
+        server.stop()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# /home/ubuntu/fact_checker_backend/benchmarks/bench_event_loop_latency.py
+"""
+Benchmark: event-loop latency while many large documents are analysed concurrently.
+
+A probe task sleeps for a short interval in a loop and records how late it wakes up;
+meanwhile N documents are scored with analyze_content_for_statement(). With analysis on
+the event loop ("inline") the probe stalls for the whole scoring of each document; with
+the CPU executor ("thread" / "process") its lag should stay flat.
+
+Usage:
+    python benchmarks/bench_event_loop_latency.py [--docs 50] [--doc-kb 50] [--workers 4] [--kinds inline,thread,process]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.analysis_service import analyze_content_for_statement  # noqa: E402
+from src.services.cpu_executor import cpu_executor  # noqa: E402
+
+PROBE_INTERVAL_S = 0.005
+STATEMENT = "The Eiffel Tower is in Paris."
+FILLER_WORDS = ("the", "tower", "city", "was", "built", "iron", "visitors", "france", "paris", "engineer",
+                "history", "century", "structure", "height", "metres", "public", "exhibition", "design")
+
+
+def make_document(rng: random.Random, size_bytes: int) -> str:
+    sentences, length = [], 0
+    while length < size_bytes:
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(8, 20))]
+        if rng.random() < 0.02:
+            words += ["this", "is", "true"]
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def probe(lags: list[float], stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + PROBE_INTERVAL_S
+        await asyncio.sleep(PROBE_INTERVAL_S)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_kind(kind: str, workers: int, documents: list[str]) -> dict:
+    cpu_executor.configure(kind, workers)
+    # Warm up: start the pool (and load lexicons in each worker) outside the measurement
+    await asyncio.gather(*(analyze_content_for_statement(STATEMENT, [], []) for _ in range(workers)))
+
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        analyze_content_for_statement(
+            STATEMENT,
+            [{"title": f"doc {i}", "link": f"https://example.com/doc/{i}", "snippet": "The Eiffel Tower is in Paris."}],
+            [{"url": f"https://example.com/doc/{i}", "content": document}])
+        for i, document in enumerate(documents)
+    ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+    cpu_executor.shutdown()
+
+    lags.sort()
+    return {
+        "kind": kind,
+        "elapsed_s": elapsed,
+        "lag_p50_ms": percentile(lags, 50) * 1000,
+        "lag_p99_ms": percentile(lags, 99) * 1000,
+        "lag_max_ms": (lags[-1] if lags else 0.0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--doc-kb", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--kinds", default="inline,thread,process")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    documents = [make_document(rng, args.doc_kb * 1024) for _ in range(args.docs)]
+
+    print(f"{args.docs} documents x {args.doc_kb} KB, {args.workers} workers, probe every {PROBE_INTERVAL_S * 1000:.0f} ms")
+    print(f"{'executor':>9} {'total s':>9} {'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11}")
+    for kind in args.kinds.split(","):
+        report = asyncio.run(run_kind(kind.strip(), args.workers, documents))
+        print(f"{report['kind']:>9} {report['elapsed_s']:9.2f} {report['lag_p50_ms']:11.2f} "
+              f"{report['lag_p99_ms']:11.2f} {report['lag_max_ms']:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
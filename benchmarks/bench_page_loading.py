@@ -0,0 +1,125 @@
+# /home/ubuntu/fact_checker_backend/benchmarks/bench_page_loading.py
+"""
+Benchmark: bytes transferred and time-to-text of browser page loads, with and without request blocking.
+
+Loads the heavy fixture pages (images, video, fonts, stylesheets, a script bundle and
+third-party ad/analytics scripts) in the pooled browser the way the browser tier does,
+in these modes:
+
+    full                no request filter, JavaScript on (the old behaviour)
+    blocked             request_blocking.RequestFilter, JavaScript on
+    blocked_no_js       the filter plus a context with JavaScript disabled
+    blocked_by_url      the filter routing only the URLs it may block (BROWSER_ROUTE_BY_URL)
+
+Time-to-text is goto(wait_until="domcontentloaded") plus inner_text("body"); bytes and
+requests are what the fixture server sent for the load, until the page's context was
+closed, and "routed" the requests that made the round trip through the filter. The
+fixture pages' third-party resources come from "localhost", which stands in for the
+blocklisted ad hosts here.
+
+Usage:
+    python benchmarks/bench_page_loading.py [--iterations 20] [--latency-ms 20] [--modes full,blocked,blocked_no_js]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_pipeline import summarize  # noqa: E402
+from benchmarks.fixture_server import FixtureServer  # noqa: E402
+from src.services.browser_pool import browser_pool  # noqa: E402
+from src.services.lexicons import DomainIndex  # noqa: E402
+from src.services.request_blocking import BROWSER_REQUESTS, RequestFilter  # noqa: E402
+
+SETTLE_S = 0.05 # Lets the server finish writing responses that were cut off by the context closing
+MODES = {
+    "full": (None, True),
+    "blocked": (RequestFilter(blocked_hosts=DomainIndex(["localhost"])), True),
+    "blocked_no_js": (RequestFilter(blocked_hosts=DomainIndex(["localhost"])), False),
+    "blocked_by_url": (RequestFilter(blocked_hosts=DomainIndex(["localhost"]), route_by_url=True), True),
+}
+
+
+def _routed_requests() -> float:
+    return sum(BROWSER_REQUESTS.value(decision=decision) for decision in ("allowed", "blocked_type", "blocked_host"))
+
+
+async def load_page(server: FixtureServer, url: str, request_filter, javascript: bool) -> dict:
+    server.reset_counters()
+    routed_before = _routed_requests()
+    started = time.perf_counter()
+    async with browser_pool.page(java_script_enabled=javascript) as page:
+        if request_filter is not None:
+            await request_filter.install(page)
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        text = await page.inner_text("body")
+        time_to_text = time.perf_counter() - started
+    await asyncio.sleep(SETTLE_S)
+    return {"seconds": time_to_text, "bytes": server.bytes_sent, "requests": server.requests, "chars": len(text),
+            "routed": _routed_requests() - routed_before}
+
+
+async def run_benchmark(server: FixtureServer, iterations: int, modes: list[str]) -> dict:
+    await browser_pool.start()
+    try:
+        urls = [server.base_url + path for path in server.heavy_page_paths]
+        await load_page(server, urls[0], None, True) # Warm up the browser
+        report = {}
+        for mode in modes:
+            request_filter, javascript = MODES[mode]
+            loads = [await load_page(server, urls[i % len(urls)], request_filter, javascript) for i in range(iterations)]
+            report[mode] = {
+                **summarize([load["seconds"] for load in loads]),
+                "kb_per_page": round(sum(load["bytes"] for load in loads) / len(loads) / 1024, 1),
+                "requests_per_page": round(sum(load["requests"] for load in loads) / len(loads), 1),
+                "routed_per_page": round(sum(load["routed"] for load in loads) / len(loads), 1),
+                "text_chars": round(sum(load["chars"] for load in loads) / len(loads)),
+            }
+        return report
+    finally:
+        await browser_pool.stop()
+
+
+def print_report(report: dict):
+    full = report.get("full")
+    print(f"{'mode':<19}{'p50 ms':>10}{'p95 ms':>10}{'KB/page':>10}{'requests':>10}{'routed':>8}{'chars':>8}"
+          f"{'bytes vs full':>15}")
+    for mode, row in report.items():
+        ratio = f"{row['kb_per_page'] / full['kb_per_page']:.0%}" if full and full["kb_per_page"] else "-"
+        print(f"{mode:<19}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['kb_per_page']:>10.1f}"
+              f"{row['requests_per_page']:>10.1f}{row['routed_per_page']:>8.1f}{row['text_chars']:>8}{ratio:>15}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20, help="Page loads per mode")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Delay the fixture server adds to every response")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+
+    os.environ.setdefault("NO_PROXY", "127.0.0.1,localhost")
+    server = FixtureServer(latency_ms=args.latency_ms).start()
+    try:
+        report = asyncio.run(run_benchmark(server, args.iterations, modes))
+    finally:
+        server.stop()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# /home/ubuntu/fact_checker_backend/benchmarks/bench_phrase_matcher.py
+"""
+Microbenchmark: PhraseMatcher vs. one substring scan per phrase (the old analysis approach).
+
+Usage:
+    python benchmarks/bench_phrase_matcher.py [--doc-kb 100] [--phrases 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.phrase_matcher import PhraseMatcher, word_tokens  # noqa: E402
+
+
+def make_vocabulary(rng: random.Random, size: int) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def make_document(rng: random.Random, vocabulary: list[str], size_bytes: int) -> str:
+    words, length = [], 0
+    while length < size_bytes:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def make_phrases(rng: random.Random, vocabulary: list[str], count: int) -> list[str]:
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))) for _ in range(count)]
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--doc-kb", type=int, default=100)
+    parser.add_argument("--phrases", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng, 5000)
+    document = make_document(rng, vocabulary, args.doc_kb * 1024)
+    phrases = make_phrases(rng, vocabulary, args.phrases)
+
+    started = time.perf_counter()
+    matcher = PhraseMatcher(phrases)
+    build_s = time.perf_counter() - started
+
+    def substring_scan():
+        text = document.lower()
+        return [phrase for phrase in phrases if phrase in text]
+
+    def matcher_scan():
+        return matcher.find_in_tokens(word_tokens(document))
+
+    substring_s = best_of(args.repeat, substring_scan)
+    matcher_s = best_of(args.repeat, matcher_scan)
+
+    print(f"document: {len(document) / 1024:.0f} KB, lexicon: {len(phrases)} phrases")
+    print(f"matcher build (once per lexicon): {build_s * 1000:8.2f} ms")
+    print(f"substring scan per phrase:        {substring_s * 1000:8.2f} ms")
+    print(f"PhraseMatcher single pass:        {matcher_s * 1000:8.2f} ms")
+    print(f"speedup:                          {substring_s / matcher_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
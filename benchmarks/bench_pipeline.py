@@ -0,0 +1,287 @@
+# /home/ubuntu/fact_checker_backend/benchmarks/bench_pipeline.py
+"""
+Offline benchmark and regression check for the verification pipeline.
+
+Replays recorded search-result and article pages from a local fixture server (see
+fixture_server.py), so no network access is needed, and drives:
+    search      perform_web_search()           (SEARCH_BACKEND=http against the fixture search page)
+    retrieve    retrieve_content_from_url()    (HTTP tier against the fixture articles)
+    analyze     analyze_content_for_statement() on pre-retrieved fixture content
+    api_verify  POST /api/verify through the Quart test client (the whole pipeline)
+
+Reports p50/p95/p99 latency and throughput per scenario, p50/p95/p99 per pipeline stage
+(from the spans the services log) and peak RSS. With a baseline file, exits with status 1
+if the p50/p95 latency of any scenario or stage, a scenario's throughput or error count,
+or the peak RSS regressed beyond the tolerance.
+
+Caches and the verdict store are disabled by default so every iteration does the full
+work; --warm keeps them (the verdict store then lives in memory).
+
+Usage:
+    python benchmarks/bench_pipeline.py [--iterations 100] [--concurrency 10] [--latency-ms 5]
+    python benchmarks/bench_pipeline.py --write-baseline        # record benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json --tolerance 0.5
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import FixtureServer  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+STATEMENTS = [
+    "The Eiffel Tower is in Paris.",
+    "The moon is made of green cheese.",
+    "Water boils at 100 degrees Celsius at sea level.",
+    "The Great Wall of China is visible from space with the naked eye.",
+    "The Eiffel Tower is in Berlin.",
+]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies_s: list[float]) -> dict:
+    values = sorted(latencies_s)
+    return {name: round(percentile(values, pct) * 1000, 2) for name, pct in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99))}
+
+
+def peak_rss_mb() -> dict:
+    # ru_maxrss is in KiB on Linux and bytes on macOS; children only count once reaped
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+class SpanRecorder(logging.Handler):
+    """Collects the durations of the "span" records logged by src.services.metrics.span."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.durations = defaultdict(list) # stage -> [seconds]
+
+    def emit(self, record):
+        fields = getattr(record, "fields", None)
+        if fields and "span" in fields and fields.get("outcome") == "ok":
+            self.durations[fields["span"]].append(fields["duration_ms"] / 1000)
+
+
+def configure_environment(base_url: str, warm: bool):
+    # Must run before the services are imported: their settings are read at import time
+    os.environ["SEARCH_BACKEND"] = "http"
+    os.environ["SEARCH_BASE_URL"] = f"{base_url}/search"
+    os.environ.setdefault("NO_PROXY", "127.0.0.1,localhost")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Every fixture page is on one host; per-host limits would measure the throttle, not the pipeline
+    os.environ.setdefault("HOST_RATE_PER_S", "0")
+    os.environ.setdefault("HOST_INITIAL_CONCURRENCY", "64")
+    os.environ.setdefault("HOST_MAX_CONCURRENCY", "64")
+    if warm:
+        os.environ["VERDICT_STORE_URL"] = "sqlite:///:memory:"
+        os.environ["SHARED_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="bench-cache-"), "cache.db")
+    if not warm:
+        os.environ["CONTENT_CACHE_MAX_BYTES"] = "0"
+        os.environ["SEARCH_CACHE_MAX_ENTRIES"] = "0"
+        os.environ["VERDICT_STORE_URL"] = ""
+        os.environ["SHARED_CACHE_PATH"] = ""
+
+
+async def run_scenario(name: str, call, inputs: list, iterations: int, concurrency: int) -> dict:
+    """Runs `call(input)` `iterations` times from `concurrency` concurrent workers; call returns True on success."""
+    latencies, errors = [], 0
+    counter = itertools.count()
+    input_cycle = itertools.cycle(inputs)
+
+    async def worker():
+        nonlocal errors
+        while next(counter) < iterations:
+            item = next(input_cycle)
+            started = time.perf_counter()
+            try:
+                ok = await call(item)
+            except Exception as e:
+                logging.getLogger(__name__).warning("%s iteration failed: %r", name, e)
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += 0 if ok else 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {**summarize(latencies), "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            "iterations": len(latencies), "errors": errors}
+
+
+async def run_benchmark(server: FixtureServer, iterations: int, concurrency: int, scenarios: list[str]) -> dict:
+    from src.main import app
+    from src.services.analysis_service import analyze_content_for_statement
+    from src.services.content_retrieval_service import retrieve_content_from_url, retrieve_page
+    from src.services.cpu_executor import cpu_executor
+    from src.services.http_client import close_http_client
+    from src.services.search_service import perform_web_search
+
+    recorder = SpanRecorder()
+    span_logger = logging.getLogger("src.services.metrics")
+    span_logger.setLevel(logging.DEBUG)
+    span_logger.propagate = False # Keep span records out of the regular log output
+    span_logger.addHandler(recorder)
+
+    page_urls = [server.base_url + path for path in server.page_paths]
+
+    async def search(statement):
+        results = await perform_web_search(statement, num_results=6)
+        return bool(results) and results[0]["title"] != "Error"
+
+    async def retrieve(url):
+        content = await retrieve_content_from_url(url)
+        return bool(content) and not content.startswith("Error:")
+
+    # Inputs for the analysis scenario are retrieved once, up front
+    fixture_results = await perform_web_search(STATEMENTS[0], num_results=6)
+    fixture_pages = [await retrieve_page(result["link"]) for result in fixture_results]
+
+    async def analyze(statement):
+        verdict = await analyze_content_for_statement(statement, fixture_results, fixture_pages)
+        return "confidence_score" in verdict
+
+    client = app.test_client()
+
+    async def api_verify(statement):
+        response = await client.post("/api/verify", json={"statement": statement})
+        body = await response.get_json()
+        return response.status_code == 200 and bool(body.get("sources"))
+
+    calls = {"search": (search, STATEMENTS), "retrieve": (retrieve, page_urls),
+             "analyze": (analyze, STATEMENTS), "api_verify": (api_verify, STATEMENTS)}
+    # Warm-up (executor workers, lexicons, connection pool) outside the measurements
+    for name in scenarios:
+        call, inputs = calls[name]
+        await call(inputs[0])
+    recorder.durations.clear()
+
+    report = {"scenarios": {}, "stages": {}}
+    for name in scenarios:
+        call, inputs = calls[name]
+        report["scenarios"][name] = await run_scenario(name, call, inputs, iterations, concurrency)
+    report["stages"] = {stage: {**summarize(durations), "count": len(durations)}
+                        for stage, durations in sorted(recorder.durations.items())}
+
+    await close_http_client()
+    cpu_executor.shutdown()
+    span_logger.removeHandler(recorder)
+    return report
+
+
+def find_regressions(report: dict, baseline: dict, tolerance: float, slack_ms: float) -> list[str]:
+    """Compares a report with a baseline; latencies may grow by `tolerance` (relative) plus `slack_ms`."""
+    regressions = []
+
+    def check_latencies(kind, name, current, base):
+        # p99 is reported but not gated: with a few hundred samples it is a handful of outliers
+        for key in ("p50_ms", "p95_ms"):
+            limit = base[key] * (1 + tolerance) + slack_ms
+            if current[key] > limit:
+                regressions.append(f"{kind} {name}: {key} {current[key]} > {round(limit, 2)} (baseline {base[key]})")
+
+    for name, base in baseline.get("scenarios", {}).items():
+        current = report["scenarios"].get(name)
+        if current is None:
+            continue
+        check_latencies("scenario", name, current, base)
+        limit = base["throughput_rps"] * (1 - tolerance)
+        if current["throughput_rps"] < limit:
+            regressions.append(f"scenario {name}: throughput {current['throughput_rps']} rps < {round(limit, 2)} "
+                               f"(baseline {base['throughput_rps']})")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"scenario {name}: {current['errors']} errors (baseline {base.get('errors', 0)})")
+    for stage, base in baseline.get("stages", {}).items():
+        if stage in report["stages"]:
+            check_latencies("stage", stage, report["stages"][stage], base)
+    base_rss = baseline.get("peak_rss_mb", {}).get("self")
+    if base_rss and report["peak_rss_mb"]["self"] > base_rss * (1 + tolerance):
+        regressions.append(f"peak RSS {report['peak_rss_mb']['self']} MB > {round(base_rss * (1 + tolerance), 1)} MB "
+                           f"(baseline {base_rss} MB)")
+    return regressions
+
+
+def print_report(report: dict):
+    print(f"{'scenario':<12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>9} {'errors':>7}")
+    for name, row in report["scenarios"].items():
+        print(f"{name:<12} {row['p50_ms']:9.2f} {row['p95_ms']:9.2f} {row['p99_ms']:9.2f} "
+              f"{row['throughput_rps']:9.2f} {row['errors']:7d}")
+    print(f"\n{'stage':<16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'count':>7}")
+    for stage, row in report["stages"].items():
+        print(f"{stage:<16} {row['p50_ms']:9.2f} {row['p95_ms']:9.2f} {row['p99_ms']:9.2f} {row['count']:7d}")
+    rss = report["peak_rss_mb"]
+    print(f"\npeak RSS: {rss['self']} MB (server process), {rss['children']} MB (largest executor worker)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100, help="Iterations per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Delay the fixture server adds to every response")
+    parser.add_argument("--scenarios", default="search,retrieve,analyze,api_verify")
+    parser.add_argument("--warm", action="store_true", help="Keep the content and search caches enabled")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against (skipped if missing)")
+    parser.add_argument("--write-baseline", action="store_true", help="Store this run as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative regression (0.5 = 50%%)")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="Allowed absolute latency regression on top of the tolerance")
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    server = FixtureServer(latency_ms=args.latency_ms).start()
+    configure_environment(server.base_url, args.warm)
+    try:
+        report = asyncio.run(run_benchmark(server, args.iterations, args.concurrency,
+                                           [name.strip() for name in args.scenarios.split(",")]))
+    finally:
+        server.stop()
+    report["peak_rss_mb"] = peak_rss_mb()
+    report["config"] = {"iterations": args.iterations, "concurrency": args.concurrency,
+                        "latency_ms": args.latency_ms, "warm": args.warm}
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.write_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --write-baseline to record one.")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != report["config"]:
+        print(f"\nWarning: baseline was recorded with {baseline.get('config')}")
+    regressions = find_regressions(report, baseline, args.tolerance, args.slack_ms)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
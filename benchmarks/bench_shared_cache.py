@@ -0,0 +1,162 @@
+# /home/ubuntu/fact_checker_backend/benchmarks/bench_shared_cache.py
+"""
+Benchmark: content cache hit rate and memory as the number of worker processes grows.
+
+Each worker process runs the real ContentCache against the same Zipf-distributed stream
+of page URLs (every worker sees different requests from the same popular set), storing a
+synthetic page on every miss, like retrieve_page() does. Two modes:
+
+    private  per-worker memory cache only (SHARED_CACHE_PATH=""), sized like the old default
+    shared   a small per-worker memory tier in front of one shared cache file for all workers
+
+Reported per worker count: overall hit rate, misses (= page fetches the node would make),
+lookups/s, and the memory the workers added during the run: the sum of their RSS growth,
+and of their PSS (proportional set size, which splits pages shared between processes,
+such as the shared cache's memory map, among them).
+
+Usage:
+    python benchmarks/bench_shared_cache.py [--workers 1,2,4,8,16] [--lookups 3000] [--urls 2000] [--page-kb 20]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PRIVATE_MEMORY_BYTES = 64 * 1024 * 1024 # The per-worker memory tier before the shared cache existed
+WORDS = ("tower", "paris", "iron", "visitors", "engineer", "built", "height", "metres", "structure", "public",
+         "exhibition", "design", "century", "history", "france", "lattice", "observation", "platform")
+
+
+def memory_kb() -> dict:
+    """This process's RSS and PSS in KB (PSS is 0 where /proc/self/smaps_rollup is unavailable)."""
+    values = {"rss": 0, "pss": 0}
+    for path, field, name in (("/proc/self/status", "VmRSS:", "rss"), ("/proc/self/smaps_rollup", "Pss:", "pss")):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(field):
+                        values[name] = int(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return values
+
+
+def zipf_weights(n: int, s: float = 1.0) -> list[float]:
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def make_page(url: str, size_bytes: int) -> str:
+    rng = random.Random(url)
+    words, length = [], 0
+    while length < size_bytes:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def run_worker(args):
+    """Runs in a fresh process: configures the caches through the environment, then replays lookups."""
+    worker_id, env, urls, lookups, page_bytes, start_event = args
+    os.environ.update(env)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from src.services.content_cache import ContentCache  # noqa: E402 (configured by the environment above)
+
+    cache = ContentCache()
+    rng = random.Random(worker_id)
+    weights = zipf_weights(len(urls))
+    stream = rng.choices(urls, weights=weights, k=lookups)
+
+    async def replay():
+        hits = 0
+        for url in stream:
+            entry = await cache.get(url)
+            if entry is not None and cache.is_fresh(entry):
+                hits += 1
+            else:
+                await cache.put(url, make_page(url, page_bytes), "http")
+        return hits
+
+    before = memory_kb()
+    start_event.wait()
+    started = time.perf_counter()
+    hits = asyncio.run(replay())
+    elapsed = time.perf_counter() - started
+    after = memory_kb()
+    return {"hits": hits, "lookups": lookups, "seconds": elapsed,
+            "rss_kb": after["rss"] - before["rss"], "pss_kb": after["pss"] - before["pss"]}
+
+
+def run_mode(mode: str, workers: int, urls: list[str], lookups: int, page_bytes: int, cache_dir: str,
+             shared_memory_mb: float = None) -> dict:
+    if mode == "private":
+        env = {"SHARED_CACHE_PATH": "", "CONTENT_CACHE_MAX_BYTES": str(PRIVATE_MEMORY_BYTES)}
+    else:
+        path = os.path.join(cache_dir, f"cache-{workers}.db")
+        env = {"SHARED_CACHE_PATH": path}
+        if shared_memory_mb is not None:
+            env["CONTENT_CACHE_MAX_BYTES"] = str(int(shared_memory_mb * 1024 * 1024))
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        start_event = manager.Event()
+        with context.Pool(workers) as pool:
+            pending = pool.map_async(run_worker, [(i, env, urls, lookups, page_bytes, start_event) for i in range(workers)])
+            time.sleep(0.5 + 0.1 * workers) # Let every worker import and take its "before" snapshot
+            start_event.set()
+            results = pending.get()
+    total_lookups = sum(r["lookups"] for r in results)
+    total_hits = sum(r["hits"] for r in results)
+    return {
+        "hit_rate": round(total_hits / total_lookups, 4),
+        "misses": total_lookups - total_hits,
+        "lookups_per_s": round(total_lookups / max(r["seconds"] for r in results), 1),
+        "rss_mb": round(sum(r["rss_kb"] for r in results) / 1024, 1),
+        "pss_mb": round(sum(r["pss_kb"] for r in results) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4,8,16", help="Comma-separated worker counts")
+    parser.add_argument("--lookups", type=int, default=3000, help="Lookups per worker")
+    parser.add_argument("--urls", type=int, default=2000, help="Distinct page URLs")
+    parser.add_argument("--page-kb", type=int, default=20, help="Size of each cached page")
+    parser.add_argument("--modes", default="private,shared")
+    parser.add_argument("--shared-memory-mb", type=float,
+                        help="Per-worker memory tier in shared mode (default: CONTENT_CACHE_MAX_BYTES's default)")
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    urls = [f"https://example{i % 97}.org/article/{i}" for i in range(args.urls)]
+    worker_counts = [int(n) for n in args.workers.split(",") if n.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    cache_dir = tempfile.mkdtemp(prefix="bench-shared-cache-")
+    report = {}
+    try:
+        print(f"{'mode':<9}{'workers':>8}{'hit rate':>10}{'misses':>9}{'lookups/s':>11}{'RSS MB':>9}{'PSS MB':>9}")
+        for mode in modes:
+            for workers in worker_counts:
+                row = run_mode(mode, workers, urls, args.lookups, args.page_kb * 1024, cache_dir, args.shared_memory_mb)
+                report.setdefault(mode, {})[workers] = row
+                print(f"{mode:<9}{workers:>8}{row['hit_rate']:>10.1%}{row['misses']:>9}{row['lookups_per_s']:>11.1f}"
+                      f"{row['rss_mb']:>9.1f}{row['pss_mb']:>9.1f}", flush=True)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# /home/ubuntu/fact_checker_backend/benchmarks/fixture_server.py
+"""
+Local HTTP server replaying recorded search-result and article pages, so the pipeline
+can be exercised without network access.
+
+Routes:
+    /search?q=...   benchmarks/fixtures/search/brave_results.html (for every query)
+    /pages/<name>   benchmarks/fixtures/pages/<name>, with an ETag (answers 304 to If-None-Match)
+    /heavy/<name>   benchmarks/fixtures/heavy/<name>: pages with the images, fonts, styles and
+                    ad scripts of a real site; {{THIRD_PARTY_ORIGIN}} becomes http://localhost:<port>
+    /assets/<name>  synthetic page resources, sized by extension (see ASSET_SIZES)
+
+The server counts the requests it answered, the searches among them and the body bytes
+it sent (`requests`, `searches`, `bytes_sent`), so benchmarks can measure what a page
+load or a verification transferred.
+
+Usage (standalone, to point a running server at it):
+    python benchmarks/fixture_server.py --port 8765 --latency-ms 20
+    SEARCH_BACKEND=http SEARCH_BASE_URL=http://127.0.0.1:8765/search hypercorn src.main:app
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SEARCH_FIXTURE = os.path.join(FIXTURE_DIR, "search", "brave_results.html")
+PAGES_DIR = os.path.join(FIXTURE_DIR, "pages")
+HEAVY_DIR = os.path.join(FIXTURE_DIR, "heavy")
+
+# Body sizes of synthetic /assets/ resources (typical of news article pages), and their types
+ASSET_SIZES = {".jpg": 180_000, ".png": 40_000, ".gif": 43, ".mp4": 900_000, ".woff2": 60_000,
+               ".css": 45_000, ".js": 120_000, ".webmanifest": 600}
+ASSET_TYPES = {".jpg": "image/jpeg", ".png": "image/png", ".gif": "image/gif", ".mp4": "video/mp4",
+               ".woff2": "font/woff2", ".css": "text/css", ".js": "application/javascript",
+               ".webmanifest": "application/manifest+json"}
+
+
+def load_fixtures() -> dict:
+    """Returns {path: (body bytes, etag)} for every fixture page."""
+    fixtures = {}
+    for name in sorted(os.listdir(PAGES_DIR)):
+        with open(os.path.join(PAGES_DIR, name), "rb") as f:
+            body = f.read()
+        fixtures[f"/pages/{name}"] = (body, f'"{hashlib.sha1(body).hexdigest()[:16]}"')
+    with open(SEARCH_FIXTURE, "rb") as f:
+        fixtures["/search"] = (f.read(), None)
+    return fixtures
+
+
+def load_heavy_pages(third_party_origin: str) -> dict:
+    """Returns {path: body bytes} for the heavy pages, pointing their third-party resources at the origin."""
+    pages = {}
+    for name in sorted(os.listdir(HEAVY_DIR)):
+        with open(os.path.join(HEAVY_DIR, name), encoding="utf-8") as f:
+            pages[f"/heavy/{name}"] = f.read().replace("{{THIRD_PARTY_ORIGIN}}", third_party_origin).encode("utf-8")
+    return pages
+
+
+def synthetic_asset(name: str):
+    """Returns (body, content type) for /assets/<name>, or None for an unknown extension."""
+    extension = os.path.splitext(name)[1]
+    size = ASSET_SIZES.get(extension)
+    if size is None:
+        return None
+    if extension == ".css":
+        rule = b"@font-face { font-family: Body; src: url(/assets/body.woff2); } body { font-family: Body; }\n"
+        body = rule + b"/*" + b"x" * (size - len(rule) - 4) + b"*/"
+    elif extension == ".js":
+        # Parsed and run like a real bundle, but has no effect on the page text
+        body = b"window.__bundle = [" + b"1," * ((size - 24) // 2) + b"0];\n"
+    else:
+        body = bytes(size)
+    return body, ASSET_TYPES[extension]
+
+
+class FixtureServer:
+    """Serves the fixtures on a background thread; `latency_ms` is added to every response."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0):
+        fixtures = load_fixtures()
+        latency_s = latency_ms / 1000
+        heavy_pages = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if latency_s:
+                    time.sleep(latency_s)
+                path = urllib.parse.urlsplit(self.path).path
+                if path in heavy_pages:
+                    self._send(200, heavy_pages[path], "text/html; charset=utf-8")
+                    return
+                if path.startswith("/assets/"):
+                    asset = synthetic_asset(path[len("/assets/"):])
+                    if asset is not None:
+                        self._send(200, *asset)
+                        return
+                fixture = fixtures.get(path)
+                if fixture is None:
+                    self._send(404, b"Not found", "text/plain")
+                    return
+                body, etag = fixture
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self._send(304, b"", None, etag)
+                    return
+                self._send(200, body, "text/html; charset=utf-8", etag)
+
+            def _send(self, status, body, content_type, etag=None):
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    return # The client cancelled the fetch (e.g. an over-fetched source that lost the race)
+                with server._counter_lock:
+                    server.requests += 1
+                    server.bytes_sent += len(body)
+                    if self.path.startswith("/search"):
+                        server.searches += 1
+
+            def log_message(self, format, *args):
+                pass # Keep benchmark output clean
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+        self._counter_lock = threading.Lock()
+        self.requests = 0
+        self.searches = 0
+        self.bytes_sent = 0
+        self.page_paths = [path for path in fixtures if path.startswith("/pages/")]
+        # "localhost" is a different site than the 127.0.0.1 the pages are served from
+        heavy_pages.update(load_heavy_pages(f"http://localhost:{self._server.server_address[1]}"))
+        self.heavy_page_paths = sorted(heavy_pages)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counters(self):
+        with self._counter_lock:
+            self.requests = 0
+            self.searches = 0
+            self.bytes_sent = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded search/page fixtures")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, args.latency_ms).start()
+    print(f"Serving fixtures on {server.base_url} (search: {server.base_url}/search)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# /home/ubuntu/fact_checker_backend/benchmarks/loadtest.py
+"""
+Load-test harness for the verification API.
+
+Fires POST /api/verify requests at a running server with a fixed number of
+concurrent clients and reports throughput and latency percentiles.
+
+Usage:
+    hypercorn --workers 2 --bind 127.0.0.1:5000 src.main:app
+    python benchmarks/loadtest.py --url http://127.0.0.1:5000/api/verify --concurrency 50 --requests 500
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from collections import Counter
+import httpx
+
+DEFAULT_STATEMENTS = [
+    "The Eiffel Tower is in Paris.",
+    "The moon is made of green cheese.",
+    "Paris is the capital of France",
+    "Water boils at 100 degrees Celsius at sea level.",
+    "The Great Wall of China is visible from space with the naked eye.",
+]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_load(url: str, concurrency: int, total_requests: int, statements: list[str], timeout: float) -> dict:
+    latencies = []
+    statuses = Counter()
+    statement_cycle = itertools.cycle(statements)
+    remaining = itertools.count()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        async def worker():
+            while next(remaining) < total_requests:
+                statement = next(statement_cycle)
+                started = time.perf_counter()
+                try:
+                    response = await client.post(url, json={"statement": statement})
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 1) if latencies else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "statuses": dict(statuses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test POST /api/verify")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/api/verify")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--statement", action="append", help="Statement to send (repeatable); defaults to a built-in set")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.url, args.concurrency, args.requests, args.statement or DEFAULT_STATEMENTS, args.timeout))
+    for key, value in report.items():
+        print(f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# /home/ubuntu/fact_checker_backend/src/bulk_verify.py
+"""
+Bulk verification of a claim archive, outside the web server.
+
+Streams statements from a JSONL or CSV file through the same search -> retrieve -> analyze
+pipeline as /api/verify, running --parallelism statements at a time, and appends one JSON
+line per statement to the output file as soon as it is verified. Progress is checkpointed
+next to the output (<output>.checkpoint); running the same command again after a crash or
+Ctrl-C resumes where the run stopped, without verifying any statement twice. Memory use
+does not depend on the size of the input.
+
+Input records:
+    JSONL  one object per line with the statement in --field (and an optional --id-field),
+           or a bare JSON string per line
+    CSV    a header row; the statement is in column --field, the id in column --id-field
+
+Output lines: {"index", "id", "statement", ...the /api/verify response body} or, when a
+statement could not be verified, {"index", "id", "statement", "error"}. "index" is the
+record's position in the input (0-based); "id" is the record's own id, or the index.
+
+Usage:
+    python src/bulk_verify.py claims.jsonl results.jsonl [--parallelism 8]
+    python src/bulk_verify.py claims.csv results.jsonl --field claim --id-field claim_id
+    python src/bulk_verify.py claims.jsonl results.jsonl --restart   # discard earlier progress
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+
+# Same import root as src/main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.logging_config import configure_logging  # noqa: E402
+
+CHECKPOINT_INTERVAL_S = 2.0 # The checkpoint is rewritten at most this often (and at the end)
+
+
+def read_records(path: str, fmt: str, field: str, id_field: str):
+    """
+    Yields (index, id, statement) for every input record, reading the file lazily.
+    `statement` is None for records without a usable statement.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            for index, row in enumerate(csv.DictReader(f)):
+                yield index, row.get(id_field) or index, row.get(field)
+            return
+        index = 0
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            if isinstance(record, str):
+                yield index, index, record
+            elif isinstance(record, dict):
+                yield index, record.get(id_field, index), record.get(field)
+            else:
+                yield index, index, None
+            index += 1
+
+
+class Progress:
+    """
+    The set of finished record indices, kept small: a watermark below which every record
+    is done, plus the finished indices above it.
+    """
+
+    def __init__(self, watermark: int = 0, finished_above=()):
+        self.watermark = watermark
+        self.finished_above = set(finished_above)
+        self._advance()
+
+    def _advance(self):
+        while self.watermark in self.finished_above:
+            self.finished_above.remove(self.watermark)
+            self.watermark += 1
+
+    def is_done(self, index: int) -> bool:
+        return index < self.watermark or index in self.finished_above
+
+    def mark_done(self, index: int):
+        if index >= self.watermark:
+            self.finished_above.add(index)
+            self._advance()
+
+
+class Checkpoint:
+    """
+    <output>.checkpoint: the Progress at some point plus the output file size at that point.
+    Lines appended to the output after it are read back on resume, so results written
+    between the last checkpoint and a crash are not redone either.
+    """
+
+    def __init__(self, output_path: str, input_path: str):
+        self.path = output_path + ".checkpoint"
+        self.output_path = output_path
+        self.input_path = os.path.abspath(input_path)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def save(self, progress: Progress, output_size: int):
+        state = {"input": self.input_path, "watermark": progress.watermark,
+                 "finished_above": sorted(progress.finished_above), "output_size": output_size}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> Progress:
+        """Rebuilds the Progress of an interrupted run (and drops a half-written last output line)."""
+        with open(self.path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state["input"] != self.input_path:
+            raise SystemExit(f"{self.path} belongs to a run over {state['input']}; use --restart to start over")
+        progress = Progress(state["watermark"], state["finished_above"])
+        if not os.path.exists(self.output_path):
+            raise SystemExit(f"{self.output_path} is missing; use --restart to start over")
+        with open(self.output_path, "rb+") as f:
+            f.seek(state["output_size"])
+            offset = state["output_size"]
+            for line in f:
+                if not line.endswith(b"\n"): # Cut off mid-write; that record is redone
+                    f.truncate(offset)
+                    break
+                progress.mark_done(json.loads(line)["index"])
+                offset += len(line)
+        return progress
+
+
+class Throughput:
+    """Counts finished statements and reports the overall and recent rate."""
+
+    def __init__(self, skipped: int = 0):
+        self.started = self.last_report = time.monotonic()
+        self.verified = self.failed = self.last_count = 0
+        self.skipped = skipped
+
+    def report(self, final: bool = False) -> str:
+        now = time.monotonic()
+        done = self.verified + self.failed
+        overall = done / max(now - self.started, 1e-9)
+        recent = (done - self.last_count) / max(now - self.last_report, 1e-9)
+        self.last_report, self.last_count = now, done
+        line = (f"{done} statements ({self.failed} failed) in {now - self.started:.0f}s, "
+                f"{overall:.2f}/s overall" + ("" if final else f", {recent:.2f}/s recent"))
+        if self.skipped:
+            line += f", {self.skipped} already done earlier"
+        return line
+
+
+async def run(args) -> Throughput:
+    # Imported here so logging is configured before the services log anything
+    from src.services.browser_pool import browser_pool
+    from src.services.cpu_executor import cpu_executor
+    from src.services.debug_capture import debug_capture
+    from src.services.http_client import close_http_client
+    from src.services.verdict_store import verdict_store
+    from src.services.verification_service import verify_statement
+
+    checkpoint = Checkpoint(args.output, args.input)
+    if args.restart or not checkpoint.exists():
+        if os.path.exists(args.output) and not args.restart:
+            raise SystemExit(f"{args.output} exists but has no checkpoint; use --restart to overwrite it")
+        progress = Progress()
+        open(args.output, "w").close()
+    else:
+        progress = checkpoint.load()
+        print(f"Resuming: {progress.watermark + len(progress.finished_above)} statements already done", file=sys.stderr)
+    if args.fresh:
+        verdict_store.ttl = 0 # Every stored verdict is stale: re-verify, but still store the new verdicts
+
+    queue = asyncio.Queue(maxsize=args.parallelism * 2) # Bounds how much of the input is held in memory
+    throughput = Throughput()
+    output = open(args.output, "a", encoding="utf-8")
+    last_checkpoint = 0.0
+
+    def save_checkpoint():
+        nonlocal last_checkpoint
+        output.flush()
+        checkpoint.save(progress, output.tell())
+        last_checkpoint = time.monotonic()
+
+    async def produce():
+        for index, record_id, statement in read_records(args.input, args.format, args.field, args.id_field):
+            if progress.is_done(index):
+                throughput.skipped += 1
+                continue
+            await queue.put((index, record_id, statement))
+        for _ in range(args.parallelism):
+            await queue.put(None)
+
+    async def work():
+        while (item := await queue.get()) is not None:
+            index, record_id, statement = item
+            result = {"index": index, "id": record_id, "statement": statement}
+            if not isinstance(statement, str) or not statement.strip():
+                result["error"] = f"Record has no statement in field {args.field!r}"
+            else:
+                try:
+                    result.update(await verify_statement(statement))
+                except Exception as e:
+                    result["error"] = f"An unexpected error occurred: {str(e)}"
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            progress.mark_done(index)
+            if "error" in result:
+                throughput.failed += 1
+            else:
+                throughput.verified += 1
+            if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL_S:
+                save_checkpoint()
+
+    async def report():
+        while True:
+            await asyncio.sleep(args.progress_interval)
+            print(throughput.report(), file=sys.stderr, flush=True)
+
+    await browser_pool.start()
+    reporter = asyncio.create_task(report())
+    try:
+        await asyncio.gather(produce(), *(work() for _ in range(args.parallelism)))
+    finally:
+        reporter.cancel()
+        save_checkpoint()
+        output.close()
+        await browser_pool.stop()
+        await close_http_client()
+        cpu_executor.shutdown()
+        debug_capture.shutdown()
+    return throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="JSONL or CSV file of statements")
+    parser.add_argument("output", help="JSONL file the results are appended to")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="Input format (default: from the file extension)")
+    parser.add_argument("--field", default="statement", help="Field/column holding the statement")
+    parser.add_argument("--id-field", default="id", help="Field/column holding the record id")
+    parser.add_argument("--parallelism", type=int, default=8, help="Statements verified at the same time")
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between throughput reports")
+    parser.add_argument("--fresh", action="store_true", help="Don't reuse stored verdicts")
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint and overwrite the output")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "WARNING"))
+    args = parser.parse_args()
+    args.format = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    if args.parallelism < 1:
+        parser.error("--parallelism must be at least 1")
+
+    configure_logging(level=args.log_level.upper())
+    try:
+        throughput = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print(f"Interrupted; run the same command again to resume from {args.output}.checkpoint", file=sys.stderr)
+        sys.exit(130)
+    print(f"Done: {throughput.report(final=True)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,65 @@
 # /home/ubuntu/fact_checker_backend/src/main.py
+import asyncio
 import os
 import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from quart import Quart, Response, jsonify, request, send_file
+from src.services.logging_config import configure_logging
+configure_logging() # Before the services are imported, so their startup messages are logged too
+
 # Remove or comment out unused user model and blueprint if not needed for this app
 # from src.models.user import db 
 # from src.routes.user import user_bp
+from src.routes.metrics_api import metrics_bp
 from src.routes.verify_api import verify_bp # Import the new blueprint
+from src.services.browser_pool import browser_pool
+from src.services.cpu_executor import cpu_executor
+from src.services.debug_capture import debug_capture
+from src.services.http_client import close_http_client
+from src.services.job_queue import job_queue
+from src.services.static_assets import StaticManifest
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+# Quart is the asyncio-native twin of Flask: the app is an ASGI application, so each
+# server worker runs one long-lived event loop and the browser pool, HTTP connection
+# pool and caches are shared by every request the worker handles.
+# Run with e.g.: hypercorn --workers 4 --bind 0.0.0.0:5000 src.main:app
+app = Quart(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT_factchecker'
+app.config['BROWSER_POOL_MAX_CONCURRENCY'] = int(os.getenv('BROWSER_POOL_MAX_CONCURRENCY', '4'))
+app.config['BROWSER_POOL_MAX_PAGES_PER_BROWSER'] = int(os.getenv('BROWSER_POOL_MAX_PAGES_PER_BROWSER', '100'))
+
+# The search and content retrieval services borrow pages from one shared Playwright
+# browser instead of launching Firefox per call; it is started in startup() below.
+browser_pool.init_app(app)
+
+# The static folder (the front-end build) is served from an in-memory manifest built at
+# startup: hashed ETags, pre-compressed bodies and MIME types, no filesystem access per request
+static_manifest = StaticManifest(app.static_folder)
+
+
+@app.before_serving
+async def startup():
+    # Runs once per worker on its serving loop, before the first request
+    await asyncio.to_thread(static_manifest.scan) # Compressing a large build can take a moment
+    await browser_pool.start()
+    await job_queue.start()
+
+
+@app.after_serving
+async def shutdown():
+    await job_queue.stop()
+    await browser_pool.stop()
+    await close_http_client()
+    cpu_executor.shutdown()
+    debug_capture.shutdown()
+
 
 # Register the new blueprint for the verification API
 app.register_blueprint(verify_bp, url_prefix='/api')
+# Prometheus scrape endpoint at /metrics (per worker)
+app.register_blueprint(metrics_bp)
 
 # The default user_bp is not used in this project, so it's commented out.
 # app.register_blueprint(user_bp, url_prefix='/api')
@@ -28,26 +73,32 @@ app.register_blueprint(verify_bp, url_prefix='/api')
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            # For a pure API backend, we might not need to serve index.html
-            # Or we can return a simple API status message
-            return jsonify({"status": "Fact Checker API is running"}), 200
+async def serve(path):
+    # Files of the static folder by path; every other path gets index.html (client-side routing)
+    asset = static_manifest.get(path) or static_manifest.get('index.html')
+    if asset is None:
+        # For a pure API backend, we might not need to serve index.html
+        # Or we can return a simple API status message
+        return jsonify({"status": "Fact Checker API is running"}), 200
+
+    headers = {"Cache-Control": asset.cache_control}
+    if asset.compressed:
+        headers["Vary"] = "Accept-Encoding"
+    coding, body = asset.select(request.headers.get("Accept-Encoding", ""))
+    headers["ETag"] = asset.etag_for(coding)
+    if asset.matches(request.headers.get("If-None-Match", "")):
+        return Response(b"", status=304, headers=headers)
+    if not asset.in_memory:
+        response = await send_file(asset.full_path, mimetype=asset.mime_type, add_etags=False)
+        response.headers.update(headers)
+        return response
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(body, status=200, headers=headers, content_type=asset.mime_type)
 
 if __name__ == '__main__':
-    # Ensure the app runs in an async-friendly way if using asyncio in routes
-    # For Flask 2.x and above, it handles async views automatically.
-    # For older versions or specific configurations, you might need `nest_asyncio` or similar.
-    # The current Flask version in the template (3.1.0) should support async views.
+    # Development server (Hypercorn under the hood, single worker).
+    # For production use an ASGI server directly, see the command at the top of this file.
+    static_manifest.reload_interval = 1.0 # Pick up front-end rebuilds
     app.run(host='0.0.0.0', port=5000, debug=True)
 
@@ -0,0 +1,54 @@
+import datetime
+from sqlalchemy import JSON, BigInteger, Boolean, Float, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+# Plain SQLAlchemy (not Flask-SQLAlchemy): the app runs on Quart, and the store is also
+# used outside any app context (batch jobs, scripts).
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Verdict(Base):
+    __tablename__ = "verdicts"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    statement: Mapped[str] = mapped_column(Text, nullable=False)
+    normalized_statement: Mapped[str] = mapped_column(String(1000), nullable=False, index=True)
+    is_true: Mapped[bool] = mapped_column(Boolean, nullable=True)
+    confidence_score: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reasoning: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    supporting_snippets: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    sources: Mapped[list] = mapped_column(JSON, nullable=False, default=list) # [{"url", "tier"}]
+    source_scores: Mapped[list] = mapped_column(JSON, nullable=False, default=list) # [{"url", "score", "stance"}]
+    created_at: Mapped[float] = mapped_column(Float, nullable=False, index=True) # Unix time
+
+    bands: Mapped[list["VerdictBand"]] = relationship(back_populates="verdict", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f'<Verdict {self.id} {self.normalized_statement!r}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'statement': self.statement,
+            'normalized_statement': self.normalized_statement,
+            'is_true': self.is_true,
+            'confidence_score': self.confidence_score,
+            'reasoning': self.reasoning,
+            'supporting_snippets': self.supporting_snippets,
+            'sources': self.sources,
+            'source_scores': self.source_scores,
+            'verified_at': datetime.datetime.fromtimestamp(self.created_at, datetime.timezone.utc).isoformat(),
+        }
+
+
+class VerdictBand(Base):
+    """One MinHash LSH band key of a verdict's claim (see claim_index.band_keys)."""
+    __tablename__ = "verdict_bands"
+
+    band_key: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    verdict_id: Mapped[int] = mapped_column(ForeignKey("verdicts.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+    verdict: Mapped[Verdict] = relationship(back_populates="bands")
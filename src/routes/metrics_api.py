@@ -0,0 +1,107 @@
+# /home/ubuntu/fact_checker_backend/src/routes/metrics_api.py
+
+import asyncio
+from quart import Blueprint, Response
+from src.services.browser_pool import browser_pool
+from src.services.content_cache import content_cache
+from src.services.host_scheduler import BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN, host_scheduler
+from src.services.job_queue import job_queue
+from src.services.metrics import metrics
+from src.services.search_cache import search_cache
+from src.services.shared_cache import shared_cache
+
+metrics_bp = Blueprint("metrics_bp", __name__)
+
+
+def _cache_metrics():
+    # The caches keep their own counters; they are read at scrape time
+    content, search = content_cache.stats(), search_cache.stats()
+    content_lookups = [({"cache": "content", "result": name}, content[name])
+                       for name in ("memory_hits", "shared_hits", "negative_hits", "stale_hits", "misses")]
+    search_lookups = [({"cache": "search", "result": "memory_hits"}, search["hits"]),
+                      ({"cache": "search", "result": "shared_hits"}, search["shared_hits"]),
+                      ({"cache": "search", "result": "misses"}, search["misses"] - search["shared_hits"])]
+    return [
+        ("factcheck_cache_lookups_total", "counter", "Cache lookups by result.", content_lookups + search_lookups),
+        ("factcheck_cache_hit_ratio", "gauge", "Share of cache lookups served from the cache.",
+         [({"cache": "content"}, content["hit_rate"]), ({"cache": "search"}, search["hit_rate"])]),
+        ("factcheck_cache_entries", "gauge", "Entries held in memory.",
+         [({"cache": "content"}, content["memory"]["entries"]), ({"cache": "search"}, search["entries"])]),
+        ("factcheck_search_in_flight", "gauge", "Distinct searches currently running.", [({}, search["in_flight"])]),
+        ("factcheck_search_collapsed_total", "counter", "Searches that joined an identical in-flight search.",
+         [({}, search["collapsed"])]),
+    ]
+
+
+def _shared_cache_metrics():
+    stats = shared_cache.stats() # Queries SQLite; runs in the scrape's worker thread (see metrics_route)
+    if not stats["enabled"]:
+        return []
+    return [
+        ("factcheck_shared_cache_bytes", "gauge", "Bytes held by the node-wide shared cache (all workers).",
+         [({}, stats["bytes"])]),
+        ("factcheck_shared_cache_entries", "gauge", "Entries in the node-wide shared cache.", [({}, stats["entries"])]),
+        ("factcheck_shared_cache_evictions_total", "counter", "Entries evicted from the shared cache by any worker.",
+         [({}, stats["evictions"])]),
+        ("factcheck_shared_cache_errors_total", "counter", "Shared cache operations of this worker that failed.",
+         [({}, stats["errors"])]),
+    ]
+
+
+def _browser_pool_metrics():
+    stats = browser_pool.stats()
+    return [
+        ("factcheck_browser_pages_in_use", "gauge", "Browser pages currently open.", [({}, stats["pages_in_use"])]),
+        ("factcheck_browser_retired", "gauge", "Recycled browsers waiting for their last page to close.",
+         [({}, stats["retired_browsers"])]),
+    ]
+
+
+def _job_queue_metrics():
+    stats = job_queue.stats()
+    return [
+        ("factcheck_jobs_queued", "gauge", "Verification jobs waiting, by priority lane.",
+         [({"priority": lane}, count) for lane, count in stats["queued"].items()]),
+        ("factcheck_jobs_running", "gauge", "Verification jobs being run (all workers).", [({}, stats["running"])]),
+        ("factcheck_jobs_rejected_total", "counter", "Job submissions rejected with 429 by this worker.",
+         [({}, stats["rejected"])]),
+    ]
+
+
+_BREAKER_STATE_VALUES = {BREAKER_CLOSED: 0, BREAKER_HALF_OPEN: 1, BREAKER_OPEN: 2}
+
+
+def _host_metrics():
+    hosts = host_scheduler.stats()
+    fetches = [({"host": host, "outcome": outcome}, stats[outcome])
+               for host, stats in hosts.items() for outcome in ("ok", "error", "cancelled", "rejected")]
+    return [
+        ("factcheck_host_breaker_state", "gauge", "Circuit breaker state per host (0 closed, 1 half-open, 2 open).",
+         [({"host": host}, _BREAKER_STATE_VALUES[stats["breaker"]]) for host, stats in hosts.items()]),
+        ("factcheck_host_breaker_opened_total", "counter", "Times a host's circuit breaker opened.",
+         [({"host": host}, stats["breaker_opened"]) for host, stats in hosts.items()]),
+        ("factcheck_host_fetches_total", "counter", "Page fetches per host by outcome (cancelled: never completed, rejected: breaker open).",
+         fetches),
+        ("factcheck_host_latency_ewma_seconds", "gauge", "Moving average of fetch latency per host.",
+         [({"host": host}, stats["latency_ewma"]) for host, stats in hosts.items() if stats["latency_ewma"] is not None]),
+        ("factcheck_host_concurrency_limit", "gauge", "Current adaptive concurrency limit per host.",
+         [({"host": host}, stats["concurrency_limit"]) for host, stats in hosts.items()]),
+        ("factcheck_host_in_flight", "gauge", "Fetches running per host.",
+         [({"host": host}, stats["in_flight"]) for host, stats in hosts.items()]),
+        ("factcheck_host_waiting", "gauge", "Fetches waiting for a slot per host.",
+         [({"host": host}, stats["waiting"]) for host, stats in hosts.items()]),
+    ]
+
+
+metrics.register_collector(_cache_metrics)
+metrics.register_collector(_shared_cache_metrics)
+metrics.register_collector(_host_metrics)
+metrics.register_collector(_job_queue_metrics)
+metrics.register_collector(_browser_pool_metrics)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+async def metrics_route():
+    """Prometheus text exposition of this worker's metrics."""
+    # Collectors query SQLite (shared cache, job queue), which can wait on other workers' writes
+    return Response(await asyncio.to_thread(metrics.render), mimetype="text/plain; version=0.0.4")
@@ -1,16 +1,46 @@
 # /home/ubuntu/fact_checker_backend/src/routes/verify_api.py
 
 import asyncio
-from flask import Blueprint, request, jsonify
-from src.services.search_service import perform_web_search
-from src.services.content_retrieval_service import retrieve_content_from_url
-from src.services.analysis_service import analyze_content_for_statement
+import json
+import logging
+import time
+from quart import Blueprint, Response, g, request, jsonify
+from src.services.content_cache import content_cache
+from src.services.job_queue import QueueFullError, job_queue
+from src.services.metrics import REQUEST_SECONDS
+from src.services.search_cache import search_cache
+from src.services.shared_cache import shared_cache
+from src.services.verdict_store import verdict_store
+from src.services.verification_service import (
+    BATCH_MAX_STATEMENTS,
+    verify_statement,
+    verify_statement_stream,
+    verify_statements_batch,
+)
+
+logger = logging.getLogger(__name__)
 
 verify_bp = Blueprint("verify_bp", __name__)
 
+
+@verify_bp.before_request
+async def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+@verify_bp.after_request
+async def _record_request_time(response):
+    # For /verify/stream this is the time to the first byte; the stream's stages are timed as spans
+    started = g.get("request_started")
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, status=response.status_code)
+    return response
+
+
 @verify_bp.route("/verify", methods=["POST"])
 async def verify_statement_route():
-    data = request.get_json()
+    data = await request.get_json()
     if not data or "statement" not in data:
         return jsonify({"error": "Missing statement in request body"}), 400
 
@@ -19,51 +49,103 @@ async def verify_statement_route():
         return jsonify({"error": "Statement must be a non-empty string"}), 400
 
     try:
-        # 1. Perform Web Search
-        search_results = await perform_web_search(statement, num_results=3) # Limit to 3 results for now
-        if not search_results or (len(search_results) == 1 and search_results[0]["title"] == "Error"):
-            return jsonify({
-                "is_true": None,
-                "confidence_score": 0,
-                "reasoning": "Failed to perform web search or no results found.",
-                "supporting_snippets": []
-            }), 200 # Return 200 as the request was processed, but search failed
-
-        # 2. Retrieve Content from URLs
-        retrieval_tasks = []
-        valid_search_results_for_content = []
-        for res in search_results:
-            if res.get("link") and res["link"] != "N/A":
-                retrieval_tasks.append(retrieve_content_from_url(res["link"]))
-                valid_search_results_for_content.append(res)
-            else:
-                # If a search result has no valid link, we can't retrieve content for it.
-                print(f"Skipping content retrieval for result with no link: {res.get('title')}")
-
-        # Run content retrieval tasks concurrently
-        retrieved_contents_raw = await asyncio.gather(*retrieval_tasks)
-        
-        retrieved_contents_for_analysis = []
-        for i, content_text in enumerate(retrieved_contents_raw):
-            retrieved_contents_for_analysis.append({
-                "url": valid_search_results_for_content[i]["link"],
-                "content": content_text
-            })
-
-        # 3. Analyze Content
-        analysis_result = await analyze_content_for_statement(statement, valid_search_results_for_content, retrieved_contents_for_analysis)
-
-        return jsonify({
-            "is_true": analysis_result.get("is_true"),
-            "confidence_score": analysis_result.get("confidence_score"),
-            "reasoning": analysis_result.get("reasoning", "Analysis completed."),
-            "supporting_snippets": analysis_result.get("supporting_snippets", [])
-        }), 200
+        result = await verify_statement(statement)
+        # A failed search still returns 200 as the request was processed
+        return jsonify(result), 200
 
     except Exception as e:
-        print(f"Error in /verify endpoint: {e}")
         # Log the full traceback for debugging
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in /verify endpoint: %s", e)
+        return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
+
+
+def _sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@verify_bp.route("/verify/stream", methods=["POST"])
+async def verify_statement_stream_route():
+    """Same input as /verify, but streams "search", "source" and "verdict" Server-Sent Events."""
+    data = await request.get_json()
+    if not data or "statement" not in data:
+        return jsonify({"error": "Missing statement in request body"}), 400
+
+    statement = data["statement"]
+    if not isinstance(statement, str) or not statement.strip():
+        return jsonify({"error": "Statement must be a non-empty string"}), 400
+
+    async def _events():
+        try:
+            async for event, payload in verify_statement_stream(statement):
+                yield _sse_event(event, payload).encode("utf-8")
+        except Exception as e:
+            logger.exception("Error in /verify/stream endpoint: %s", e)
+            yield _sse_event("error", {"error": f"An unexpected error occurred: {str(e)}"}).encode("utf-8")
+
+    response = Response(_events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no" # Stop reverse proxies from buffering the stream
+    response.timeout = None # The pipeline can outlive Quart's default response timeout
+    return response
+
+
+@verify_bp.route("/verify/batch", methods=["POST"])
+async def verify_batch_route():
+    data = await request.get_json()
+    if not data or "statements" not in data:
+        return jsonify({"error": "Missing statements in request body"}), 400
+
+    statements = data["statements"]
+    if not isinstance(statements, list) or not statements:
+        return jsonify({"error": "Statements must be a non-empty list"}), 400
+    if len(statements) > BATCH_MAX_STATEMENTS:
+        return jsonify({"error": f"A batch can contain at most {BATCH_MAX_STATEMENTS} statements"}), 400
+
+    try:
+        return jsonify(await verify_statements_batch(statements)), 200
+    except Exception as e:
+        logger.exception("Error in /verify/batch endpoint: %s", e)
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
 
+
+@verify_bp.route("/verify/jobs", methods=["POST"])
+async def submit_verify_job_route():
+    """Queues a statement and returns its job id at once (202); poll GET /verify/jobs/<id> for the result."""
+    data = await request.get_json()
+    if not data or "statement" not in data:
+        return jsonify({"error": "Missing statement in request body"}), 400
+
+    statement = data["statement"]
+    if not isinstance(statement, str) or not statement.strip():
+        return jsonify({"error": "Statement must be a non-empty string"}), 400
+
+    priority = data.get("priority", "normal")
+    if not isinstance(priority, str):
+        return jsonify({"error": "Priority must be a string"}), 400
+
+    try:
+        job_id = await job_queue.submit(statement, priority)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except QueueFullError as e:
+        response = jsonify({"error": str(e)})
+        response.headers["Retry-After"] = "5"
+        return response, 429
+
+    response = jsonify({"job_id": job_id, "status": "queued"})
+    response.headers["Location"] = f"{request.path}/{job_id}"
+    return response, 202
+
+
+@verify_bp.route("/verify/jobs/<job_id>", methods=["GET"])
+async def get_verify_job_route(job_id):
+    job = await job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job), 200
+
+
+@verify_bp.route("/cache/stats", methods=["GET"])
+async def cache_stats_route():
+    return jsonify({"content": content_cache.stats(), "search": search_cache.stats(),
+                    "shared": await asyncio.to_thread(shared_cache.stats), "verdicts": verdict_store.stats()}), 200
@@ -1,35 +1,116 @@
 # /home/ubuntu/fact_checker_backend/src/services/analysis_service.py
 
-import re
+import os
+from src.services.cpu_executor import cpu_executor
+from src.services.lexicons import lexicon_store
+from src.services.passage_index import PassageIndex, query_terms
+from src.services.phrase_matcher import word_tokens
 
-# Basic predefined lists for domain reputation (very simplified)
-REPUTABLE_DOMAINS_KEYWORDS = ["wikipedia.org", "reuters.com", "apnews.com", "bbc.com", "nytimes.com", "wsj.com", ".gov", ".edu"]
-LESS_REPUTABLE_KEYWORDS = ["blog", "forum", "personal", "conspiracy", "rumor"]
+# Confirmation/contradiction phrases only count inside the passages that rank best against the statement
+PASSAGE_TOP_K = int(os.getenv("PASSAGE_TOP_K", "3"))
 
-# Keywords for contradiction and confirmation
-CONFIRMATION_KEYWORDS = ["is true", "confirmed", "fact", "accurate", "correct", "verified", "evidence shows", "supported by data"]
-CONTRADICTION_KEYWORDS = ["is false", "not true", "incorrect", "hoax", "myth", "debunked", "misinformation", "unsubstantiated", "no evidence"]
+# Domain reputation lists and confirmation/contradiction phrases are loaded from
+# src/data/lexicons (see lexicons.py) and reloaded when those files change.
 
-async def analyze_content_for_statement(statement: str, search_results: list[dict], retrieved_contents: list[dict]) -> dict:
+# The only search result fields scoring reads; nothing else is sent to executor workers
+_SCORED_RESULT_FIELDS = ("link", "snippet")
+
+def extract_statement_keywords(statement: str) -> set[str]:
+    """Returns the set of lowercase word tokens of a statement."""
+    return set(word_tokens(statement))
+
+
+def score_source(statement_keywords: set[str], result: dict, content: str) -> dict:
     """
-    Analyzes the retrieved web content against the user's statement to determine
-    credibility and a confidence score.
+    Scores a single source against the statement. Independent of every other source,
+    so it can be called as soon as that source's content has been retrieved.
 
     Args:
-        statement: The user's original statement.
-        search_results: List of dicts from search_service (title, link, snippet).
-        retrieved_contents: List of dicts, each with {"url": str, "content": str}.
+        statement_keywords: Output of extract_statement_keywords() for the statement.
+        result: The search result dict (title, link, snippet).
+        content: The retrieved page text for result["link"]; "" or an "Error:" message if retrieval failed.
 
     Returns:
         A dictionary containing:
-        - "is_true": boolean or None (if inconclusive)
-        - "confidence_score": integer (0-100)
-        - "reasoning": string explaining the score
-        - "supporting_snippets": list of relevant snippets from sources
+        - "url": the source URL
+        - "analyzed": False if there was neither content nor a snippet to analyze
+        - "score": the source score (roughly -50 to 100)
+        - "stance": "confirming", "contradicting", "ambiguous" or "neutral"
+        - "snippet": a supporting snippet dict for the response (the best-ranked passage,
+          or the search snippet if no passage matched), or None
     """
-    statement_lower = statement.lower()
-    statement_keywords = set(re.findall(r'\b\w+\b', statement_lower))
+    url = result.get("link")
+    snippet = result.get("snippet", "").lower()
+    page_content = content if content and not content.startswith("Error:") else ""
+
+    if not page_content and not snippet: # Skip if no content or snippet
+        return {"url": url, "analyzed": False, "score": 0, "stance": "neutral", "snippet": None}
+
+    current_source_score = 0
+
+    lexicons = lexicon_store.current()
 
+    # Tokenize each text once; keyword and phrase matching below work on whole words.
+    # The page is split into sentence-window passages ranked against the statement with BM25.
+    snippet_tokens = word_tokens(snippet)
+    passage_index = PassageIndex(page_content)
+    content_tokens = passage_index.tokens
+    top_passages = passage_index.rank(query_terms(statement_keywords), PASSAGE_TOP_K)
+
+    # 1. Keyword Matching (in snippet and full content)
+    matched_keywords_snippet = len(statement_keywords.intersection(snippet_tokens)) / len(statement_keywords) if statement_keywords else 0
+    matched_keywords_content = len(statement_keywords.intersection(content_tokens)) / len(statement_keywords) if statement_keywords and page_content else 0
+    keyword_score = (matched_keywords_snippet * 0.3 + matched_keywords_content * 0.7) * 30 # Max 30 points
+    current_source_score += keyword_score
+
+    # 2. Confirmation/Contradiction Keywords, in the snippet and the passages most relevant to the statement
+    stances_found = lexicons.stance_matcher.found_labels(snippet_tokens)
+    for i in top_passages:
+        stances_found |= lexicons.stance_matcher.found_labels(passage_index.passage_tokens[i])
+    evidence = passage_index.passages[top_passages[0]] if top_passages else result.get("snippet", "N/A")
+    confirmation_found = "confirmation" in stances_found
+    contradiction_found = "contradiction" in stances_found
+
+    stance = "neutral"
+    supporting_snippet = None
+    if confirmation_found and not contradiction_found:
+        current_source_score += 40 # Max 40 points
+        stance = "confirming"
+        supporting_snippet = {"source_url": url, "snippet": evidence[:200] + "... (supporting)"} # Add best passage
+    elif contradiction_found and not confirmation_found:
+        current_source_score -= 40 # Max -40 points (will be used to adjust overall score)
+        stance = "contradicting"
+        supporting_snippet = {"source_url": url, "snippet": evidence[:200] + "... (contradicting)"} # Add best passage
+    elif confirmation_found and contradiction_found:
+        current_source_score += 0 # Ambiguous
+        stance = "ambiguous"
+        supporting_snippet = {"source_url": url, "snippet": evidence[:200] + "... (ambiguous)"} # Add best passage
+    else:
+        current_source_score += 5 # Neutral or not explicitly addressing, small positive bias for relevance
+
+    # 3. Domain Reputation (Basic)
+    domain_score = 0
+    reputation = lexicons.domain_reputation(url)
+    if reputation > 0:
+        domain_score = 20 # Max 20 points
+    elif reputation < 0:
+        domain_score = -10
+    current_source_score += domain_score
+
+    # Max 10 points for snippet relevance if not strongly confirming/contradicting
+    if not confirmation_found and not contradiction_found and matched_keywords_snippet > 0.5:
+        current_source_score += 10
+
+    return {"url": url, "analyzed": True, "score": current_source_score, "stance": stance, "snippet": supporting_snippet}
+
+
+def summarize_source_scores(source_scores: list[dict]) -> dict:
+    """
+    Combines per-source scores (from score_source(), in search result order) into a verdict.
+
+    Returns:
+        The same dictionary as analyze_content_for_statement().
+    """
     total_score = 0
     max_possible_score = 0
     sources_analyzed = 0
@@ -37,69 +118,26 @@ async def analyze_content_for_statement(statement: str, search_results: list[dic
     contradicting_sources = 0
     supporting_snippets_for_response = []
 
-    # Normalize retrieved_contents to a dictionary for easier lookup by URL
-    content_map = {item["url"]: item["content"] for item in retrieved_contents if item["content"] and not item["content"].startswith("Error:")}
-
-    for result in search_results:
-        url = result.get("link")
-        snippet = result.get("snippet", "").lower()
-        page_content = content_map.get(url, "").lower()
-
-        if not page_content and not snippet: # Skip if no content or snippet
+    for source in source_scores:
+        if not source["analyzed"]:
             continue
-        
         sources_analyzed += 1
-        current_source_score = 0
-        max_source_score = 100 # Max score per source
-
-        # 1. Keyword Matching (in snippet and full content)
-        matched_keywords_snippet = sum(1 for kw in statement_keywords if kw in snippet) / len(statement_keywords) if statement_keywords else 0
-        matched_keywords_content = sum(1 for kw in statement_keywords if kw in page_content) / len(statement_keywords) if statement_keywords and page_content else 0
-        keyword_score = (matched_keywords_snippet * 0.3 + matched_keywords_content * 0.7) * 30 # Max 30 points
-        current_source_score += keyword_score
-
-        # 2. Confirmation/Contradiction Keywords
-        confirmation_found = any(phrase in page_content or phrase in snippet for phrase in CONFIRMATION_KEYWORDS)
-        contradiction_found = any(phrase in page_content or phrase in snippet for phrase in CONTRADICTION_KEYWORDS)
-
-        if confirmation_found and not contradiction_found:
-            current_source_score += 40 # Max 40 points
+        if source["stance"] == "confirming":
             confirming_sources += 1
-            if len(supporting_snippets_for_response) < 3:
-                supporting_snippets_for_response.append({"source_url": url, "snippet": result.get("snippet", "N/A")[:200] + "... (supporting)"}) # Add original snippet
-        elif contradiction_found and not confirmation_found:
-            current_source_score -= 40 # Max -40 points (will be used to adjust overall score)
+        elif source["stance"] == "contradicting":
             contradicting_sources += 1
-            if len(supporting_snippets_for_response) < 3:
-                 supporting_snippets_for_response.append({"source_url": url, "snippet": result.get("snippet", "N/A")[:200] + "... (contradicting)"}) # Add original snippet
-        elif confirmation_found and contradiction_found:
-            current_source_score += 0 # Ambiguous
-            if len(supporting_snippets_for_response) < 3:
-                supporting_snippets_for_response.append({"source_url": url, "snippet": result.get("snippet", "N/A")[:200] + "... (ambiguous)"}) # Add original snippet
-        else:
-            current_source_score += 5 # Neutral or not explicitly addressing, small positive bias for relevance
-
-        # 3. Domain Reputation (Basic)
-        domain_score = 0
-        if any(rep_kw in url for rep_kw in REPUTABLE_DOMAINS_KEYWORDS):
-            domain_score = 20 # Max 20 points
-        elif any(less_rep_kw in url for less_rep_kw in LESS_REPUTABLE_KEYWORDS):
-            domain_score = -10
-        current_source_score += domain_score
-        
-        # Max 10 points for snippet relevance if not strongly confirming/contradicting
-        if not confirmation_found and not contradiction_found and matched_keywords_snippet > 0.5:
-            current_source_score += 10
-
-        total_score += current_source_score
-        max_possible_score += max_source_score
+        if source["snippet"] and len(supporting_snippets_for_response) < 3:
+            supporting_snippets_for_response.append(source["snippet"])
+        total_score += source["score"]
+        max_possible_score += 100 # Max score per source
 
     if sources_analyzed == 0:
         return {
             "is_true": None,
             "confidence_score": 0,
             "reasoning": "No valid sources found or content could not be retrieved to analyze the statement.",
-            "supporting_snippets": []
+            "supporting_snippets": [],
+            "source_scores": []
         }
 
     # Calculate overall confidence
@@ -160,9 +198,52 @@ async def analyze_content_for_statement(statement: str, search_results: list[dic
         "is_true": is_true_val,
         "confidence_score": int(confidence_score),
         "reasoning": reasoning.strip(),
-        "supporting_snippets": supporting_snippets_for_response
+        "supporting_snippets": supporting_snippets_for_response,
+        "source_scores": [{"url": source["url"], "score": source["score"], "stance": source["stance"]}
+                          for source in source_scores if source["analyzed"]]
     }
 
+def _compact_result(result: dict) -> dict:
+    return {field: result[field] for field in _SCORED_RESULT_FIELDS if field in result}
+
+
+async def score_source_async(statement_keywords: set[str], result: dict, content: str) -> dict:
+    """score_source() run on the CPU executor, so it does not block the event loop."""
+    return await cpu_executor.run(score_source, statement_keywords, _compact_result(result), content)
+
+
+def _analyze_sources(statement: str, sources: list[tuple[dict, str]]) -> dict:
+    """Executor-side body of analyze_content_for_statement(); sources are (compact result, content) pairs."""
+    statement_keywords = extract_statement_keywords(statement)
+    return summarize_source_scores([score_source(statement_keywords, result, content) for result, content in sources])
+
+
+async def analyze_content_for_statement(statement: str, search_results: list[dict], retrieved_contents: list[dict]) -> dict:
+    """
+    Analyzes the retrieved web content against the user's statement to determine
+    credibility and a confidence score.
+
+    Args:
+        statement: The user's original statement.
+        search_results: List of dicts from search_service (title, link, snippet).
+        retrieved_contents: List of dicts, each with {"url": str, "content": str}.
+
+    Returns:
+        A dictionary containing:
+        - "is_true": boolean or None (if inconclusive)
+        - "confidence_score": integer (0-100)
+        - "reasoning": string explaining the score
+        - "supporting_snippets": list of relevant snippets from sources
+        - "source_scores": {"url", "score", "stance"} of every analyzed source
+    """
+    # Normalize retrieved_contents to a dictionary for easier lookup by URL
+    content_map = {item["url"]: item["content"] for item in retrieved_contents if item["content"] and not item["content"].startswith("Error:")}
+
+    # Scoring is CPU-bound (tokenizing, passage ranking, phrase matching), so it runs on the
+    # CPU executor with only the fields it reads
+    sources = [(_compact_result(result), content_map.get(result.get("link"), "")) for result in search_results]
+    return await cpu_executor.run(_analyze_sources, statement, sources)
+
 # Example usage (for testing purposes)
 async def main_test():
     test_statement = "The Eiffel Tower is in Paris."
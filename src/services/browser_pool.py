@@ -0,0 +1,260 @@
+# /home/ubuntu/fact_checker_backend/src/services/browser_pool.py
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+from src.services.metrics import BROWSER_LAUNCH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration, overridable through the environment (or app.config via init_app)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("BROWSER_POOL_MAX_CONCURRENCY", "4"))
+DEFAULT_MAX_PAGES_PER_BROWSER = int(os.getenv("BROWSER_POOL_MAX_PAGES_PER_BROWSER", "100"))
+DEFAULT_BROWSER_TYPE = os.getenv("BROWSER_POOL_BROWSER_TYPE", "firefox") # Sticking with Firefox
+
+
+class BrowserPool:
+    """
+    A process-wide pool around a single long-lived Playwright browser.
+
+    Each caller gets its own isolated browser context (cookies, cache and storage are
+    not shared between requests), while the expensive browser process is reused.
+    The browser is replaced after `max_pages_per_browser` pages or as soon as it
+    disconnects; the old instance is closed once its last in-flight page is done.
+
+    Playwright objects are bound to the event loop they were created on. Under the ASGI
+    server the pool is started on the worker's long-lived loop by the app's startup hook;
+    standalone scripts get a background loop via `start_in_background()`. Use `run()` to
+    execute page work from any event loop, or `page()` directly when already running on
+    the pool's loop.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_pages_per_browser: int = DEFAULT_MAX_PAGES_PER_BROWSER,
+                 browser_type: str = DEFAULT_BROWSER_TYPE, headless: bool = True):
+        self.max_concurrency = max_concurrency
+        self.max_pages_per_browser = max_pages_per_browser
+        self.browser_type = browser_type
+        self.headless = headless
+
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._starting = None # concurrent.futures.Future while a start() is in progress
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = None
+        self._semaphore = None
+        self._pages_served = 0 # Pages handed out by the current browser
+        self._active = {} # browser -> number of pages currently open on it
+        self._retired = set() # Browsers to close once their last page is released
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    async def start(self):
+        """
+        Starts Playwright on the running event loop and launches the first browser.
+        Concurrent calls wait for the first one instead of starting Playwright twice.
+        """
+        if self.started:
+            return
+        if self._starting is not None:
+            await asyncio.wrap_future(self._starting)
+            return
+        # Claimed before the first await, so a second caller can't get past the checks above
+        self._starting = starting = concurrent.futures.Future()
+        try:
+            self._browser_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._playwright = await async_playwright().start()
+            # Only mark the pool as started once Playwright is up, so concurrent callers never see a half-started pool
+            self._loop = asyncio.get_running_loop()
+            try:
+                async with self._browser_lock:
+                    await self._launch()
+            except Exception as e:
+                # Keep the pool usable; a new launch is attempted on the next acquire.
+                logger.error("Browser pool could not launch %s at startup: %s", self.browser_type, e)
+        except BaseException as e:
+            # Waiting callers get the failure, but not this caller's cancellation
+            starting.set_exception(RuntimeError("Browser pool start was cancelled")
+                                   if isinstance(e, asyncio.CancelledError) else e)
+            raise
+        else:
+            starting.set_result(None)
+        finally:
+            self._starting = None
+
+    async def stop(self):
+        """Closes every browser owned by the pool and stops Playwright."""
+        if not self.started:
+            return
+        browsers = set(self._retired)
+        if self._browser:
+            browsers.add(self._browser)
+        for browser in browsers:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning("Error closing pooled browser: %s", e)
+        self._browser = None
+        self._retired.clear()
+        self._active.clear()
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        self._loop = None
+
+    def start_in_background(self):
+        """
+        Starts the pool on a dedicated daemon thread with its own event loop.
+
+        Used when no long-lived server loop started the pool (e.g. the main_test()
+        scripts), so callers on short-lived loops still share one browser.
+        Safe to call more than once.
+        """
+        with self._start_lock:
+            if self.started:
+                return
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+            atexit.register(self.shutdown)
+
+    def shutdown(self):
+        """Stops a pool started with `start_in_background()` and joins its thread."""
+        with self._start_lock:
+            loop = self._loop
+            if loop is None or self._thread is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self.stop(), loop).result(timeout=30)
+            except Exception as e:
+                logger.warning("Error shutting down browser pool: %s", e)
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def init_app(self, app):
+        """Configures the pool from app.config; the app's serving hooks call start()/stop()."""
+        self.max_concurrency = app.config.get("BROWSER_POOL_MAX_CONCURRENCY", self.max_concurrency)
+        self.max_pages_per_browser = app.config.get("BROWSER_POOL_MAX_PAGES_PER_BROWSER", self.max_pages_per_browser)
+        self.browser_type = app.config.get("BROWSER_POOL_BROWSER_TYPE", self.browser_type)
+
+    def stats(self) -> dict:
+        return {
+            "started": self.started,
+            "pages_in_use": sum(list(self._active.values())), # Copied: also read from the metrics thread
+            "pages_served_by_current_browser": self._pages_served,
+            "retired_browsers": len(self._retired),
+        }
+
+    async def _launch(self):
+        # Must be called with self._browser_lock held
+        launcher = getattr(self._playwright, self.browser_type)
+        logger.info("Browser pool launching %s (headless=%s)", self.browser_type, self.headless)
+        started = time.perf_counter()
+        self._browser = await launcher.launch(headless=self.headless)
+        BROWSER_LAUNCH_SECONDS.observe(time.perf_counter() - started)
+        self._pages_served = 0
+        self._active[self._browser] = 0
+
+    def _retire(self, browser):
+        self._retired.add(browser)
+        if self._active.get(browser, 0) == 0:
+            self._loop.create_task(self._close_retired(browser))
+
+    async def _close_retired(self, browser):
+        self._retired.discard(browser)
+        self._active.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning("Error closing recycled browser: %s", e)
+
+    async def _acquire_browser(self):
+        async with self._browser_lock:
+            browser = self._browser
+            if browser is not None and not browser.is_connected():
+                logger.warning("Pooled browser disconnected (crashed?); launching a replacement.")
+                self._retire(browser)
+                self._browser = browser = None
+            elif browser is not None and self._pages_served >= self.max_pages_per_browser:
+                logger.info("Recycling pooled browser after %d pages.", self._pages_served)
+                self._retire(browser)
+                self._browser = browser = None
+            if browser is None:
+                await self._launch()
+                browser = self._browser
+            self._pages_served += 1
+            self._active[browser] = self._active.get(browser, 0) + 1
+            return browser
+
+    def _release_browser(self, browser):
+        self._active[browser] = self._active.get(browser, 1) - 1
+        if browser in self._retired and self._active[browser] <= 0:
+            self._loop.create_task(self._close_retired(browser))
+
+    @asynccontextmanager
+    async def page(self, **context_options):
+        """
+        Yields a fresh page in an isolated browser context, limited to `max_concurrency`
+        concurrent holders. Must be used on the pool's event loop.
+
+        Args:
+            **context_options: Passed through to `browser.new_context()`.
+        """
+        async with self._semaphore:
+            browser = await self._acquire_browser()
+            context = None
+            try:
+                context = await browser.new_context(**context_options)
+                page = await context.new_page()
+                yield page
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        logger.warning("Error closing browser context: %s", e)
+                self._release_browser(browser)
+
+    async def run(self, page_fn, **context_options):
+        """
+        Runs `page_fn(page)` on a pooled page and returns its result.
+
+        Can be awaited from any event loop: if the caller is not on the pool's loop,
+        the work is scheduled there and the result is awaited without blocking.
+        The pool is started in the background on first use if needed.
+
+        Args:
+            page_fn: An async callable taking a Playwright page.
+            **context_options: Passed through to `browser.new_context()`.
+        """
+        if not self.started:
+            await asyncio.to_thread(self.start_in_background)
+
+        async def _job():
+            async with self.page(**context_options) as page:
+                return await page_fn(page)
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            return await _job()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_job(), self._loop))
+
+
+# The process-wide pool shared by the search and content retrieval services
+browser_pool = BrowserPool()
@@ -0,0 +1,176 @@
+# /home/ubuntu/fact_checker_backend/src/services/cache.py
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLLRUCache:
+    """
+    A thread-safe in-memory LRU cache with per-entry TTL and a total weight budget.
+
+    Each entry has a weight (by default 1, so `max_weight` is an entry count; pass
+    the size in bytes to get a byte budget). Least recently used entries are evicted
+    until the total weight fits the budget. Expired entries are dropped lazily on access.
+
+    Plain threading locks are used (no asyncio primitives) so one instance can be
+    shared safely by code running on different event loops and threads.
+    """
+
+    def __init__(self, max_weight: int, default_ttl: float):
+        self.max_weight = max_weight
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict() # key -> (value, expires_at, weight)
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, allow_stale: bool = False):
+        """Returns the cached value, or None if missing (or expired, unless allow_stale)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, weight = entry
+            if not allow_stale and expires_at <= time.time():
+                del self._entries[key]
+                self._weight -= weight
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None, weight: int = 1):
+        """Stores a value, evicting least recently used entries to stay within budget."""
+        if weight > self.max_weight:
+            return # Would evict everything else and still not fit
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._weight -= old[2]
+            self._entries[key] = (value, expires_at, weight)
+            self._weight += weight
+            while self._weight > self.max_weight and self._entries:
+                _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._weight -= old[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "weight": self._weight,
+                "max_weight": self.max_weight,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class _Flight:
+    """One in-flight execution of SingleFlight: the result handed to callers, and the task producing it."""
+    __slots__ = ("future", "task")
+
+    def __init__(self):
+        self.future = concurrent.futures.Future()
+        self.task = None # Set by the first caller once it has started the work
+
+    def cancel(self):
+        # The task may belong to another caller's event loop
+        if self.task is not None and not self.task.done():
+            self.task.get_loop().call_soon_threadsafe(self.task.cancel)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one in-flight execution.
+
+    The first caller for a key starts the work as a task; callers arriving while it is in
+    flight await the same result (or exception) instead of repeating it. Cancelling any
+    caller, the first one included, only stops that caller's wait: the work runs to
+    completion for the others, and is cancelled once no caller is waiting for it, whichever
+    caller left last. Results are handed over through concurrent.futures.Future so this
+    also works when callers run on different event loops.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {} # key -> _Flight
+        self._waiters = {} # key -> callers currently awaiting that key
+        self.collapsed = 0 # Calls that joined an in-flight execution instead of running their own
+
+    async def do(self, key, coro_fn):
+        """
+        Runs `coro_fn()` unless a call for `key` is already in flight, and returns its result.
+
+        Args:
+            key: Hashable identity of the work.
+            coro_fn: Zero-argument callable returning an awaitable.
+        """
+        with self._lock:
+            flight = self._in_flight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._in_flight[key] = _Flight()
+            else:
+                self.collapsed += 1
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            if not is_leader:
+                # shield: a follower being cancelled must not cancel the shared future for the others
+                return await asyncio.shield(asyncio.wrap_future(flight.future))
+            # The work runs as its own task, so cancelling the leader (e.g. by its timeout) leaves
+            # it running for the followers instead of handing them the leader's CancelledError
+            flight.task = asyncio.ensure_future(coro_fn())
+            flight.task.add_done_callback(lambda done: self._finish(key, flight, done))
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                abandoned = self._waiters.get(key) == 1 and self._in_flight.get(key) is flight
+                if abandoned: # Nobody else waits for the result: stop the work
+                    del self._in_flight[key]
+            if abandoned:
+                flight.cancel()
+            raise
+        finally:
+            with self._lock:
+                self._waiters[key] -= 1
+                if not self._waiters[key]:
+                    del self._waiters[key]
+
+    def _finish(self, key, flight: _Flight, task: asyncio.Future):
+        future = flight.future
+        with self._lock:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+        if task.cancelled(): # Abandoned, or its loop shut down; never a caller's cancellation
+            future.set_exception(RuntimeError("The shared call was cancelled"))
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
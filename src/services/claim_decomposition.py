@@ -0,0 +1,144 @@
+# /home/ubuntu/fact_checker_backend/src/services/claim_decomposition.py
+
+import os
+import re
+
+# Compound statements ("X was born in 1950 and later became mayor of Y") are split into
+# atomic sub-claims that are searched and verified separately (see verification_service).
+# Set DECOMPOSE_CLAIMS to "0" to always verify the statement as a whole.
+DECOMPOSE_CLAIMS = os.getenv("DECOMPOSE_CLAIMS", "1") != "0"
+DECOMPOSE_MIN_WORDS = int(os.getenv("DECOMPOSE_MIN_WORDS", "8")) # Shorter statements are never split
+DECOMPOSE_MAX_SUBCLAIMS = int(os.getenv("DECOMPOSE_MAX_SUBCLAIMS", "4"))
+_MIN_SUBCLAIM_WORDS = 3
+
+# Sentence ends: a period after a lowercase word or number ("U.S." and "Dr." don't end sentences)
+_SENTENCE_END_RE = re.compile(r"(?<=[a-z0-9]{2}[.!?])\s+(?=[A-Z])")
+# Clause connectives; a bare comma only separates verb phrases sharing a subject ("..., became mayor")
+_CONNECTIVE_RE = re.compile(r"(\s*;\s*|,?\s+(?:and|but|while|whereas)\s+|,\s+)", re.IGNORECASE)
+_WORD_RE = re.compile(r"[A-Za-z0-9']+")
+
+# Words that start the verb phrase of a clause. Regular past tenses ("founded") of five letters
+# or more are recognized by their ending; this lists auxiliaries, the irregular verbs common in
+# factual claims and the short past tenses ("died") that the ending rule can't tell from nouns ("bed").
+_VERBS = frozenset({
+    "is", "was", "are", "were", "be", "been", "has", "have", "had", "will", "would", "can", "could", "did",
+    "does", "do", "may", "might", "must", "should", "became", "becomes", "become", "won", "wins", "lost",
+    "loses", "wrote", "writes", "built", "builds", "made", "makes", "led", "leads", "held", "holds", "ran",
+    "runs", "began", "begins", "took", "takes", "gave", "gives", "left", "leaves", "went", "goes", "grew",
+    "grows", "fell", "falls", "sold", "sells", "bought", "buys", "found", "finds", "taught", "teaches",
+    "saw", "sees", "spent", "spends", "rose", "rises", "met", "meets", "knew", "knows", "contains",
+    "remains", "causes", "includes", "lives", "dies", "serves", "plays", "owns", "equals", "means",
+    "died", "lied", "tied", "fled", "fed", "bred", "sped", "shed", "wed", "owed", "sued", "used",
+})
+# Adverbs that may come between a connective and the verb ("and later became")
+_ADVERBS = frozenset({"also", "later", "then", "subsequently", "afterwards", "eventually", "still", "now",
+                      "once", "never", "not", "only", "soon", "finally", "previously"})
+_PRONOUNS = frozenset({"he", "she"}) # Almost always the subject before
+# Clauses starting with these could refer to anything before them, so they are not split off
+_DEPENDENT_STARTS = frozenset({"it", "its", "they", "their", "them", "this", "that", "these", "those", "which", "who"})
+
+
+def _is_verb(word: str) -> bool:
+    lower = word.lower()
+    # Capitalized "-ed" words are names ("United", "Ted"), not past tenses
+    return lower in _VERBS or (len(lower) > 4 and lower.endswith("ed") and not word[0].isupper())
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text)
+
+
+def _verb_position(words: list[str]) -> int:
+    """Index of the first verb in `words`, or -1."""
+    return next((i for i, word in enumerate(words) if _is_verb(word)), -1)
+
+
+def _starts_with_verb(words: list[str]) -> bool:
+    i = 0
+    while i < len(words) and words[i].lower() in _ADVERBS:
+        i += 1
+    return i < len(words) and _is_verb(words[i])
+
+
+def _subject(clause: str) -> str:
+    """
+    The text before the clause's first verb, without the adverbs right before the verb
+    ("Einstein never won" -> "Einstein"); "" if the clause has no verb, or starts with it.
+    """
+    words = list(_WORD_RE.finditer(clause))
+    verb = next((i for i, m in enumerate(words) if _is_verb(m.group())), None)
+    if not verb:
+        return ""
+    end = verb
+    while end > 0 and words[end - 1].group().lower() in _ADVERBS:
+        end -= 1 # Adverbs belong to this clause's verb, not to the verb phrases that inherit the subject
+    return clause[:words[end].start()].strip(" ,")
+
+
+def _resolve_pronoun(clause: str, subject: str) -> str:
+    """"he became mayor" -> "X became mayor" when X is the subject of the clause before."""
+    words = _words(clause)
+    if subject and words and words[0].lower() in _PRONOUNS:
+        return subject + clause[clause.index(words[0]) + len(words[0]):]
+    return clause
+
+
+def _split_sentence(sentence: str, subject: str) -> tuple[list[str], str]:
+    """
+    Splits one sentence at the connectives that join clauses, not the ones that join nouns.
+    `subject` is the latest subject of the sentences before; returns the clauses and the
+    latest subject after this sentence.
+    """
+    pieces = _CONNECTIVE_RE.split(sentence)
+    clauses = [_resolve_pronoun(pieces[0], subject)]
+    subject = _subject(clauses[0]) or subject # Given to later verb phrases without a subject
+    if _words(subject)[:1] and _words(subject)[0].lower() in _DEPENDENT_STARTS:
+        subject = "" # "It has 100 members and meets ..." must not give "It meets ..."
+    for separator, piece in zip(pieces[1::2], pieces[2::2]):
+        words = _words(piece)
+        if len(clauses) < DECOMPOSE_MAX_SUBCLAIMS and words and words[0].lower() not in _DEPENDENT_STARTS:
+            if separator.strip() == ";": # Always joins two sentences
+                clauses.append(_resolve_pronoun(piece, subject))
+                subject = _subject(clauses[-1]) or subject
+                continue
+            if subject and _verb_position(_words(clauses[-1])) >= 0:
+                if _starts_with_verb(words):
+                    # "X was born in 1950 and later became mayor" -> "X later became mayor"
+                    clauses.append(f"{subject} {piece}")
+                    continue
+                if separator.strip() != "," and _verb_position(words) > 0:
+                    clauses.append(_resolve_pronoun(piece, subject))
+                    subject = _subject(clauses[-1]) or subject
+                    continue
+        clauses[-1] += separator + piece
+    return clauses, subject
+
+
+def decompose_statement(statement: str) -> list[str]:
+    """
+    Splits a statement into atomic sub-claims; a statement that isn't compound comes back as
+    the only item.
+
+    Sentences are split at clause connectives (";", "and", "but", "while", "whereas", and
+    commas before a verb). A clause that starts with its verb, or with a pronoun, gets the
+    subject of the clause (or sentence) before it, so every sub-claim can be searched on its own. "and"
+    between nouns ("Tom and Jerry") is left alone: the part after it must have a verb.
+    Parts that would be shorter than a few words are not split off.
+    """
+    statement = statement.strip()
+    if not DECOMPOSE_CLAIMS or len(_words(statement)) < DECOMPOSE_MIN_WORDS:
+        return [statement]
+    parts, subject = [], ""
+    for sentence in _SENTENCE_END_RE.split(statement):
+        clauses, subject = _split_sentence(sentence.strip().rstrip(".!?"), subject)
+        for i, clause in enumerate(clauses):
+            clause, words = clause.strip(" ,;"), _words(clause)
+            if parts and i == 0 and words and words[0].lower() in _DEPENDENT_STARTS:
+                parts[-1] += ". " + clause # "X won a prize. It was ..." stays one claim
+            elif parts and len(words) < _MIN_SUBCLAIM_WORDS:
+                parts[-1] += " " + clause
+            elif clause:
+                parts.append(clause)
+    if len(parts) > DECOMPOSE_MAX_SUBCLAIMS:
+        parts = parts[:DECOMPOSE_MAX_SUBCLAIMS - 1] + [". ".join(parts[DECOMPOSE_MAX_SUBCLAIMS - 1:])]
+    return parts if len(parts) > 1 else [statement]
@@ -0,0 +1,72 @@
+# /home/ubuntu/fact_checker_backend/src/services/claim_index.py
+
+import hashlib
+import numpy as np
+from src.services.search_cache import normalize_query
+from src.services.text_utils import content_words
+
+# MinHash over character shingles of the normalized claim. 64 hash functions split into
+# 16 LSH bands of 4 rows: two claims share at least one band with high probability once
+# their shingle Jaccard similarity is above ~0.5, and are then compared exactly.
+SHINGLE_SIZE = 5
+NUM_HASHES = 64
+LSH_BANDS = 16
+_ROWS_PER_BAND = NUM_HASHES // LSH_BANDS
+
+_PRIME = (1 << 32) + 15 # Larger than any 32-bit shingle hash
+_rng = np.random.default_rng(20240611) # Fixed seed: band keys are persisted and must stay comparable
+_HASH_A = _rng.integers(1, 1 << 31, size=NUM_HASHES, dtype=np.uint64)
+_HASH_B = _rng.integers(0, 1 << 31, size=NUM_HASHES, dtype=np.uint64)
+
+
+def normalize_claim(statement: str) -> str:
+    """The cache-key normalization of search_cache (case, Unicode, punctuation, whitespace)."""
+    return normalize_query(statement)
+
+
+def shingles(normalized: str) -> set[str]:
+    """Character shingles of a normalized claim; short claims are a single shingle."""
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash_signature(shingle_set: set[str]) -> np.ndarray:
+    """NUM_HASHES uint64 MinHash values of a shingle set."""
+    hashes = np.fromiter((int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+                          for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+    return ((np.outer(_HASH_A, hashes) + _HASH_B[:, None]) % _PRIME).min(axis=1)
+
+
+def band_keys(signature: np.ndarray) -> list[int]:
+    """One signed 63-bit key per LSH band (fits an SQLite INTEGER column), tagged with the band number."""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND]
+        digest = hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little") >> 1)
+    return keys
+
+
+def is_near_duplicate(a: str, b: str, threshold: float) -> tuple[bool, float]:
+    """
+    Compares two normalized claims.
+
+    High shingle similarity alone is not enough: "visible from space" and "invisible from
+    space", or "in March" and "in April", differ by a few characters but mean different
+    things. Duplicates must also have the same content words (every word that isn't a
+    stopword, numbers and negations included), so they can only differ in function words,
+    word order and repetition.
+
+    Returns:
+        (duplicate, similarity): the exact shingle Jaccard similarity, and whether it reaches
+        `threshold` with the same content words in both claims.
+    """
+    similarity = jaccard(shingles(a), shingles(b))
+    return similarity >= threshold and content_words(a.split()) == content_words(b.split()), similarity
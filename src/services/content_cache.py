@@ -0,0 +1,139 @@
+# /home/ubuntu/fact_checker_backend/src/services/content_cache.py
+
+import asyncio
+import os
+import threading
+import time
+import urllib.parse
+from src.services.cache import TTLLRUCache
+from src.services.shared_cache import SharedCache, shared_cache
+
+# Cache configuration. The memory tier is per worker and only holds the hottest pages; the
+# node-wide shared cache (see shared_cache) is the second tier.
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+CONTENT_CACHE_TTL = float(os.getenv("CONTENT_CACHE_TTL", "3600")) # seconds an entry is served without revalidation
+CONTENT_CACHE_NEGATIVE_TTL = float(os.getenv("CONTENT_CACHE_NEGATIVE_TTL", "60")) # seconds a failure is remembered
+CONTENT_CACHE_STALE_RETENTION = float(os.getenv("CONTENT_CACHE_STALE_RETENTION", "86400")) # keep expired entries with validators this long for revalidation
+SHARED_NAMESPACE = "content"
+
+# Query parameters that never change page content and only fragment the cache
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a URL into a cache key: lowercases scheme and host, drops default ports,
+    fragments and tracking parameters (utm_*, fbclid, ...), and sorts the query string.
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS]
+    query.sort()
+    return urllib.parse.urlunsplit((scheme, host, parts.path or "/", urllib.parse.urlencode(query), ""))
+
+
+class ContentCache:
+    """
+    Two-tier cache for retrieved page text, keyed by normalized URL: a small in-memory LRU
+    per worker in front of the shared cache every worker on the node reads and writes.
+
+    Entries are dicts with "content", "tier", "etag", "last_modified", "is_error",
+    "expires_at" and "retain_until". An entry is fresh until "expires_at"; after that
+    it is kept until "retain_until" only so it can be revalidated with its ETag or
+    Last-Modified validator instead of being downloaded again. Failures are cached
+    for CONTENT_CACHE_NEGATIVE_TTL so a broken URL is not retried on every request.
+    """
+
+    def __init__(self, max_bytes: int = CONTENT_CACHE_MAX_BYTES, ttl: float = CONTENT_CACHE_TTL,
+                 negative_ttl: float = CONTENT_CACHE_NEGATIVE_TTL, shared: SharedCache = shared_cache):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._memory = TTLLRUCache(max_weight=max_bytes, default_ttl=ttl)
+        self._shared = shared if shared.enabled else None
+        self._counter_lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "shared_hits": 0, "negative_hits": 0, "stale_hits": 0,
+                         "misses": 0, "revalidated": 0, "stores": 0}
+
+    def _count(self, name: str):
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    @staticmethod
+    def is_fresh(entry: dict) -> bool:
+        return entry["expires_at"] > time.time()
+
+    def _remember(self, key: str, entry: dict):
+        weight = len(entry["content"].encode("utf-8")) + 256 # Rough per-entry overhead
+        self._memory.set(key, entry, ttl=entry["retain_until"] - time.time(), weight=weight)
+
+    async def get(self, url: str):
+        """
+        Looks up a URL in memory, then in the shared cache.
+
+        Returns:
+            The cached entry (possibly stale, check `is_fresh()`), or None on a miss.
+        """
+        key = normalize_url(url)
+        entry = self._memory.get(key)
+        source = "memory_hits"
+        if entry is None and self._shared is not None:
+            entry = await asyncio.to_thread(self._shared.get, SHARED_NAMESPACE, key)
+            if entry is not None:
+                source = "shared_hits"
+                self._remember(key, entry) # Promote to the memory tier
+        if entry is None:
+            self._count("misses")
+        elif not self.is_fresh(entry):
+            self._count("stale_hits")
+        elif entry["is_error"]:
+            self._count("negative_hits")
+        else:
+            self._count(source)
+        return entry
+
+    async def put(self, url: str, content: str, tier: str, etag: str = None, last_modified: str = None,
+                  ttl: float = None):
+        """Stores successfully retrieved content."""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        # Without validators an expired entry is useless, so don't keep it past its TTL
+        retain_until = expires_at + (CONTENT_CACHE_STALE_RETENTION if (etag or last_modified) else 0)
+        await self._store(url, {"content": content, "tier": tier, "etag": etag, "last_modified": last_modified,
+                                "is_error": False, "expires_at": expires_at, "retain_until": retain_until})
+
+    async def put_failure(self, url: str, content: str):
+        """Remembers a failed retrieval (the error message) for the negative-cache window."""
+        expires_at = time.time() + self.negative_ttl
+        await self._store(url, {"content": content, "tier": None, "etag": None, "last_modified": None,
+                                "is_error": True, "expires_at": expires_at, "retain_until": expires_at})
+
+    async def refresh(self, url: str, entry: dict):
+        """Marks a stale entry fresh again after the origin answered 304 Not Modified."""
+        self._count("revalidated")
+        await self.put(url, entry["content"], entry["tier"], etag=entry["etag"], last_modified=entry["last_modified"])
+
+    async def _store(self, url: str, entry: dict):
+        key = normalize_url(url)
+        self._count("stores")
+        self._remember(key, entry)
+        if self._shared is not None:
+            await asyncio.to_thread(self._shared.set, SHARED_NAMESPACE, key, entry, entry["retain_until"] - time.time())
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            counters = dict(self.counters)
+        hits = counters["memory_hits"] + counters["shared_hits"] + counters["negative_hits"]
+        lookups = hits + counters["misses"] + counters["stale_hits"]
+        counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        counters["memory"] = self._memory.stats()
+        counters["shared_enabled"] = self._shared is not None
+        return counters
+
+
+# The process-wide page content cache used by content_retrieval_service
+content_cache = ContentCache()
@@ -1,28 +1,122 @@
 # /home/ubuntu/fact_checker_backend/src/services/content_retrieval_service.py
 
 import asyncio
-from playwright.async_api import async_playwright
+import logging
+import os
+import time
+import httpx
+from src.services.browser_pool import browser_pool
+from src.services.content_cache import content_cache
+from src.services.cpu_executor import cpu_executor
+from src.services.host_scheduler import HostUnavailableError, host_scheduler
+from src.services.http_client import fetch_url
+from src.services.html_text_extractor import extract_main_text
+from src.services.metrics import span
+from src.services.request_blocking import page_context_options, request_filter
 
-async def retrieve_content_from_url(url: str) -> str:
+logger = logging.getLogger(__name__)
+
+# Limit content length to avoid overly long processing. Analysis ranks passages and only
+# scans the best ones for stance phrases, so this can be far above the old 10 KB.
+MAX_CONTENT_CHARS = int(os.getenv("CONTENT_MAX_CHARS", "50000"))
+# Below this many characters of extracted text the page is probably rendered client-side,
+# so the plain HTTP result is discarded and the browser is tried instead.
+HTTP_MIN_TEXT_LENGTH = int(os.getenv("HTTP_MIN_TEXT_LENGTH", "300"))
+
+# Values of the "tier" field reported by retrieve_page()
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+TIER_CACHE = "cache"
+
+
+def _clean_content(content: str) -> str:
+    # Basic cleaning of excessive newlines
+    content = "\n".join([line.strip() for line in content.split("\n") if line.strip()])
+    return content[:MAX_CONTENT_CHARS]
+
+
+def _extract_http_text(html: str) -> str:
+    # Runs on the CPU executor: the full HTML goes in, only the cleaned, truncated text comes back
+    return _clean_content(extract_main_text(html))
+
+
+async def _retrieve_with_http(url: str, cached: dict = None) -> dict:
     """
-    Retrieves the main textual content from a given URL.
+    Cheap first tier: plain HTTP GET plus main-content extraction in Python.
 
     Args:
-        url: The URL to fetch content from.
+        url: The URL to fetch.
+        cached: A stale cache entry; its ETag/Last-Modified are sent as validators.
 
     Returns:
-        The extracted textual content as a string, or an error message if retrieval fails.
+        A dictionary with "content", "etag", "last_modified" and "not_modified"
+        (True when the origin answered 304 for the cached entry), or None if the
+        page should be escalated to the browser (network error, non-HTML response,
+        error status or too little text).
     """
-    if not url or not url.startswith(("http://", "https://")):
-        return "Error: Invalid URL provided."
+    headers = {}
+    if cached and not cached["is_error"]:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+    async with host_scheduler.slot(url) as host_slot:
+        started = time.perf_counter()
+        try:
+            with span("fetch_http", url=url) as fetch_span:
+                response = await fetch_url(url, headers=headers or None)
+                fetch_span.fields["status"] = response["status"]
+        except httpx.HTTPError as e:
+            logger.info("HTTP fetch failed for %s, falling back to browser: %r", url, e)
+            response = None
+        host_slot.latency = time.perf_counter() - started
+        result = await _http_result(url, response, headers, cached) if response is not None else None
+        if result is None:
+            # Escalated: the browser tier records the host's outcome, so one slow or broken page
+            # counts as one failure for the breaker and the concurrency limit, not two
+            host_slot.discard()
+        return result
 
-    content = ""
-    async with async_playwright() as p:
-        # browser = await p.chromium.launch(headless=True)
-        browser = await p.firefox.launch(headless=True) # Sticking with Firefox
-        page = await browser.new_page()
+
+async def _http_result(url: str, response: dict, headers: dict, cached: dict):
+    """The result of _retrieve_with_http() for a response, or None to escalate it."""
+    if response["status"] == 304 and headers:
+        return {"content": cached["content"], "etag": cached["etag"], "last_modified": cached["last_modified"],
+                "not_modified": True}
+
+    content_type = response["headers"].get("content-type", "")
+    if response["status"] >= 400 or ("html" not in content_type and "xml" not in content_type):
+        logger.info("HTTP fetch of %s returned %s (%s), falling back to browser", url, response["status"],
+                    content_type or "no content type")
+        return None
+
+    with span("extract_text", url=url):
+        content = await cpu_executor.run(_extract_http_text, response["text"])
+    if len(content) < HTTP_MIN_TEXT_LENGTH:
+        logger.info("HTTP fetch of %s yielded only %d chars, falling back to browser", url, len(content))
+        return None
+    return {"content": content, "etag": response["headers"].get("etag"),
+            "last_modified": response["headers"].get("last-modified"), "not_modified": False}
+
+
+async def _retrieve_with_browser(url: str) -> str:
+    """Fallback tier: renders the page in a pooled headless browser."""
+    navigation = {} # How the page load went, for the host scheduler
+
+    async def _extract(page):
+        content = ""
         try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=15000) # 15 seconds timeout
+            await request_filter.install(page) # Only the document (and scripts, where enabled) is loaded
+            started = time.perf_counter()
+            try:
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=15000) # 15 seconds timeout
+                if response is not None and (response.status >= 500 or response.status == 429):
+                    navigation["error"] = f"HTTP {response.status}" # Overloaded or rate limiting us
+            except Exception as e:
+                navigation["error"] = type(e).__name__
+                raise
+            finally:
+                navigation["seconds"] = time.perf_counter() - started
             
             # Attempt to extract main content. This is a heuristic and might need refinement.
             # Common patterns for main content: <article>, <main>, role="main"
@@ -43,31 +137,110 @@ async def retrieve_content_from_url(url: str) -> str:
                 if body_element:
                     content = await body_element.inner_text()
 
-            # Basic cleaning of excessive newlines
             if content:
-                content = "\n".join([line.strip() for line in content.split("\n") if line.strip()])
-                content = content[:10000] # Limit content length to avoid overly long processing
+                content = _clean_content(content)
 
         except Exception as e:
-            print(f"Error retrieving content from {url}: {e}")
+            logger.warning("Error retrieving content from %s: %s", url, e)
             content = f"Error: Could not retrieve content from {url}. Details: {str(e)[:100]}"
-        finally:
-            await browser.close()
-            
+        return content
+
+    async with host_scheduler.slot(url) as host_slot:
+        try:
+            # Pages come from the shared browser pool instead of a per-call Firefox launch
+            with span("fetch_browser", url=url):
+                content = await browser_pool.run(_extract, **page_context_options(url))
+        except Exception as e:
+            logger.error("Could not get a browser page to retrieve %s: %s", url, e)
+            content = f"Error: Could not retrieve content from {url}. Details: {str(e)[:100]}"
+            if not navigation:
+                host_slot.discard() # A browser pool problem, not the host's
+        if "seconds" in navigation:
+            host_slot.latency = navigation["seconds"]
+        if "error" in navigation:
+            host_slot.fail(navigation["error"])
+
     return content.strip()
 
+
+async def retrieve_page(url: str) -> dict:
+    """
+    Retrieves the main textual content from a given URL. Fresh cached content is returned
+    without any network access; otherwise a plain HTTP fetch is tried first (revalidating a
+    stale cache entry if there is one) and the page is only rendered in a headless browser
+    when that yields too little text. Results, including failures, are cached.
+
+    Every fetch goes through the host scheduler (per-host concurrency and rate limits); a
+    host whose circuit breaker is open is not contacted at all. Each call records at most
+    one outcome for the host: that of the tier that served (or failed) the page.
+
+    Args:
+        url: The URL to fetch content from.
+
+    Returns:
+        A dictionary containing:
+        - "url": the requested URL
+        - "content": the extracted text, or an error message starting with "Error:"
+        - "tier": which tier served the content ("cache", "http" or "browser"), None for invalid URLs
+          and for hosts skipped by their circuit breaker
+    """
+    if not url or not url.startswith(("http://", "https://")):
+        return {"url": url, "content": "Error: Invalid URL provided.", "tier": None}
+
+    cached = await content_cache.get(url)
+    if cached is not None and content_cache.is_fresh(cached):
+        return {"url": url, "content": cached["content"], "tier": TIER_CACHE}
+
+    try:
+        fetched = await _retrieve_with_http(url, cached)
+        if fetched is not None:
+            if fetched["not_modified"]:
+                await content_cache.refresh(url, cached)
+                return {"url": url, "content": fetched["content"], "tier": TIER_CACHE}
+            await content_cache.put(url, fetched["content"], TIER_HTTP,
+                                    etag=fetched["etag"], last_modified=fetched["last_modified"])
+            return {"url": url, "content": fetched["content"], "tier": TIER_HTTP}
+
+        content = await _retrieve_with_browser(url)
+    except HostUnavailableError as e:
+        # The host's circuit breaker is open: skip it (a stale copy is better than nothing)
+        logger.info("Skipping %s: %s", url, e)
+        if cached is not None and not cached["is_error"]:
+            return {"url": url, "content": cached["content"], "tier": TIER_CACHE}
+        return {"url": url, "content": f"Error: Skipped {url}: {e}.", "tier": None}
+    if not content or content.startswith("Error:"):
+        await content_cache.put_failure(url, content or f"Error: No content found at {url}.")
+    else:
+        await content_cache.put(url, content, TIER_BROWSER)
+    return {"url": url, "content": content, "tier": TIER_BROWSER}
+
+
+async def retrieve_content_from_url(url: str) -> str:
+    """
+    Retrieves the main textual content from a given URL.
+
+    Args:
+        url: The URL to fetch content from.
+
+    Returns:
+        The extracted textual content as a string, or an error message if retrieval fails.
+    """
+    page = await retrieve_page(url)
+    return page["content"]
+
 # Example usage (for testing purposes)
 async def main_test():
     # Test with a known good URL if possible, or a placeholder
     # For a real test, you would use a URL from the search_service output
     test_url = "https://www.wikipedia.org/" # Example URL
     print(f"Retrieving content from: {test_url}")
-    page_content = await retrieve_content_from_url(test_url)
-    
+    page = await retrieve_page(test_url)
+    page_content = page["content"]
+
     if page_content.startswith("Error:"):
         print(page_content)
     else:
-        print(f"Retrieved Content (first 500 chars):\n{page_content[:500]}...")
+        print(f"Retrieved Content via {page['tier']} (first 500 chars):\n{page_content[:500]}...")
 
 if __name__ == '__main__':
     asyncio.run(main_test())
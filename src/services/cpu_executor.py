@@ -0,0 +1,96 @@
+# /home/ubuntu/fact_checker_backend/src/services/cpu_executor.py
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# CPU-bound work (HTML text extraction, passage ranking, scoring) runs here instead of on
+# the event loop. Kinds:
+#   "process" - a pool of worker processes; the loop never waits on the GIL for this work
+#   "thread"  - a thread pool; cheaper hand-off, but the work still competes for the GIL
+#   "inline"  - run directly on the calling thread (debugging, or single-request scripts)
+CPU_EXECUTOR_KIND = os.getenv("CPU_EXECUTOR", "process").lower()
+CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+def _ignore_sigint():
+    # Ctrl-C reaches the whole process group; the parent shuts the workers down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _process_context():
+    # The server process has other threads running (browser pool, debug capture writer),
+    # which makes plain fork() unsafe; forkserver starts workers from a clean process.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class CpuExecutor:
+    """
+    Runs CPU-bound functions off the event loop, in a lazily created thread or process pool.
+
+    Functions and arguments sent to a process pool are pickled, so callers should pass
+    module-level functions and only the fields the work needs (plain strings, tuples)
+    rather than whole request or page dicts, and return small results.
+    """
+
+    def __init__(self, kind: str = CPU_EXECUTOR_KIND, max_workers: int = CPU_EXECUTOR_WORKERS):
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def configure(self, kind: str = None, max_workers: int = None):
+        """Switches executor kind and/or size; the current pool (if any) is shut down."""
+        self.shutdown()
+        if kind is not None:
+            self.kind = kind
+        if max_workers is not None:
+            self.max_workers = max(1, max_workers)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_process_context(),
+                                                         initializer=_ignore_sigint)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cpu-worker")
+            return self._executor
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn, *args):
+        """Runs fn(*args) in the pool and returns its result."""
+        if self.kind == "inline":
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); replace the pool and retry once
+            logger.error("CPU executor pool broke while running %s, restarting it", getattr(fn, "__name__", fn))
+            self._discard(executor)
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# The process-wide executor shared by content retrieval and analysis
+cpu_executor = CpuExecutor()
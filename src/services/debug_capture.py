@@ -0,0 +1,160 @@
+# /home/ubuntu/fact_checker_backend/src/services/debug_capture.py
+
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Debug capture is off by default. Modes:
+#   "off"     - never capture
+#   "failure" - capture only when a search fails or yields no results
+#   "sample"  - capture failures, plus 1 in DEBUG_CAPTURE_SAMPLE_RATE successful requests
+#   "always"  - capture every request (local debugging only)
+DEBUG_CAPTURE_MODE = os.getenv("DEBUG_CAPTURE_MODE", "off").lower()
+DEBUG_CAPTURE_SAMPLE_RATE = int(os.getenv("DEBUG_CAPTURE_SAMPLE_RATE", "100"))
+DEBUG_CAPTURE_DIR = os.getenv("DEBUG_CAPTURE_DIR", "/tmp/fact_checker_debug")
+DEBUG_CAPTURE_SCREENSHOTS = os.getenv("DEBUG_CAPTURE_SCREENSHOTS", "true").lower() in ("1", "true", "yes")
+DEBUG_CAPTURE_MAX_BYTES = int(os.getenv("DEBUG_CAPTURE_MAX_BYTES", str(200 * 1024 * 1024)))
+DEBUG_CAPTURE_MAX_AGE = float(os.getenv("DEBUG_CAPTURE_MAX_AGE", str(3 * 24 * 3600))) # seconds
+DEBUG_CAPTURE_ROTATE_EVERY = 20 # Rotate the directory after this many writes
+# File names written by _submit(): "<YYYYmmdd-HHMMSS>-<label>-<8 hex>.html" (or .png). Rotation
+# only ever deletes files named like this, in case the directory is shared with other files.
+_CAPTURE_NAME_RE = re.compile(r"^\d{8}-\d{6}-[\w-]+-[0-9a-f]{8}\.(?:html|png)$")
+
+
+class DebugCapture:
+    """
+    Samples search pages (HTML and optionally a screenshot) to disk for debugging selectors.
+
+    Capturing from the page is awaited (it must happen before the page is closed), but
+    only for sampled requests. Disk writes and rotation happen on a single background
+    writer thread, so they never block the event loop. Every capture gets a unique
+    file name, so concurrent requests never overwrite each other's files.
+    """
+
+    def __init__(self, mode: str = DEBUG_CAPTURE_MODE, sample_rate: int = DEBUG_CAPTURE_SAMPLE_RATE,
+                 directory: str = DEBUG_CAPTURE_DIR, screenshots: bool = DEBUG_CAPTURE_SCREENSHOTS,
+                 max_bytes: int = DEBUG_CAPTURE_MAX_BYTES, max_age: float = DEBUG_CAPTURE_MAX_AGE):
+        self.mode = mode
+        self.sample_rate = max(1, sample_rate)
+        self.directory = directory
+        self.screenshots = screenshots
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._request_counter = itertools.count(1)
+        self._writes_since_rotation = 0
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def should_capture(self, failed: bool) -> bool:
+        """Decides whether this request is captured, according to the mode and sample rate."""
+        if self.mode == "always":
+            return True
+        if self.mode in ("failure", "sample") and failed:
+            return True
+        if self.mode == "sample":
+            return next(self._request_counter) % self.sample_rate == 0
+        return False
+
+    def _get_writer(self) -> ThreadPoolExecutor:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debug-capture")
+            return self._writer
+
+    async def capture_page(self, page, label: str, failed: bool = False, html: str = None):
+        """
+        Captures a Playwright page if this request is sampled. Never raises.
+
+        Args:
+            page: The Playwright page to capture.
+            label: Short tag included in the file names (e.g. "search").
+            failed: Whether the request failed; failures are captured in "failure" and "sample" modes.
+            html: Already-fetched page HTML, to avoid another page.content() round-trip.
+        """
+        if not self.enabled or not self.should_capture(failed):
+            return
+        try:
+            if html is None:
+                html = await page.content()
+            screenshot = await page.screenshot() if self.screenshots else None
+        except Exception as e:
+            logger.warning("Could not capture debug HTML/screenshot: %s", e)
+            return
+        self._submit(label, html, screenshot)
+
+    def capture_html(self, label: str, html: str, failed: bool = False):
+        """Captures already-fetched HTML (no browser involved) if this request is sampled."""
+        if not self.enabled or not self.should_capture(failed):
+            return
+        self._submit(label, html, None)
+
+    def _submit(self, label: str, html: str, screenshot: bytes):
+        base_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}"
+        self._get_writer().submit(self._write, base_name, html, screenshot)
+
+    def _write(self, base_name: str, html: str, screenshot: bytes):
+        # Runs on the writer thread
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            html_path = os.path.join(self.directory, f"{base_name}.html")
+            with open(html_path, "w", encoding="utf-8") as f_html:
+                f_html.write(html)
+            if screenshot:
+                with open(os.path.join(self.directory, f"{base_name}.png"), "wb") as f_png:
+                    f_png.write(screenshot)
+            logger.info("Debug capture saved to %s", html_path)
+        except Exception as e:
+            logger.warning("Could not write debug capture %s: %s", base_name, e)
+            return
+        self._writes_since_rotation += 1
+        if self._writes_since_rotation >= DEBUG_CAPTURE_ROTATE_EVERY:
+            self._writes_since_rotation = 0
+            self.rotate()
+
+    def rotate(self):
+        """
+        Deletes captures older than max_age, then the oldest ones until under max_bytes.
+        Files in the directory that this class didn't name are neither counted nor deleted.
+        """
+        try:
+            entries = []
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if _CAPTURE_NAME_RE.match(name) and os.path.isfile(path):
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        except FileNotFoundError:
+            return
+        entries.sort()
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                logger.warning("Could not remove old debug capture %s: %s", path, e)
+
+    def shutdown(self):
+        """Waits for pending writes to finish."""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.shutdown(wait=True)
+                self._writer = None
+
+
+# The process-wide debug capture used by search_service
+debug_capture = DebugCapture()
@@ -0,0 +1,295 @@
+# /home/ubuntu/fact_checker_backend/src/services/host_scheduler.py
+
+import asyncio
+import collections
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Per-host limits for page fetches. The concurrency limit adapts (AIMD): it grows by one slot
+# per "limit" successful fetches up to HOST_MAX_CONCURRENCY and halves on every failure.
+HOST_INITIAL_CONCURRENCY = int(os.getenv("HOST_INITIAL_CONCURRENCY", "2"))
+HOST_MAX_CONCURRENCY = int(os.getenv("HOST_MAX_CONCURRENCY", "6"))
+HOST_RATE_PER_S = float(os.getenv("HOST_RATE_PER_S", "5")) # Token bucket refill rate; 0 disables rate limiting
+HOST_BURST = int(os.getenv("HOST_BURST", "10")) # Token bucket size
+# Circuit breaker: after this many consecutive failures a host is skipped for the cooldown,
+# then a single probe fetch decides whether it is closed again or reopened.
+HOST_BREAKER_FAILURES = int(os.getenv("HOST_BREAKER_FAILURES", "3"))
+HOST_BREAKER_COOLDOWN_S = float(os.getenv("HOST_BREAKER_COOLDOWN_S", "60"))
+HOST_LATENCY_EWMA_ALPHA = 0.3
+HOST_DEFAULT_LATENCY_S = 2.0 # Expected latency of a host that hasn't been fetched from yet
+HOST_SCHEDULER_MAX_HOSTS = 2000 # Idle hosts beyond this are forgotten, least recently used first
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class HostUnavailableError(Exception):
+    """Raised by HostScheduler.slot() while the host's circuit breaker is open."""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"{host} is skipped for {retry_after:.0f}s after repeated failures")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def host_of(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class _HostState:
+    def __init__(self, limit: int, burst: int):
+        self.limit = float(limit)
+        self.in_flight = 0
+        self.waiters = collections.deque() # Futures of fetches waiting for a concurrency slot
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.breaker = BREAKER_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probing = False # A half-open probe fetch is running
+        self.latency_ewma = None
+        self.counts = {"ok": 0, "error": 0, "cancelled": 0, "rejected": 0, "breaker_opened": 0}
+
+    @property
+    def idle(self) -> bool:
+        return self.in_flight == 0 and not self.waiters and self.breaker == BREAKER_CLOSED
+
+
+class HostSlot:
+    """
+    Handed out by HostScheduler.slot(). Exceptions raised inside the block count as host
+    failures; call fail() for failures that don't raise (timeouts caught further down, 5xx
+    responses) and discard() when the request never reached the host. `latency` can be set
+    when the block's duration isn't the host's latency.
+    """
+
+    def __init__(self):
+        self.failure = None
+        self.latency = None
+        self.discarded = False
+
+    def fail(self, reason: str):
+        self.failure = reason
+
+    def discard(self):
+        self.discarded = True
+
+
+class HostScheduler:
+    """
+    Admission control for fetches, per host: a concurrency limit that adapts to failures,
+    a token bucket rate limit, a circuit breaker that skips a failing host for a cooldown
+    instead of paying its full timeout on every request, and a latency EWMA callers can use
+    to prefer faster hosts.
+
+    State is shared by every event loop of the process (the browser pool runs on its own).
+    """
+
+    def __init__(self, initial_concurrency: int = HOST_INITIAL_CONCURRENCY,
+                 max_concurrency: int = HOST_MAX_CONCURRENCY, rate: float = HOST_RATE_PER_S,
+                 burst: int = HOST_BURST, breaker_failures: int = HOST_BREAKER_FAILURES,
+                 breaker_cooldown: float = HOST_BREAKER_COOLDOWN_S, max_hosts: int = HOST_SCHEDULER_MAX_HOSTS):
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.max_hosts = max_hosts
+        self._hosts = collections.OrderedDict() # host -> _HostState, least recently used first
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        # Called with the lock held
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial_concurrency, self.burst)
+            if len(self._hosts) > self.max_hosts:
+                for old_host in [h for h, s in self._hosts.items() if s.idle][:len(self._hosts) - self.max_hosts]:
+                    del self._hosts[old_host]
+        else:
+            self._hosts.move_to_end(host)
+        return state
+
+    def available(self, url: str) -> bool:
+        """False while the host's circuit breaker is open (and its cooldown hasn't passed)."""
+        with self._lock:
+            state = self._hosts.get(host_of(url))
+            return (state is None or state.breaker != BREAKER_OPEN
+                    or time.monotonic() - state.opened_at >= self.breaker_cooldown)
+
+    def expected_latency(self, url: str) -> float:
+        """The host's fetch latency EWMA in seconds (HOST_DEFAULT_LATENCY_S for unknown hosts)."""
+        with self._lock:
+            state = self._hosts.get(host_of(url))
+            if state is None or state.latency_ewma is None:
+                return HOST_DEFAULT_LATENCY_S
+            return state.latency_ewma
+
+    def _admit(self, host: str, state: _HostState) -> bool:
+        """Checks the breaker; returns whether this fetch is the half-open probe."""
+        with self._lock:
+            if state.breaker == BREAKER_OPEN:
+                remaining = self.breaker_cooldown - (time.monotonic() - state.opened_at)
+                if remaining > 0:
+                    state.counts["rejected"] += 1
+                    raise HostUnavailableError(host, remaining)
+                state.breaker = BREAKER_HALF_OPEN
+            if state.breaker == BREAKER_HALF_OPEN:
+                if state.probing:
+                    state.counts["rejected"] += 1
+                    raise HostUnavailableError(host, self.breaker_cooldown)
+                state.probing = True
+                return True
+            return False
+
+    async def _wait_for_token(self, state: _HostState):
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            state.tokens = min(float(self.burst), state.tokens + (now - state.refilled_at) * self.rate)
+            state.refilled_at = now
+            state.tokens -= 1 # Reserve a token; a negative balance is the wait for it
+            wait = -state.tokens / self.rate
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                with self._lock:
+                    state.tokens += 1
+                raise
+
+    def _grant(self, state: _HostState, future: asyncio.Future):
+        # Runs on the waiter's loop; the slot was already counted in in_flight for it
+        if not future.done():
+            future.set_result(None)
+        else: # The waiter was cancelled in the meantime
+            self._release_slot(state)
+
+    def _release_slot(self, state: _HostState):
+        with self._lock:
+            state.in_flight -= 1
+            self._wake_waiters(state)
+
+    def _wake_waiters(self, state: _HostState):
+        # Called with the lock held
+        while state.waiters and state.in_flight < int(state.limit):
+            future = state.waiters.popleft()
+            if future.done():
+                continue
+            state.in_flight += 1
+            future.get_loop().call_soon_threadsafe(self._grant, state, future)
+
+    async def _acquire_slot(self, state: _HostState):
+        with self._lock:
+            if state.in_flight < int(state.limit) and not state.waiters:
+                state.in_flight += 1
+                return
+            future = asyncio.get_running_loop().create_future()
+            state.waiters.append(future)
+        try:
+            await future
+        except BaseException:
+            with self._lock:
+                granted = future.done() and not future.cancelled()
+                if not granted:
+                    try:
+                        state.waiters.remove(future)
+                    except ValueError:
+                        pass
+            if granted:
+                self._release_slot(state)
+            raise
+
+    def _record(self, host: str, state: _HostState, outcome: str, slot: HostSlot, latency: float, probe: bool):
+        with self._lock:
+            state.counts[outcome] += 1
+            if probe:
+                state.probing = False
+            if outcome != "cancelled":
+                state.latency_ewma = latency if state.latency_ewma is None else \
+                    HOST_LATENCY_EWMA_ALPHA * latency + (1 - HOST_LATENCY_EWMA_ALPHA) * state.latency_ewma
+            if outcome == "ok":
+                state.consecutive_failures = 0
+                state.limit = min(float(self.max_concurrency), state.limit + 1 / state.limit)
+                if state.breaker == BREAKER_HALF_OPEN:
+                    state.breaker = BREAKER_CLOSED
+                    logger.info("Circuit breaker for %s closed again", host)
+            elif outcome == "error":
+                state.consecutive_failures += 1
+                state.limit = max(1.0, state.limit / 2)
+                if state.breaker == BREAKER_HALF_OPEN or state.consecutive_failures >= self.breaker_failures:
+                    if state.breaker != BREAKER_OPEN:
+                        state.counts["breaker_opened"] += 1
+                        logger.warning("Circuit breaker for %s opened after %d consecutive failures (last: %s)",
+                                       host, state.consecutive_failures, slot.failure)
+                    state.breaker = BREAKER_OPEN
+                    state.opened_at = time.monotonic()
+            state.in_flight -= 1
+            self._wake_waiters(state)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """
+        Waits for a fetch slot for the URL's host and yields a HostSlot; the fetch's outcome
+        and latency are recorded when the block exits.
+
+        Raises:
+            HostUnavailableError: at once, while the host's circuit breaker is open.
+        """
+        host = host_of(url)
+        with self._lock:
+            state = self._state(host)
+        probe = self._admit(host, state)
+        try:
+            await self._wait_for_token(state)
+            await self._acquire_slot(state)
+        except BaseException:
+            if probe:
+                with self._lock:
+                    state.probing = False
+            raise
+        slot = HostSlot()
+        started = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            yield slot
+            outcome = "cancelled" if slot.discarded else "error" if slot.failure else "ok"
+        except Exception as e:
+            slot.failure = slot.failure or type(e).__name__
+            outcome = "error"
+            raise
+        finally:
+            latency = slot.latency if slot.latency is not None else time.perf_counter() - started
+            self._record(host, state, outcome, slot, latency, probe)
+
+    def stats(self) -> dict:
+        """Per-host state, keyed by host."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    "breaker": state.breaker,
+                    "breaker_retry_after": round(max(0.0, self.breaker_cooldown - (now - state.opened_at)), 1)
+                    if state.breaker == BREAKER_OPEN else 0.0,
+                    "concurrency_limit": int(state.limit),
+                    "in_flight": state.in_flight,
+                    "waiting": len(state.waiters),
+                    "latency_ewma": state.latency_ewma,
+                    **state.counts,
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+# The process-wide scheduler used for page retrieval
+host_scheduler = HostScheduler()
@@ -0,0 +1,129 @@
+# /home/ubuntu/fact_checker_backend/src/services/html_text_extractor.py
+
+import logging
+from html.parser import HTMLParser
+
+logger = logging.getLogger(__name__)
+
+# Same preference order as the browser tier: the first container found wins.
+# Each entry is (tag or None, attribute name, attribute value or None, class name or None).
+MAIN_CONTENT_CANDIDATES = [
+    ("article", None, None, None),
+    ("main", None, None, None),
+    (None, "role", "main", None),
+    (None, None, None, "post-content"),
+    (None, None, None, "entry-content"),
+]
+
+# Elements whose text is noise for fact checking (same list the browser tier strips)
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "iframe"}
+
+# Elements that start a new line of text when rendered
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "br", "li", "ul", "ol", "tr", "table", "h1", "h2", "h3",
+    "h4", "h5", "h6", "blockquote", "pre", "dd", "dt", "figcaption", "hr", "title",
+}
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+class _MainTextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = [] # Open element names
+        self.skip_depth = None # Stack depth at which a skipped element was opened
+        self.candidate_depths = {} # Candidate index -> stack depth while it is open
+        self.candidate_text = {} # Candidate index -> text chunks of its first occurrence
+        self.body_text = []
+
+    def _matches(self, tag, attrs, candidate):
+        cand_tag, attr_name, attr_value, class_name = candidate
+        if cand_tag and tag != cand_tag:
+            return False
+        attr_map = dict(attrs)
+        if attr_name and attr_map.get(attr_name) != attr_value:
+            return False
+        if class_name and class_name not in (attr_map.get("class") or "").split():
+            return False
+        return True
+
+    def _emit(self, text):
+        if self.skip_depth is not None:
+            return
+        self.body_text.append(text)
+        for idx in self.candidate_depths:
+            self.candidate_text[idx].append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._emit("\n")
+        if tag in VOID_TAGS:
+            return
+        self.stack.append(tag)
+        depth = len(self.stack)
+        if self.skip_depth is None and (tag in SKIPPED_TAGS or dict(attrs).get("aria-hidden") == "true"):
+            self.skip_depth = depth
+            return
+        for idx, candidate in enumerate(MAIN_CONTENT_CANDIDATES):
+            if idx not in self.candidate_text and self._matches(tag, attrs, candidate):
+                self.candidate_depths[idx] = depth
+                self.candidate_text[idx] = []
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._emit("\n")
+
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return # Stray end tag
+        # Pop up to and including the matching element, implicitly closing unclosed children
+        while self.stack:
+            depth = len(self.stack)
+            open_tag = self.stack.pop()
+            if self.skip_depth == depth:
+                self.skip_depth = None
+            for idx, cand_depth in list(self.candidate_depths.items()):
+                if cand_depth == depth:
+                    del self.candidate_depths[idx]
+            if open_tag == tag:
+                break
+        if tag in BLOCK_TAGS:
+            self._emit("\n")
+
+    def handle_data(self, data):
+        self._emit(data)
+
+
+def _normalize_lines(chunks: list[str]) -> str:
+    text = "".join(chunks)
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def extract_main_text(html: str) -> str:
+    """
+    Extracts the main readable text from an HTML document without a browser.
+
+    Mirrors the heuristics of the browser tier: prefer <article>, <main>, [role="main"],
+    .post-content or .entry-content, and otherwise fall back to the whole document with
+    scripts, navigation, headers, footers, asides and forms removed.
+
+    Args:
+        html: The raw HTML document.
+
+    Returns:
+        The extracted text with one non-empty line per block, or "" if nothing was found.
+    """
+    parser = _MainTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e: # html.parser is lenient, but never let markup break retrieval
+        logger.warning("HTML text extraction failed part-way: %s", e)
+
+    for idx in range(len(MAIN_CONTENT_CANDIDATES)):
+        if idx in parser.candidate_text:
+            text = _normalize_lines(parser.candidate_text[idx])
+            if text:
+                return text
+    return _normalize_lines(parser.body_text)
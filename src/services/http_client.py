@@ -0,0 +1,90 @@
+# /home/ubuntu/fact_checker_backend/src/services/http_client.py
+
+import asyncio
+import os
+import weakref
+import httpx
+
+# Plain HTTP fetch settings. Kept deliberately tight: this tier is only worth it if it is fast.
+HTTP_FETCH_TIMEOUT = float(os.getenv("HTTP_FETCH_TIMEOUT", "5")) # seconds
+HTTP_FETCH_MAX_BYTES = int(os.getenv("HTTP_FETCH_MAX_BYTES", str(2 * 1024 * 1024))) # 2 MB body cap
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "50"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "20"))
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# httpx clients are tied to the event loop they were first used on, so keep one per loop.
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the pooled keep-alive client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=httpx.Timeout(HTTP_FETCH_TIMEOUT),
+            limits=httpx.Limits(max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                                max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client():
+    """Closes the pooled client belonging to the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def fetch_url(url: str, headers: dict = None) -> dict:
+    """
+    Fetches a URL with the pooled client, reading at most HTTP_FETCH_MAX_BYTES of the body.
+
+    Args:
+        url: The URL to fetch.
+        headers: Optional extra request headers.
+
+    Returns:
+        A dictionary containing:
+        - "url": the final URL after redirects
+        - "status": HTTP status code
+        - "headers": response headers
+        - "text": the decoded (possibly truncated) body
+        - "truncated": whether the size cap was hit
+
+    Raises:
+        httpx.HTTPError on connection errors or timeouts.
+    """
+    client = get_http_client()
+    async with client.stream("GET", url, headers=headers) as response:
+        chunks = []
+        size = 0
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= HTTP_FETCH_MAX_BYTES:
+                truncated = True
+                break
+        body = b"".join(chunks)[:HTTP_FETCH_MAX_BYTES]
+        encoding = response.charset_encoding or "utf-8"
+        try:
+            text = body.decode(encoding, errors="replace")
+        except LookupError: # Unknown charset advertised by the server
+            text = body.decode("utf-8", errors="replace")
+        return {
+            "url": str(response.url),
+            "status": response.status_code,
+            "headers": response.headers,
+            "text": text,
+            "truncated": truncated,
+        }
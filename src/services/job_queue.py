@@ -0,0 +1,288 @@
+# /home/ubuntu/fact_checker_backend/src/services/job_queue.py
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from src.services.metrics import span
+from src.services.verification_service import VERIFY_DEADLINE_S, verify_statement
+
+logger = logging.getLogger(__name__)
+
+# Verification jobs live in SQLite, so every server worker can accept a job, any worker can
+# run it and a poll can be answered by whichever worker receives it. No outside broker.
+_DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database", "jobs.db")
+JOB_QUEUE_DB_PATH = os.getenv("JOB_QUEUE_DB_PATH", _DEFAULT_DB_PATH)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4")) # Jobs run concurrently per server worker
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", "500")) # Queued jobs across all lanes
+JOB_RESULT_TTL_S = float(os.getenv("JOB_RESULT_TTL_S", "3600")) # Finished jobs can be polled this long
+JOB_POLL_INTERVAL_S = float(os.getenv("JOB_POLL_INTERVAL_S", "0.5")) # Idle workers check for jobs queued elsewhere
+# A job still "running" this long after it started belongs to a worker that died; it is run again
+JOB_STALE_AFTER_S = float(os.getenv("JOB_STALE_AFTER_S", str(VERIFY_DEADLINE_S * 3)))
+# A job that was claimed this often without finishing (it keeps killing its worker) is failed instead
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# After a database error a worker waits this long before trying again, doubling up to the max
+JOB_ERROR_BACKOFF_S = float(os.getenv("JOB_ERROR_BACKOFF_S", "1"))
+JOB_ERROR_BACKOFF_MAX_S = float(os.getenv("JOB_ERROR_BACKOFF_MAX_S", "30"))
+
+# Priority lanes, served strictly in this order (FIFO within a lane). The low lane only
+# gets half of the queue, so bulk submissions can't lock out interactive ones.
+PRIORITY_LANES = {"high": 0, "normal": 1, "low": 2}
+LANE_MAX_DEPTH = {"high": JOB_QUEUE_MAX_DEPTH, "normal": JOB_QUEUE_MAX_DEPTH, "low": JOB_QUEUE_MAX_DEPTH // 2}
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised by submit() when the queue (or the job's lane) is at its depth limit."""
+
+
+class _JobTable:
+    """SQLite job table; every method is blocking and serialized by a lock."""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000") # Other server workers write to the same file
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verify_jobs ("
+            " id TEXT PRIMARY KEY, statement TEXT NOT NULL, lane TEXT NOT NULL, priority INTEGER NOT NULL,"
+            " status TEXT NOT NULL, result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL,"
+            " finished_at REAL, attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(verify_jobs)")}
+        if "attempts" not in columns: # Table created before jobs counted their attempts
+            try:
+                self._conn.execute("ALTER TABLE verify_jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError: # Another server worker added it first
+                pass
+        self._conn.execute("CREATE INDEX IF NOT EXISTS verify_jobs_queue ON verify_jobs (status, priority, created_at)")
+
+    def insert(self, job_id: str, statement: str, lane: str, lane_max_depth: int, max_depth: int) -> bool:
+        """Queues a job unless the lane or the whole queue is full; the check and insert are atomic."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                total, in_lane = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(lane = ?), 0) FROM verify_jobs WHERE status = ?",
+                    (lane, STATUS_QUEUED)).fetchone()
+                if total >= max_depth or in_lane >= lane_max_depth:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.execute(
+                    "INSERT INTO verify_jobs (id, statement, lane, priority, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, statement, lane, PRIORITY_LANES[lane], STATUS_QUEUED, time.time()))
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def claim(self, stale_before: float, max_attempts: int):
+        """
+        Marks the next job (highest priority, oldest first) as running and returns (id, statement), or None.
+        Stale running jobs that already had `max_attempts` attempts are marked failed, not claimed.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                self._conn.execute(
+                    "UPDATE verify_jobs SET status = ?, error = ?, finished_at = ?"
+                    " WHERE status = ? AND started_at < ? AND attempts >= ?",
+                    (STATUS_FAILED, f"The job did not finish in {max_attempts} attempts", now,
+                     STATUS_RUNNING, stale_before, max_attempts))
+                job = self._conn.execute(
+                    "UPDATE verify_jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ("
+                    " SELECT id FROM verify_jobs WHERE status = ? OR (status = ? AND started_at < ?)"
+                    " ORDER BY priority, created_at LIMIT 1) RETURNING id, statement",
+                    (STATUS_RUNNING, now, STATUS_QUEUED, STATUS_RUNNING, stale_before)).fetchone()
+                self._conn.execute("COMMIT")
+                return job
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def finish(self, job_id: str, status: str, result: str = None, error: str = None):
+        with self._lock:
+            self._conn.execute("UPDATE verify_jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                               (status, result, error, time.time(), job_id))
+
+    def get(self, job_id: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, statement, lane, status, result, error, created_at, started_at, finished_at"
+                " FROM verify_jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row[3] != STATUS_QUEUED:
+                return row, None
+            ahead = self._conn.execute(
+                "SELECT COUNT(*) FROM verify_jobs WHERE status = ? AND (priority < ? OR (priority = ? AND created_at < ?))",
+                (STATUS_QUEUED, PRIORITY_LANES[row[2]], PRIORITY_LANES[row[2]], row[6])).fetchone()[0]
+            return row, ahead
+
+    def depths(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, lane, COUNT(*) FROM verify_jobs GROUP BY status, lane").fetchall()
+        return {(status, lane): count for status, lane, count in rows}
+
+    def purge_finished(self, finished_before: float):
+        with self._lock:
+            self._conn.execute("DELETE FROM verify_jobs WHERE status IN (?, ?) AND finished_at < ?",
+                               (STATUS_DONE, STATUS_FAILED, finished_before))
+
+
+class JobQueue:
+    """
+    Queue of verification jobs with priority lanes, depth limits and a bounded set of workers.
+
+    submit() returns a job id at once; each server worker runs up to `workers` jobs at a time
+    through verify_statement(), and get() reports status and result. Jobs are kept in
+    SQLite (JOB_QUEUE_DB_PATH, ":memory:" for a single-process queue), so they survive a
+    worker restart: a job left "running" by a dead worker is picked up again after
+    JOB_STALE_AFTER_S, up to JOB_MAX_ATTEMPTS attempts in all; then it is marked failed.
+    """
+
+    def __init__(self, db_path: str = JOB_QUEUE_DB_PATH, workers: int = JOB_WORKERS,
+                 max_depth: int = JOB_QUEUE_MAX_DEPTH, result_ttl: float = JOB_RESULT_TTL_S):
+        self.db_path = db_path
+        self.workers = workers
+        self.max_depth = max_depth
+        self.result_ttl = result_ttl
+        self._table = None
+        self._table_lock = threading.Lock()
+        self._tasks = []
+        self._wakeup = None
+        self.rejected = 0
+
+    def _get_table(self) -> _JobTable:
+        with self._table_lock:
+            if self._table is None:
+                self._table = _JobTable(self.db_path)
+            return self._table
+
+    async def start(self):
+        """Starts the workers on the running event loop (the app's startup hook)."""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self._get_table)
+        self._tasks = [asyncio.create_task(self._worker(i), name=f"verify-job-worker-{i}") for i in range(self.workers)]
+
+    async def stop(self):
+        """Cancels the workers. Jobs they were running stay "running" and are retried once stale."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, statement: str, lane: str = "normal") -> str:
+        """
+        Queues a statement for verification.
+
+        Returns:
+            The job id.
+
+        Raises:
+            ValueError: for an unknown lane (or one that isn't a string).
+            QueueFullError: when the lane or the queue is at its depth limit.
+        """
+        if not isinstance(lane, str) or lane not in PRIORITY_LANES:
+            raise ValueError(f"Unknown priority {lane!r}; expected one of {', '.join(PRIORITY_LANES)}")
+        job_id = uuid.uuid4().hex
+        accepted = await asyncio.to_thread(self._get_table().insert, job_id, statement, lane,
+                                           LANE_MAX_DEPTH[lane], self.max_depth)
+        if not accepted:
+            self.rejected += 1
+            raise QueueFullError(f"The {lane} verification queue is full")
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str):
+        """
+        Returns the job as a dict ("job_id", "statement", "priority", "status", "created_at",
+        "started_at", "finished_at", plus "queue_position" while queued, "result" when done
+        and "error" when failed), or None for an unknown or expired job.
+        """
+        row, ahead = await asyncio.to_thread(self._get_table().get, job_id)
+        if row is None:
+            return None
+        job_id, statement, lane, status, result, error, created_at, started_at, finished_at = row
+        job = {"job_id": job_id, "statement": statement, "priority": lane, "status": status,
+               "created_at": created_at, "started_at": started_at, "finished_at": finished_at}
+        if status == STATUS_QUEUED:
+            job["queue_position"] = ahead + 1
+        elif status == STATUS_DONE:
+            job["result"] = json.loads(result)
+        elif status == STATUS_FAILED:
+            job["error"] = error
+        return job
+
+    def stats(self) -> dict:
+        depths = self._get_table().depths()
+        return {
+            "queued": {lane: depths.get((STATUS_QUEUED, lane), 0) for lane in PRIORITY_LANES},
+            "running": sum(count for (status, _), count in depths.items() if status == STATUS_RUNNING),
+            "max_depth": self.max_depth,
+            "workers": len(self._tasks),
+            "rejected": self.rejected,
+        }
+
+    async def _next_job(self):
+        table = self._get_table()
+        while True:
+            # Cleared before claiming, so a submit() that lands while the claim runs still wakes us
+            self._wakeup.clear()
+            job = await asyncio.to_thread(table.claim, time.time() - JOB_STALE_AFTER_S, JOB_MAX_ATTEMPTS)
+            if job is not None:
+                return job
+            # Nothing queued: wait for a local submit, or poll for jobs queued by other workers
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=JOB_POLL_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self, index: int):
+        table = self._get_table()
+        last_purge = 0.0
+        backoff = JOB_ERROR_BACKOFF_S
+        while True:
+            try:
+                job_id, statement = await self._next_job()
+                try:
+                    with span("job", job_id=job_id):
+                        result = await verify_statement(statement)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.exception("Verification job %s failed: %s", job_id, e)
+                    await asyncio.to_thread(table.finish, job_id, STATUS_FAILED,
+                                            error=f"An unexpected error occurred: {str(e)}")
+                else:
+                    await asyncio.to_thread(table.finish, job_id, STATUS_DONE, result=json.dumps(result))
+                if index == 0 and time.time() - last_purge > 60:
+                    last_purge = time.time()
+                    await asyncio.to_thread(table.purge_finished, time.time() - self.result_ttl)
+                backoff = JOB_ERROR_BACKOFF_S
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Typically the job table ("database is locked" past busy_timeout, a full disk): the worker
+                # must outlive it. A job left "running" is claimed again once stale (see JOB_MAX_ATTEMPTS).
+                logger.exception("Verification job worker %d failed, retrying in %.0f s: %s", index, backoff, e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, JOB_ERROR_BACKOFF_MAX_S)
+
+
+# The process-wide job queue; its workers are started by the app's startup hook
+job_queue = JobQueue()
@@ -0,0 +1,160 @@
+# /home/ubuntu/fact_checker_backend/src/services/lexicons.py
+
+import logging
+import os
+import threading
+import time
+import urllib.parse
+from src.services.phrase_matcher import PhraseMatcher, word_tokens
+
+logger = logging.getLogger(__name__)
+
+# Scoring lexicons and reputation lists live in plain text files (one entry per line,
+# "#" comments) so they can be edited, or swapped for lists of tens of thousands of
+# domains, without touching code. Changed files are picked up without a restart.
+LEXICON_DIR = os.getenv("LEXICON_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "lexicons"))
+LEXICON_RELOAD_INTERVAL_S = float(os.getenv("LEXICON_RELOAD_INTERVAL_S", "30"))
+
+LEXICON_FILES = {
+    "reputable_domains": "reputable_domains.txt",
+    "less_reputable_domains": "less_reputable_domains.txt",
+    "less_reputable_keywords": "less_reputable_keywords.txt",
+    "confirmation_phrases": "confirmation_phrases.txt",
+    "contradiction_phrases": "contradiction_phrases.txt",
+    "blocked_hosts": "blocked_hosts.txt",
+    "javascript_disabled_domains": "javascript_disabled_domains.txt",
+}
+
+
+def _read_entries(path: str) -> list[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = [line.split("#", 1)[0].strip().lower() for line in f]
+    except FileNotFoundError:
+        logger.warning("Lexicon file not found, using an empty list: %s", path)
+        return []
+    return [line for line in lines if line]
+
+
+def url_host(url: str) -> str:
+    """Returns the lowercase hostname of a URL ("" if it has none), without a trailing dot."""
+    try:
+        return (urllib.parse.urlsplit(url).hostname or "").rstrip(".")
+    except ValueError:
+        return ""
+
+
+class DomainIndex:
+    """
+    Hash index of domain suffixes.
+
+    A host matches if the host itself or any of its parent domains is listed, so a lookup
+    costs one set probe per label of the host no matter how many domains are indexed.
+    Unlike a substring test, "wikipedia.org" does not match "notwikipedia.org" or
+    "wikipedia.org.evil.com".
+    """
+
+    def __init__(self, domains):
+        self._domains = frozenset(d.strip(".").removeprefix("*.") for d in domains if d.strip("."))
+
+    def __len__(self):
+        return len(self._domains)
+
+    def __iter__(self):
+        return iter(sorted(self._domains))
+
+    def matches(self, host: str) -> bool:
+        labels = host.split(".")
+        return any(".".join(labels[i:]) in self._domains for i in range(len(labels)))
+
+
+class Lexicons:
+    """An immutable snapshot of all scoring lexicons and domain lists, built from the lexicon files."""
+
+    def __init__(self, entries: dict):
+        self.reputable_domains = DomainIndex(entries["reputable_domains"])
+        self.less_reputable_domains = DomainIndex(entries["less_reputable_domains"])
+        self.less_reputable_keywords = frozenset(entries["less_reputable_keywords"])
+        self.confirmation_phrases = entries["confirmation_phrases"]
+        self.contradiction_phrases = entries["contradiction_phrases"]
+        # Browser page loading (see request_blocking)
+        self.blocked_hosts = DomainIndex(entries["blocked_hosts"])
+        self.javascript_disabled_domains = DomainIndex(entries["javascript_disabled_domains"])
+        # Finds every confirmation/contradiction phrase in a single pass per document
+        self.stance_matcher = PhraseMatcher(
+            self.confirmation_phrases + self.contradiction_phrases,
+            labels={**{p: "confirmation" for p in self.confirmation_phrases},
+                    **{p: "contradiction" for p in self.contradiction_phrases}},
+        )
+
+    def domain_reputation(self, url: str) -> int:
+        """
+        Returns 1 for reputable sources, -1 for less reputable ones and 0 otherwise.
+
+        Reputation lists are checked against the URL's host; the less-reputable keywords
+        against whole words of the URL (host and path).
+        """
+        host = url_host(url)
+        if host and self.reputable_domains.matches(host):
+            return 1
+        if host and self.less_reputable_domains.matches(host):
+            return -1
+        if self.less_reputable_keywords.intersection(word_tokens(url)):
+            return -1
+        return 0
+
+
+class LexiconStore:
+    """
+    Holds the current Lexicons snapshot and rebuilds it when a lexicon file changes.
+
+    File modification times are checked at most every LEXICON_RELOAD_INTERVAL_S seconds
+    on access. A reload builds a complete new snapshot and swaps it in atomically, so
+    concurrent readers always see a consistent set of lists.
+    """
+
+    def __init__(self, directory: str = LEXICON_DIR, reload_interval: float = LEXICON_RELOAD_INTERVAL_S):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtimes = None
+        self._checked_at = 0.0
+        self._lexicons = None
+
+    def _current_mtimes(self) -> dict:
+        mtimes = {}
+        for name, file_name in LEXICON_FILES.items():
+            try:
+                mtimes[name] = os.stat(os.path.join(self.directory, file_name)).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[name] = None
+        return mtimes
+
+    def reload(self) -> Lexicons:
+        """Rebuilds the snapshot from the files unconditionally and returns it."""
+        with self._lock:
+            mtimes = self._current_mtimes()
+            entries = {name: _read_entries(os.path.join(self.directory, file_name))
+                       for name, file_name in LEXICON_FILES.items()}
+            self._lexicons = Lexicons(entries)
+            self._mtimes = mtimes
+            self._checked_at = time.monotonic()
+            logger.info("Loaded lexicons from %s: %d reputable domains, %d less reputable domains", self.directory,
+                        len(self._lexicons.reputable_domains), len(self._lexicons.less_reputable_domains))
+            return self._lexicons
+
+    def current(self) -> Lexicons:
+        """Returns the current snapshot, reloading first if any lexicon file changed."""
+        lexicons = self._lexicons
+        if lexicons is None:
+            return self.reload()
+        if time.monotonic() - self._checked_at < self.reload_interval:
+            return lexicons
+        self._checked_at = time.monotonic()
+        if self._current_mtimes() != self._mtimes:
+            return self.reload()
+        return lexicons
+
+
+# The process-wide lexicon store used by analysis_service
+lexicon_store = LexiconStore()
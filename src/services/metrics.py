@@ -0,0 +1,226 @@
+# /home/ubuntu/fact_checker_backend/src/services/metrics.py
+
+import bisect
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets (seconds), from fast cache hits up to the overall verification deadline
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: tuple = ()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames + extra[:1], values + extra[1:])]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, per label combination."""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    """A value that goes up and down (e.g. requests in flight)."""
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, plus their sum and count."""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {} # label key -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._values.items())
+        lines = []
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+                cumulative += count
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {round(counts[-1], 6)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process metrics, rendered in the Prometheus text exposition format.
+
+    Collectors are callables run at render time that return (name, kind, help, samples)
+    tuples, with samples a list of (labels dict, value); they expose values that other
+    components already count themselves (e.g. cache statistics).
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception:
+                logger.exception("Metrics collector %r failed", collector)
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# The process-wide registry. Every server worker has its own, so /metrics reports the
+# worker that answered the scrape.
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "factcheck_stage_duration_seconds", "Duration of each verification pipeline stage.", ["stage", "outcome"])
+STAGE_ERRORS = metrics.counter(
+    "factcheck_stage_errors_total", "Exceptions raised by a pipeline stage, by exception class.", ["stage", "error"])
+STAGE_IN_FLIGHT = metrics.gauge(
+    "factcheck_stage_in_flight", "Pipeline stages currently running.", ["stage"])
+BROWSER_LAUNCH_SECONDS = metrics.histogram(
+    "factcheck_browser_launch_seconds", "Time to launch a pooled browser.")
+REQUEST_SECONDS = metrics.histogram(
+    "factcheck_http_request_duration_seconds", "API request handling time.", ["endpoint", "status"])
+
+
+class span:
+    """
+    Times one pipeline stage, as a context manager (usable inside coroutines):
+
+        with span("fetch_http", url=url) as s:
+            ...
+            s.fields["status"] = 200
+
+    Records the duration in factcheck_stage_duration_seconds{stage, outcome} (outcome is
+    "ok", "error" or "cancelled"), counts exceptions by class, tracks the stage's in-flight
+    count and logs a structured "span" record with the duration and `fields`.
+    """
+
+    def __init__(self, stage: str, **fields):
+        self.stage = stage
+        self.fields = fields
+        self.started = None
+        self.duration = None
+
+    def __enter__(self):
+        STAGE_IN_FLIGHT.inc(stage=self.stage)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.started
+        STAGE_IN_FLIGHT.dec(stage=self.stage)
+        if exc_type is None:
+            outcome = "ok"
+        elif not issubclass(exc_type, Exception):
+            outcome = "cancelled" # asyncio.CancelledError (e.g. a losing over-fetched source), GeneratorExit
+        else:
+            outcome = "error"
+            STAGE_ERRORS.inc(stage=self.stage, error=exc_type.__name__)
+        STAGE_SECONDS.observe(self.duration, stage=self.stage, outcome=outcome)
+        logger.debug("span %s %s in %.1f ms", self.stage, outcome, self.duration * 1000,
+                     extra={"fields": {"span": self.stage, "outcome": outcome,
+                                       "duration_ms": round(self.duration * 1000, 2), **self.fields}})
+        return False
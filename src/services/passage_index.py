@@ -0,0 +1,98 @@
+# /home/ubuntu/fact_checker_backend/src/services/passage_index.py
+
+import os
+import re
+from collections import Counter
+import numpy as np
+from src.services.phrase_matcher import word_tokens
+from src.services.text_utils import STOPWORDS
+
+# Passages are sliding windows of sentences over the retrieved page text
+PASSAGE_SENTENCES = int(os.getenv("PASSAGE_SENTENCES", "3"))
+PASSAGE_STRIDE = int(os.getenv("PASSAGE_STRIDE", "2"))
+PASSAGE_MAX_CHARS = 1000 # Longer "sentences" (unpunctuated lists, table text) are split into chunks
+
+# Standard BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def _split_long_sentence(sentence: str):
+    """Yields `sentence` in chunks of at most PASSAGE_MAX_CHARS, cut at spaces where possible."""
+    while len(sentence) > PASSAGE_MAX_CHARS:
+        cut = sentence.rfind(" ", 0, PASSAGE_MAX_CHARS + 1)
+        if cut <= 0:
+            cut = PASSAGE_MAX_CHARS
+        yield sentence[:cut]
+        sentence = sentence[cut:].lstrip()
+    if sentence:
+        yield sentence
+
+
+def query_terms(statement_keywords) -> list[str]:
+    """Drops function words from the statement's keywords; they carry no ranking signal."""
+    terms = sorted(kw for kw in statement_keywords if kw not in STOPWORDS)
+    return terms or sorted(statement_keywords)
+
+
+class PassageIndex:
+    """
+    Splits one document into overlapping sentence-window passages and ranks them
+    against a query with BM25.
+
+    Each sentence is tokenized once; `tokens` holds the set of all words in the document
+    so callers don't need to tokenize it again.
+    """
+
+    def __init__(self, text: str, sentences_per_passage: int = PASSAGE_SENTENCES, stride: int = PASSAGE_STRIDE):
+        sentences = [chunk for s in _SENTENCE_SPLIT_RE.split(text) if s and s.strip()
+                     for chunk in _split_long_sentence(s.strip())]
+        sentence_tokens = [word_tokens(s) for s in sentences]
+        self.tokens = set().union(*sentence_tokens) if sentence_tokens else set()
+
+        starts = list(range(0, max(1, len(sentences) - sentences_per_passage + 1), max(1, stride)))
+        if sentences and starts[-1] + sentences_per_passage < len(sentences):
+            starts.append(len(sentences) - sentences_per_passage) # Make sure the tail is covered
+
+        self.passages = []
+        self.passage_tokens = []
+        self._term_counts = []
+        for start in starts:
+            window_tokens = [t for toks in sentence_tokens[start:start + sentences_per_passage] for t in toks]
+            if not window_tokens:
+                continue
+            self.passages.append(" ".join(sentences[start:start + sentences_per_passage]))
+            self.passage_tokens.append(window_tokens)
+            self._term_counts.append(Counter(window_tokens))
+        self._lengths = np.array([len(toks) for toks in self.passage_tokens], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.passages)
+
+    def rank(self, terms: list[str], top_k: int) -> list[int]:
+        """
+        Ranks passages against the query terms with BM25.
+
+        Args:
+            terms: Query terms (e.g. query_terms(statement_keywords)).
+            top_k: Number of passages to return.
+
+        Returns:
+            Indices of the best `top_k` passages with a positive score, best first.
+        """
+        if not self.passages or not terms:
+            return []
+        # tf[p, j]: occurrences of terms[j] in passage p
+        tf = np.array([[counts.get(term, 0) for term in terms] for counts in self._term_counts], dtype=np.float64)
+        n_passages = len(self.passages)
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((n_passages - df + 0.5) / (df + 0.5))
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths / self._lengths.mean())
+        scores = ((tf * (BM25_K1 + 1)) / (tf + length_norm[:, None]) * idf).sum(axis=1)
+
+        top_k = min(top_k, n_passages)
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [int(i) for i in best if scores[i] > 0]
@@ -0,0 +1,96 @@
+# /home/ubuntu/fact_checker_backend/src/services/phrase_matcher.py
+
+import re
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def word_tokens(text: str) -> list[str]:
+    """Splits text into lowercase word tokens (faster than tokenize() when offsets aren't needed)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def tokenize(text: str) -> tuple[list[str], list[int]]:
+    """
+    Splits text into lowercase word tokens.
+
+    Returns:
+        (tokens, offsets) where offsets[i] is the character position of tokens[i] in `text`.
+    """
+    tokens, offsets = [], []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        tokens.append(match.group())
+        offsets.append(match.start())
+    return tokens, offsets
+
+
+class PhraseMatcher:
+    """
+    Finds every occurrence of a fixed set of phrases in one pass over a document.
+
+    Phrases are split into word tokens and stored in a token trie, so matching respects
+    word boundaries ("fact" does not match inside "artifact") and the cost is linear in
+    the document length (times the longest phrase, in tokens) instead of one full scan
+    of the document per phrase. Build a matcher once per lexicon and reuse it.
+    """
+
+    def __init__(self, phrases, labels: dict = None):
+        """
+        Args:
+            phrases: The phrases to look for (case-insensitive).
+            labels: Optional phrase -> label mapping, reported with each hit (e.g. "confirmation").
+        """
+        self._root = {} # token -> [children dict, phrase ending here or None]
+        self.max_length = 0
+        self.labels = labels or {}
+        for phrase in phrases:
+            tokens, _ = tokenize(phrase)
+            if not tokens:
+                continue
+            node = self._root
+            for i, token in enumerate(tokens):
+                entry = node.get(token)
+                if entry is None:
+                    entry = node[token] = [{}, None]
+                if i == len(tokens) - 1:
+                    entry[1] = phrase
+                node = entry[0]
+            self.max_length = max(self.max_length, len(tokens))
+
+    def find_in_tokens(self, tokens: list[str]) -> list[tuple[str, int, int]]:
+        """
+        Matches against an already tokenized document (see word_tokens() / tokenize()).
+
+        Returns:
+            (phrase, first token index, token count) for every hit, in document order.
+        """
+        hits = []
+        root = self._root
+        n = len(tokens)
+        for i in range(n):
+            entry = root.get(tokens[i])
+            j = i
+            while entry is not None:
+                if entry[1] is not None:
+                    hits.append((entry[1], i, j - i + 1))
+                j += 1
+                if j >= n:
+                    break
+                entry = entry[0].get(tokens[j])
+        return hits
+
+    def find_all(self, text: str) -> list[tuple[str, int, int]]:
+        """
+        Returns:
+            (phrase, start, end) character spans of every hit in `text`, in document order.
+        """
+        tokens, offsets = tokenize(text)
+        spans = []
+        for phrase, first, count in self.find_in_tokens(tokens):
+            last = first + count - 1
+            spans.append((phrase, offsets[first], offsets[last] + len(tokens[last])))
+        return spans
+
+    def found_labels(self, tokens: list[str]) -> set:
+        """Returns the set of labels of all phrases present in the tokenized document."""
+        return {self.labels.get(phrase) for phrase, _, _ in self.find_in_tokens(tokens)}
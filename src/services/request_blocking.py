@@ -0,0 +1,135 @@
+# /home/ubuntu/fact_checker_backend/src/services/request_blocking.py
+
+import logging
+import os
+import re
+from src.services.lexicons import DomainIndex, lexicon_store, url_host
+from src.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Browser pages are only read with inner_text()/DOM queries, so nothing a page pulls in for
+# rendering is needed. Playwright resource types to abort, comma-separated ("" blocks none).
+# Note that without stylesheets, text the site's CSS hides is part of inner_text().
+BROWSER_BLOCKED_RESOURCE_TYPES = frozenset(
+    t.strip() for t in os.getenv("BROWSER_BLOCKED_RESOURCE_TYPES", "image,media,font,stylesheet,texttrack,manifest")
+    .split(",") if t.strip())
+# Every routed request costs a browser -> Python -> browser round trip before it can proceed.
+# By default pages route every request and block by the resource type the browser reports.
+# Set to "1" to only route the URLs that may be blocked (blocklisted hosts and the file
+# extensions of the blocked resource types): the document, scripts and XHR then skip the
+# round trip, but resources of a blocked type without a telling extension ("/image?id=3",
+# many CDNs) are loaded. Compare both with benchmarks/bench_page_loading.py first.
+BROWSER_ROUTE_BY_URL = os.getenv("BROWSER_ROUTE_BY_URL", "0") == "1"
+_RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "media": ("mp4", "webm", "mp3", "ogg", "oga", "ogv", "m4a", "m4v", "wav", "mov"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "stylesheet": ("css",),
+    "texttrack": ("vtt",),
+    "manifest": ("webmanifest",),
+}
+
+ALLOWED = "allowed"
+BLOCKED_TYPE = "blocked_type"
+BLOCKED_HOST = "blocked_host"
+
+BROWSER_REQUESTS = metrics.counter(
+    "factcheck_browser_requests_total", "Browser page requests routed through the request filter, by decision.",
+    ["decision"])
+
+
+def _route_pattern(blocked_types, blocked_hosts: DomainIndex):
+    """
+    Regex (also valid as a JavaScript regex, which is how Playwright matches it) for URLs on
+    a blocked host or its subdomains, or with the extension of a blocked resource type.
+    """
+    alternatives = []
+    if len(blocked_hosts):
+        hosts = "|".join(re.escape(host) for host in blocked_hosts)
+        alternatives.append(rf"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?(?:{hosts})(?::\d+)?(?:[/?#]|$)")
+    extensions = sorted({ext for t in blocked_types for ext in _RESOURCE_TYPE_EXTENSIONS.get(t, ())})
+    if extensions:
+        alternatives.append(rf"^[^?#]*\.(?:{'|'.join(extensions)})(?:[?#]|$)")
+    return re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+
+
+class RequestFilter:
+    """
+    Aborts the requests of a browser page that text extraction doesn't need: resources of
+    a blocked type, and anything from a host on the ad/tracker blocklist (the
+    "blocked_hosts" lexicon unless a DomainIndex is given). The page's own document is
+    always loaded.
+
+    With `route_by_url` set, only requests matching route_pattern() reach the filter.
+    """
+
+    def __init__(self, blocked_types=BROWSER_BLOCKED_RESOURCE_TYPES, blocked_hosts: DomainIndex = None,
+                 route_by_url: bool = BROWSER_ROUTE_BY_URL):
+        self.blocked_types = frozenset(blocked_types)
+        self.blocked_hosts = blocked_hosts
+        self.route_by_url = route_by_url
+        self._route_pattern = (None, None) # (the DomainIndex it was built from, pattern)
+
+    def _blocked_hosts(self) -> DomainIndex:
+        return self.blocked_hosts if self.blocked_hosts is not None else lexicon_store.current().blocked_hosts
+
+    def route_pattern(self):
+        """The compiled regex of URLs install() routes with `route_by_url`, or None when nothing can be blocked."""
+        blocked_hosts = self._blocked_hosts()
+        built_for, pattern = self._route_pattern
+        if built_for is not blocked_hosts: # Rebuilt when the blocklist lexicon is reloaded
+            pattern = _route_pattern(self.blocked_types, blocked_hosts)
+            self._route_pattern = (blocked_hosts, pattern)
+        return pattern
+
+    def decide(self, resource_type: str, url: str, main_document: bool = False) -> str:
+        """Returns ALLOWED, BLOCKED_TYPE or BLOCKED_HOST for one request."""
+        if main_document:
+            return ALLOWED
+        if resource_type in self.blocked_types:
+            return BLOCKED_TYPE
+        host = url_host(url)
+        if host and self._blocked_hosts().matches(host):
+            return BLOCKED_HOST
+        return ALLOWED
+
+    async def _handle(self, route):
+        request = route.request
+        try:
+            main_document = request.is_navigation_request() and request.frame.parent_frame is None
+        except Exception: # Service worker requests have no frame
+            main_document = False
+        decision = self.decide(request.resource_type, request.url, main_document)
+        BROWSER_REQUESTS.inc(decision=decision)
+        try:
+            if decision == ALLOWED:
+                await route.continue_()
+            else:
+                await route.abort("blockedbyclient")
+        except Exception as e: # The page was closed while the request was pending
+            logger.debug("Could not resolve route for %s: %s", request.url, e)
+
+    async def install(self, page):
+        """Routes the requests of `page` through the filter; call before page.goto()."""
+        if not self.route_by_url:
+            await page.route("**/*", self._handle)
+            return
+        pattern = self.route_pattern()
+        if pattern is not None:
+            await page.route(pattern, self._handle)
+
+
+def javascript_enabled(url: str) -> bool:
+    """False for pages on a domain of the "javascript_disabled_domains" lexicon."""
+    host = url_host(url)
+    return not (host and lexicon_store.current().javascript_disabled_domains.matches(host))
+
+
+def page_context_options(url: str) -> dict:
+    """browser.new_context() options for loading `url` (see BrowserPool.run)."""
+    return {"java_script_enabled": javascript_enabled(url)}
+
+
+# The filter used by the search and content retrieval services
+request_filter = RequestFilter()
@@ -0,0 +1,93 @@
+# /home/ubuntu/fact_checker_backend/src/services/search_cache.py
+
+import asyncio
+import os
+import re
+import threading
+import time
+import unicodedata
+from src.services.cache import SingleFlight, TTLLRUCache
+from src.services.shared_cache import SharedCache, shared_cache
+from src.services.text_utils import STOPWORDS
+
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "21600")) # 6 hours; search rankings drift slowly
+SHARED_NAMESPACE = "search"
+SEARCH_CACHE_STRIP_STOPWORDS = os.getenv("SEARCH_CACHE_STRIP_STOPWORDS", "false").lower() in ("1", "true", "yes")
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+
+
+def normalize_query(query: str, strip_stopwords: bool = SEARCH_CACHE_STRIP_STOPWORDS) -> str:
+    """
+    Folds case, Unicode compatibility forms, punctuation and whitespace so that near-identical
+    statements ("The Eiffel Tower is in Paris." / "the eiffel tower is in paris") share a key.
+
+    Args:
+        query: The raw search query / statement.
+        strip_stopwords: Also drop common function words from the key (the query sent to
+            the search engine is left untouched).
+
+    Returns:
+        The normalized cache key.
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    words = _PUNCTUATION_RE.sub(" ", text).split()
+    if strip_stopwords:
+        stripped = [w for w in words if w not in STOPWORDS]
+        words = stripped or words # A query made only of stopwords keeps them
+    return " ".join(words)
+
+
+class SearchCache:
+    """
+    TTL + LRU cache of search results keyed by normalized query, with single-flight
+    collapsing of concurrent identical searches. A per-worker memory tier sits in front
+    of the node-wide shared cache.
+
+    An entry fetched with N results also answers requests for fewer results.
+    """
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_MAX_ENTRIES, ttl: float = SEARCH_CACHE_TTL,
+                 shared: SharedCache = shared_cache):
+        self.ttl = ttl
+        self._cache = TTLLRUCache(max_weight=max_entries, default_ttl=ttl)
+        self._shared = shared if shared.enabled else None
+        self._counter_lock = threading.Lock()
+        self.shared_hits = 0
+        self.single_flight = SingleFlight()
+
+    async def get(self, key: str, num_results: int):
+        """Returns a copy of the cached results for `key`, or None if missing or too short."""
+        entry = self._cache.get(key)
+        if entry is None and self._shared is not None:
+            entry = await asyncio.to_thread(self._shared.get, SHARED_NAMESPACE, key)
+            if entry is not None:
+                with self._counter_lock:
+                    self.shared_hits += 1
+                self._cache.set(key, entry, ttl=entry["expires_at"] - time.time()) # Promote to the memory tier
+        if entry is None or entry["num_results"] < num_results:
+            return None
+        return [dict(result) for result in entry["results"][:num_results]]
+
+    async def put(self, key: str, num_results: int, results: list[dict]):
+        entry = {"num_results": num_results, "results": [dict(result) for result in results],
+                 "expires_at": time.time() + self.ttl}
+        self._cache.set(key, entry)
+        if self._shared is not None:
+            await asyncio.to_thread(self._shared.set, SHARED_NAMESPACE, key, entry, self.ttl)
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        stats["shared_hits"] = self.shared_hits
+        stats["shared_enabled"] = self._shared is not None
+        lookups = stats["hits"] + stats["misses"]
+        hits = stats["hits"] + self.shared_hits # A shared hit was a memory miss first
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["collapsed"] = self.single_flight.collapsed # Searches that joined an identical in-flight search
+        stats["in_flight"] = self.single_flight.in_flight()
+        return stats
+
+
+# The process-wide search result cache used by search_service
+search_cache = SearchCache()
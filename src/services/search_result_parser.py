@@ -0,0 +1,265 @@
+# /home/ubuntu/fact_checker_backend/src/services/search_result_parser.py
+
+import logging
+import re
+import urllib.parse
+from functools import lru_cache
+from html.parser import HTMLParser
+
+logger = logging.getLogger(__name__)
+
+# Refined selectors for Brave Search based on HTML inspection, in order of preference.
+# Shared by the in-browser batch extraction (EXTRACT_RESULTS_JS) and the pure-Python parser.
+# Common container for results: div.snippet, sometimes with data-pos
+RESULT_CONTAINER_SELECTORS = ["div.snippet[data-pos]", "div.search-result.snippet"]
+RESULT_CONTAINER_FALLBACK_SELECTORS = ["div.results > div.snippet"] # More general fallback
+# Title link: a.snippet-title, or a.result-header; the broadest link selector is the last resort
+TITLE_LINK_SELECTORS = ["a.snippet-title", "div.title > a", "h3.title a", "div[data-type=\"web\"] a.result-header", "a[href]"]
+# Snippet: p.snippet-description or div.snippet-content; the whole container otherwise
+SNIPPET_SELECTORS = ["p.snippet-description", "div.snippet-content", "div.desc"]
+
+# A single page.evaluate() call returning every candidate result as {title, href, snippet},
+# instead of several query_selector/inner_text/get_attribute round-trips per result.
+EXTRACT_RESULTS_JS = """
+([containerSelectors, fallbackSelectors, titleSelectors, snippetSelectors]) => {
+    let containers = Array.from(document.querySelectorAll(containerSelectors.join(", ")));
+    if (!containers.length) {
+        containers = Array.from(document.querySelectorAll(fallbackSelectors.join(", ")));
+    }
+    const firstMatch = (el, selectors) => {
+        for (const selector of selectors) {
+            const found = el.querySelector(selector);
+            if (found) return found;
+        }
+        return null;
+    };
+    return containers.map(el => {
+        const titleEl = firstMatch(el, titleSelectors);
+        const snippetEl = firstMatch(el, snippetSelectors) || el;
+        return {
+            title: titleEl ? titleEl.innerText : null,
+            href: titleEl ? titleEl.getAttribute("href") : null,
+            snippet: snippetEl.innerText,
+        };
+    });
+}
+"""
+
+EXTRACT_RESULTS_ARGS = [RESULT_CONTAINER_SELECTORS, RESULT_CONTAINER_FALLBACK_SELECTORS, TITLE_LINK_SELECTORS, SNIPPET_SELECTORS]
+
+
+def build_search_results(raw_items: list[dict], num_results: int, search_url: str) -> list[dict]:
+    """
+    Turns raw {title, href, snippet} items into cleaned search results.
+
+    Skips items without a usable title/link, filters out internal anchors and "Cached"
+    links, resolves relative links against the search page and caps snippet length.
+
+    Returns:
+        Up to `num_results` dicts with "title", "link" and "snippet".
+    """
+    results = []
+    for item in raw_items:
+        if len(results) >= num_results:
+            break
+        title, link = item.get("title"), item.get("href")
+        # Filter out non-result links like "Cached" or internal anchors
+        if not title or not title.strip() or not link or link.startswith("#") or "cache" in link.lower():
+            continue
+        if link.startswith("//"):
+            link = f"https:{link}"
+        elif not link.startswith("http"):
+            base_url_parts = urllib.parse.urlparse(search_url)
+            link = urllib.parse.urljoin(f"{base_url_parts.scheme}://{base_url_parts.netloc}", link)
+        if not link.startswith("http"):
+            logger.debug("Skipped (non-HTTP or invalid link): %s - %s", title.strip(), link)
+            continue
+        # Basic cleaning of snippet
+        snippet_text = " ".join((item.get("snippet") or "N/A").split()).strip()
+        results.append({
+            "title": title.strip(),
+            "link": link.strip(),
+            "snippet": snippet_text[:500] # Limit snippet length
+        })
+    return results
+
+
+# --- Pure-Python extraction from saved HTML -------------------------------------------------
+
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article"}
+_NON_TEXT_TAGS = {"script", "style", "noscript", "template", "svg"}
+_COMPOUND_RE = re.compile(r"^(?P<tag>[a-zA-Z0-9]*)(?P<rest>(?:\.[\w-]+|\[[^\]]+\])*)$")
+_PART_RE = re.compile(r"\.([\w-]+)|\[([\w-]+)(?:=\"?([^\"\]]*)\"?)?\]")
+
+
+class _Node:
+    __slots__ = ("tag", "attrs", "classes", "children", "parent")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = set((attrs.get("class") or "").split())
+        self.children = [] # _Node or str
+        self.parent = parent
+
+    def iter_descendants(self):
+        # Document order, with an explicit stack: real pages nest deeper than the recursion limit
+        stack = [child for child in reversed(self.children) if isinstance(child, _Node)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, _Node))
+
+    def text(self) -> str:
+        chunks = []
+        stack = list(reversed(self.children))
+        while stack:
+            child = stack.pop()
+            if isinstance(child, str):
+                chunks.append(child)
+            elif child.tag not in _NON_TEXT_TAGS:
+                if child.tag in _BLOCK_TAGS:
+                    chunks.append(" ")
+                stack.extend(reversed(child.children))
+        return " ".join("".join(chunks).split())
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#document", {}, None)
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, {k: (v or "") for k, v in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in _VOID_TAGS:
+            self.current = node
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.current = node.parent # Also closes any unclosed children
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def _parse_compound(compound: str):
+    match = _COMPOUND_RE.match(compound)
+    if not match:
+        raise ValueError(f"Unsupported selector: {compound}")
+    classes, attrs = [], []
+    for class_name, attr_name, attr_value in _PART_RE.findall(match.group("rest")):
+        if class_name:
+            classes.append(class_name)
+        else:
+            attrs.append((attr_name, attr_value or None))
+    return match.group("tag").lower() or None, classes, attrs
+
+
+def _matches_compound(node: _Node, compound) -> bool:
+    tag, classes, attrs = compound
+    if tag and node.tag != tag:
+        return False
+    if any(c not in node.classes for c in classes):
+        return False
+    for name, value in attrs:
+        if name not in node.attrs or (value is not None and node.attrs[name] != value):
+            return False
+    return True
+
+
+@lru_cache(maxsize=64)
+def _compile_selector(selector: str):
+    # Returns [(combinator, compound), ...] left to right; supports descendant (" ") and child (">")
+    tokens = selector.replace(">", " > ").split()
+    steps, combinator = [], " "
+    for token in tokens:
+        if token == ">":
+            combinator = ">"
+            continue
+        steps.append((combinator, _parse_compound(token)))
+        combinator = " "
+    # steps[i][0] is the combinator linking step i to step i-1
+    return steps
+
+
+def _matches_selector(node: _Node, steps) -> bool:
+    # Like Element.querySelector, ancestors outside the search scope may satisfy the selector
+    if not _matches_compound(node, steps[-1][1]):
+        return False
+    current = node
+    for i in range(len(steps) - 1, 0, -1):
+        combinator = steps[i][0]
+        compound = steps[i - 1][1]
+        ancestor = current.parent
+        if combinator == ">":
+            if ancestor is None or not _matches_compound(ancestor, compound):
+                return False
+            current = ancestor
+        else:
+            while ancestor is not None and not _matches_compound(ancestor, compound):
+                ancestor = ancestor.parent
+            if ancestor is None:
+                return False
+            current = ancestor
+    return True
+
+
+def _select(scope: _Node, selectors: list[str]) -> list[_Node]:
+    compiled = [_compile_selector(s) for s in selectors]
+    return [node for node in scope.iter_descendants()
+            if any(_matches_selector(node, steps) for steps in compiled)]
+
+
+def _select_first(scope: _Node, selector: str):
+    steps = _compile_selector(selector)
+    for node in scope.iter_descendants():
+        if _matches_selector(node, steps):
+            return node
+    return None
+
+
+def extract_raw_results_from_html(html: str) -> list[dict]:
+    """
+    Pure-Python equivalent of EXTRACT_RESULTS_JS for a saved search result page.
+
+    Returns:
+        A list of {"title", "href", "snippet"} dicts, one per result container.
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    containers = _select(builder.root, RESULT_CONTAINER_SELECTORS)
+    if not containers:
+        containers = _select(builder.root, RESULT_CONTAINER_FALLBACK_SELECTORS)
+
+    raw_items = []
+    for container in containers:
+        title_el = next((n for n in (_select_first(container, s) for s in TITLE_LINK_SELECTORS) if n), None)
+        snippet_el = next((n for n in (_select_first(container, s) for s in SNIPPET_SELECTORS) if n), container)
+        raw_items.append({
+            "title": title_el.text() if title_el else None,
+            "href": title_el.attrs.get("href") if title_el else None,
+            "snippet": snippet_el.text(),
+        })
+    return raw_items
+
+
+def parse_search_results_html(html: str, num_results: int, search_url: str) -> list[dict]:
+    """
+    Extracts search results from saved search page HTML without a browser.
+
+    Args:
+        html: The search result page HTML.
+        num_results: Maximum number of results to return.
+        search_url: The URL the page was loaded from, used to resolve relative links.
+
+    Returns:
+        A list of dicts with "title", "link" and "snippet".
+    """
+    return build_search_results(extract_raw_results_from_html(html), num_results, search_url)
@@ -1,146 +1,158 @@
 # /home/ubuntu/fact_checker_backend/src/services/search_service.py
 
 import asyncio
-from playwright.async_api import async_playwright
+import logging
+import os
 import urllib.parse
+from src.services.browser_pool import browser_pool
+from src.services.cpu_executor import cpu_executor
+from src.services.debug_capture import debug_capture
+from src.services.http_client import fetch_url
+from src.services.metrics import span
+from src.services.request_blocking import page_context_options, request_filter
+from src.services.search_cache import normalize_query, search_cache
+from src.services.search_result_parser import (
+    EXTRACT_RESULTS_ARGS,
+    EXTRACT_RESULTS_JS,
+    RESULT_CONTAINER_FALLBACK_SELECTORS,
+    RESULT_CONTAINER_SELECTORS,
+    build_search_results,
+    extract_raw_results_from_html,
+    parse_search_results_html,
+)
+
+logger = logging.getLogger(__name__)
+
+# "browser" renders the result page in a pooled browser; "http" fetches it with the plain
+# HTTP client and parses it in Python (much cheaper, but more likely to be bot-blocked).
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "browser")
+# With the browser backend: "evaluate" extracts results with one page.evaluate() call,
+# "html" parses the rendered page HTML in Python.
+SEARCH_EXTRACTION_MODE = os.getenv("SEARCH_EXTRACTION_MODE", "evaluate")
+# Upper bound on waiting for the first result to appear (replaces the old fixed 3 s sleep)
+SEARCH_RESULTS_WAIT_MS = int(os.getenv("SEARCH_RESULTS_WAIT_MS", "3000"))
+# Search endpoint; overridden to point at a local fixture server by the offline benchmarks
+SEARCH_BASE_URL = os.getenv("SEARCH_BASE_URL", "https://search.brave.com/search")
+
+RESULT_WAIT_SELECTOR = ", ".join(RESULT_CONTAINER_SELECTORS + RESULT_CONTAINER_FALLBACK_SELECTORS)
+
+SEARCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9"
+}
 
 async def perform_web_search(statement: str, num_results: int = 3) -> list[dict]:
     """
     Performs a web search for the given statement and returns a list of search results.
     Uses Brave Search.
+
+    Results are cached by normalized query, and concurrent searches for the same
+    normalized query share a single request to the search engine. Failed searches
+    are not cached.
     """
+    cache_key = normalize_query(statement)
+    cached_results = await search_cache.get(cache_key, num_results)
+    if cached_results is not None:
+        logger.info("Search cache hit for query: %s", statement)
+        return cached_results
+
+    async def _search_and_cache():
+        results = await _search_brave(statement, num_results)
+        if results and not (len(results) == 1 and results[0]["title"] == "Error"):
+            await search_cache.put(cache_key, num_results, results)
+        return results
+
+    results = await search_cache.single_flight.do((cache_key, num_results), _search_and_cache)
+    return [dict(result) for result in results] # Callers sharing a flight get their own copies
+
+
+async def _search_brave(statement: str, num_results: int) -> list[dict]:
+    """Runs the actual Brave Search query and extracts the results."""
     query = statement
+    search_url = f"{SEARCH_BASE_URL}?q={urllib.parse.quote(query)}&source=web"
+    logger.info("Starting web search for query: %s using Brave Search (%s backend)", query, SEARCH_BACKEND)
+    if SEARCH_BACKEND == "http":
+        results = await _search_brave_over_http(search_url, num_results)
+    else:
+        results = await _search_brave_in_browser(search_url, num_results)
+    logger.info("perform_web_search returning %d results.", len(results))
+    return results
+
+
+async def _search_brave_over_http(search_url: str, num_results: int) -> list[dict]:
+    """Fetches the result page with the pooled HTTP client and parses it in Python; no browser involved."""
+    try:
+        with span("search_navigate", backend="http"):
+            response = await fetch_url(search_url, headers=SEARCH_HEADERS)
+            if response["status"] >= 400:
+                raise RuntimeError(f"search page returned HTTP {response['status']}")
+        with span("search_extract", backend="http"):
+            # Parsing a full result page is pure CPU; keep it off the event loop
+            results = await cpu_executor.run(parse_search_results_html, response["text"], num_results, search_url)
+        logger.info("Parsed %d results from search page HTML.", len(results))
+        debug_capture.capture_html("search", response["text"], failed=not results)
+        return results
+    except Exception as e:
+        logger.error("An error occurred during web search: %s", e)
+        return [{"title": "Error", "link": "", "snippet": f"Failed to perform search: {str(e)[:200]}"}]
+
+
+async def _search_brave_in_browser(search_url: str, num_results: int) -> list[dict]:
+    """Loads the result page in a pooled browser page and extracts all results in one batch."""
     results = []
-    debug_html_path = "/home/ubuntu/debug_search_page.html"
-    screenshot_path = "/home/ubuntu/debug_search_screenshot.png"
-    print(f"Starting web search for query: {query} using Brave Search")
-
-    async with async_playwright() as p:
-        browser = await p.firefox.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_extra_http_headers({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
-            "Accept-Language": "en-US,en;q=0.9"
-        })
+
+    async def _search(page):
+        await page.set_extra_http_headers(SEARCH_HEADERS)
+        await request_filter.install(page)
 
         page_html = ""
         try:
-            search_url = f"https://search.brave.com/search?q={urllib.parse.quote(query)}&source=web"
-            print(f"Attempting to navigate to: {search_url}")
-            await page.goto(search_url, timeout=30000, wait_until="domcontentloaded")
-            print(f"Navigation to {search_url} initially completed.")
-
-            await page.wait_for_timeout(3000) # Allow some time for dynamic content if any
-
-            page_html = await page.content()
-            with open(debug_html_path, "w", encoding="utf-8") as f_html:
-                f_html.write(page_html)
-            print(f"Page HTML saved to {debug_html_path} for inspection.")
-            await page.screenshot(path=screenshot_path)
-            print(f"Screenshot saved to {screenshot_path}")
-
-            # Refined selectors for Brave Search based on HTML inspection
-            # Common container for results: div.snippet, sometimes with data-pos
-            # Title link: a inside div.snippet-title, or a.result-header
-            # Snippet: p.snippet-description or div.snippet-content
-            
-            result_elements = await page.query_selector_all("div.snippet[data-pos], div.search-result.snippet")
-            if not result_elements:
-                 result_elements = await page.query_selector_all("div.results > div.snippet") # More general fallback
-            
-            print(f"Found {len(result_elements)} potential result elements.")
-
-            count = 0
-            for el_idx, el in enumerate(result_elements):
-                if count >= num_results:
-                    break
-                
-                title, link, snippet_text = "N/A", "N/A", "N/A"
+            logger.debug("Attempting to navigate to: %s", search_url)
+            with span("search_navigate", backend="browser"):
+                await page.goto(search_url, timeout=30000, wait_until="domcontentloaded")
+                logger.debug("Navigation to %s initially completed.", search_url)
+
+                # Wait for the first result to render instead of sleeping a fixed amount
                 try:
-                    # Try to find title and link
-                    title_element = await el.query_selector("a.snippet-title")
-                    if not title_element:
-                        title_element = await el.query_selector("div.title > a") # From previous attempt
-                    if not title_element:
-                        title_element = await el.query_selector("h3.title a") # Another common pattern
-                    if not title_element:
-                        title_element = await el.query_selector("div[data-type=\"web\"] a.result-header") # More specific Brave selector
-                    if not title_element: # Last resort for title link
-                        title_element = await el.query_selector("a[href]") # Broadest link selector within snippet
-
-                    # Try to find snippet
-                    snippet_element = await el.query_selector("p.snippet-description")
-                    if not snippet_element:
-                        snippet_element = await el.query_selector("div.snippet-content")
-                    if not snippet_element:
-                        snippet_element = await el.query_selector("div.desc") # From previous attempt
-                    if not snippet_element: # Broadest text container
-                        snippet_element = el # Use the whole element if no specific snippet found
-
-                    if title_element:
-                        title_text_candidate = await title_element.inner_text()
-                        link_candidate = await title_element.get_attribute("href")
-                        
-                        # Filter out non-result links like "Cached" or internal anchors
-                        if link_candidate and not link_candidate.startswith("#") and ("cache" not in link_candidate.lower()):
-                            title = title_text_candidate
-                            link = link_candidate
-                    
-                    if snippet_element:
-                        snippet_text = await snippet_element.inner_text()
-                    
-                    if title and title != "N/A" and link and link != "N/A":
-                        if link.startswith("//"):
-                            link = f"https:{link}"
-                        elif not link.startswith("http"):
-                            base_url_parts = urllib.parse.urlparse(search_url)
-                            link = urllib.parse.urljoin(f"{base_url_parts.scheme}://{base_url_parts.netloc}", link)
-                            
-                        if link.startswith("http"):
-                            # Basic cleaning of snippet
-                            snippet_text = " ".join(snippet_text.split()).strip()
-                            results.append({
-                                "title": title.strip(),
-                                "link": link.strip(),
-                                "snippet": snippet_text[:500] # Limit snippet length
-                            })
-                            count += 1
-                            print(f"  Added result: {title.strip()} - {link.strip()}")
-                        else:
-                            print(f"  Skipped (non-HTTP or invalid link): {title.strip()} - {link}")
-                    else:
-                        # print(f"  Skipped (missing title/link element or invalid link): Element index {el_idx}")
-                        pass # Avoid too much noise for non-matching elements
-
-                except Exception as e_el_proc:
-                    print(f"Error processing element {el_idx+1}: {e_el_proc}")
-                    continue
-            
-            if not results and len(result_elements) > 0:
-                print("Found result containers, but failed to extract details. Selectors might need further refinement.")
+                    await page.wait_for_selector(RESULT_WAIT_SELECTOR, state="attached", timeout=SEARCH_RESULTS_WAIT_MS)
+                except Exception:
+                    logger.warning("No result element appeared within %d ms; extracting whatever is there.", SEARCH_RESULTS_WAIT_MS)
+
+            with span("search_extract", backend="browser", mode=SEARCH_EXTRACTION_MODE):
+                if SEARCH_EXTRACTION_MODE == "html":
+                    # Parse the rendered HTML in Python instead of querying the DOM
+                    page_html = await page.content()
+                    raw_items = await cpu_executor.run(extract_raw_results_from_html, page_html)
+                else:
+                    # One IPC round-trip for all titles, links and snippets
+                    raw_items = await page.evaluate(EXTRACT_RESULTS_JS, EXTRACT_RESULTS_ARGS)
+            logger.info("Found %d potential result elements.", len(raw_items))
+
+            results.extend(build_search_results(raw_items, num_results, search_url))
+            for res in results:
+                logger.debug("Added result: %s - %s", res["title"], res["link"])
+
+            if not results and len(raw_items) > 0:
+                logger.warning("Found result containers, but failed to extract details. Selectors might need further refinement.")
+
+            # Only sampled requests pay for page.content()/screenshot; disk writes happen off the event loop
+            await debug_capture.capture_page(page, "search", failed=not results, html=page_html or None)
 
         except Exception as e:
-            print(f"An error occurred during web search: {e}")
-            import traceback
-            traceback.print_exc()
-            try:
-                if not page_html:
-                    page_html_on_error = await page.content()
-                    with open(debug_html_path, "w", encoding="utf-8") as f_html_err:
-                        f_html_err.write(page_html_on_error)
-                    print(f"Page HTML on error saved to {debug_html_path}")
-                await page.screenshot(path=screenshot_path)
-                print(f"Screenshot on error saved to {screenshot_path}")
-            except Exception as e_save:
-                print(f"Could not save HTML/Screenshot on error: {e_save}")
+            logger.exception("An error occurred during web search: %s", e)
+            await debug_capture.capture_page(page, "search-error", failed=True, html=page_html or None)
 
             if not results:
                 results.append({"title": "Error", "link": "", "snippet": f"Failed to perform search: {str(e)[:200]}"})
 
-        finally:
-            await browser.close()
-    
-    print(f"perform_web_search returning {len(results)} results.")
+    try:
+        await browser_pool.run(_search, **page_context_options(search_url))
+    except Exception as e:
+        # The pool could not provide a page (e.g. the browser failed to launch)
+        logger.error("Could not get a browser page for web search: %s", e)
+        if not results:
+            results.append({"title": "Error", "link": "", "snippet": f"Failed to perform search: {str(e)[:200]}"})
+
     return results
 
 async def main_test():
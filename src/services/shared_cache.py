@@ -0,0 +1,212 @@
+# /home/ubuntu/fact_checker_backend/src/services/shared_cache.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Node-local cache shared by every server worker (and bulk runs) on the machine: one SQLite
+# file in WAL mode, so readers in all processes proceed concurrently with a writer, read
+# through a memory map of the OS page cache instead of a private copy per worker.
+# Set SHARED_CACHE_PATH to "" to keep every cache per-worker.
+_DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database", "cache.db")
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", _DEFAULT_DB_PATH)
+SHARED_CACHE_MAX_BYTES = int(os.getenv("SHARED_CACHE_MAX_BYTES", str(512 * 1024 * 1024))) # For all workers together
+SHARED_CACHE_MMAP_BYTES = int(os.getenv("SHARED_CACHE_MMAP_BYTES", str(256 * 1024 * 1024)))
+# Reads refresh an entry's LRU timestamp at most this often, so hits rarely need the write lock
+SHARED_CACHE_TOUCH_INTERVAL_S = 60.0
+_EVICT_TO = 0.9 # Eviction frees space down to this share of the budget, so it runs in batches
+_EVICT_BATCH = 256
+_COMPRESS_MIN_BYTES = 512 # Smaller values are stored as plain JSON
+_ENTRY_OVERHEAD = 64 # Rough per-row overhead, counted against the budget
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS cache_entries ("
+    " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, size INTEGER NOT NULL,"
+    " expires_at REAL NOT NULL, accessed_at REAL NOT NULL, PRIMARY KEY (namespace, key))",
+    "CREATE INDEX IF NOT EXISTS cache_entries_lru ON cache_entries (accessed_at)",
+    # Totals for all workers, kept exact by triggers so every process sees the same budget use
+    "CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO cache_meta (name, value) VALUES ('bytes', 0), ('entries', 0), ('evictions', 0)",
+    "CREATE TRIGGER IF NOT EXISTS cache_entries_insert AFTER INSERT ON cache_entries BEGIN"
+    " UPDATE cache_meta SET value = value + NEW.size WHERE name = 'bytes';"
+    " UPDATE cache_meta SET value = value + 1 WHERE name = 'entries'; END",
+    "CREATE TRIGGER IF NOT EXISTS cache_entries_update AFTER UPDATE OF size ON cache_entries BEGIN"
+    " UPDATE cache_meta SET value = value + NEW.size - OLD.size WHERE name = 'bytes'; END",
+    "CREATE TRIGGER IF NOT EXISTS cache_entries_delete AFTER DELETE ON cache_entries BEGIN"
+    " UPDATE cache_meta SET value = value - OLD.size WHERE name = 'bytes';"
+    " UPDATE cache_meta SET value = value - 1 WHERE name = 'entries'; END",
+]
+
+
+def encode_value(value) -> bytes:
+    """Compact JSON, zlib-compressed when that pays off; the first byte says which."""
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(data) >= _COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return b"z" + compressed
+    return b"j" + data
+
+
+def decode_value(blob: bytes):
+    data = zlib.decompress(blob[1:]) if blob[:1] == b"z" else blob[1:]
+    return json.loads(data)
+
+
+class SharedCache:
+    """
+    A key/value cache in one SQLite file, shared by every process that opens it.
+
+    Values are JSON-serializable and stored compactly (see encode_value). Keys live in
+    namespaces ("content", "search", ...). All processes share one byte budget: the
+    total is maintained in the database itself, and the writer that pushes it over
+    `max_bytes` evicts expired entries, then least recently used ones, in the same
+    transaction.
+
+    Every method blocks on SQLite; call them from a worker thread (asyncio.to_thread).
+    Errors are logged and treated as a miss, so the cache can never fail a request.
+    """
+
+    def __init__(self, path: str = SHARED_CACHE_PATH, max_bytes: int = SHARED_CACHE_MAX_BYTES,
+                 mmap_bytes: int = SHARED_CACHE_MMAP_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local() # One connection per thread: readers don't queue behind each other
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._counter_lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path) and self.max_bytes > 0
+
+    def _count(self, name: str):
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._init_lock:
+                if not self._initialized:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL") # A cache can lose its last writes on power loss
+            conn.execute("PRAGMA busy_timeout=5000") # Other workers hold the write lock briefly
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            with self._init_lock:
+                if not self._initialized:
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                    self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str):
+        """Returns the stored value, or None if it is missing or expired."""
+        if not self.enabled:
+            return None
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT value, expires_at, accessed_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                               (namespace, key)).fetchone()
+            now = time.time()
+            if row is None or row[1] <= now:
+                self._count("misses")
+                return None
+            if now - row[2] > SHARED_CACHE_TOUCH_INTERVAL_S:
+                conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                             (now, namespace, key))
+            value = decode_value(row[0])
+        except (sqlite3.Error, ValueError, zlib.error) as e:
+            self._count("errors")
+            logger.error("Shared cache lookup failed for %s/%s: %s", namespace, key, e)
+            return None
+        self._count("hits")
+        return value
+
+    def set(self, namespace: str, key: str, value, ttl: float):
+        """Stores a value for `ttl` seconds, evicting other entries if the budget is exceeded."""
+        if not self.enabled or ttl <= 0:
+            return
+        blob = encode_value(value)
+        size = len(blob) + len(key) + _ENTRY_OVERHEAD
+        if size > self.max_bytes * (1 - _EVICT_TO):
+            return # Would evict a large part of everyone's cache for one entry
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO cache_entries (namespace, key, value, size, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (namespace, key) DO UPDATE SET"
+                    " value = excluded.value, size = excluded.size, expires_at = excluded.expires_at,"
+                    " accessed_at = excluded.accessed_at",
+                    (namespace, key, blob, size, now + ttl, now))
+                self._evict_if_needed(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.error("Could not store %s/%s in the shared cache: %s", namespace, key, e)
+            return
+        self._count("stores")
+
+    def _evict_if_needed(self, conn: sqlite3.Connection, now: float):
+        # Runs inside the writer's transaction, so concurrent writers never evict twice
+        total = conn.execute("SELECT value FROM cache_meta WHERE name = 'bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * _EVICT_TO
+        evicted = conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,)).rowcount
+        total = conn.execute("SELECT value FROM cache_meta WHERE name = 'bytes'").fetchone()[0]
+        while total > target:
+            freed = conn.execute(
+                "DELETE FROM cache_entries WHERE rowid IN"
+                " (SELECT rowid FROM cache_entries ORDER BY accessed_at LIMIT ?) RETURNING size",
+                (_EVICT_BATCH,)).fetchall()
+            if not freed:
+                break
+            evicted += len(freed)
+            total -= sum(size for (size,) in freed)
+        conn.execute("UPDATE cache_meta SET value = value + ? WHERE name = 'evictions'", (evicted,))
+
+    def delete(self, namespace: str, key: str):
+        if not self.enabled:
+            return
+        try:
+            self._connection().execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.error("Could not delete %s/%s from the shared cache: %s", namespace, key, e)
+
+    def stats(self) -> dict:
+        """This process's lookup counters, plus the node-wide size of the cache."""
+        with self._counter_lock:
+            stats = dict(self.counters)
+        stats["enabled"] = self.enabled
+        if self.enabled:
+            try:
+                totals = dict(self._connection().execute("SELECT name, value FROM cache_meta").fetchall())
+            except sqlite3.Error as e:
+                logger.error("Could not read shared cache totals: %s", e)
+                totals = {}
+            stats.update({"bytes": totals.get("bytes", 0), "entries": totals.get("entries", 0),
+                          "evictions": totals.get("evictions", 0), "max_bytes": self.max_bytes})
+        return stats
+
+
+# The process-wide handle on the node's shared cache used by the content and search caches
+shared_cache = SharedCache()
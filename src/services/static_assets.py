@@ -0,0 +1,216 @@
+# /home/ubuntu/fact_checker_backend/src/services/static_assets.py
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+import time
+
+try:
+    import brotli # Optional: without it only gzip variants are built
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# The front-end build in src/static is scanned once at startup into an in-memory manifest, so
+# serving a file costs a dict lookup: no filesystem access, no per-request compression.
+# With STATIC_RELOAD_INTERVAL_S > 0 (development) the folder is checked for changes at most
+# that often, on access, and rescanned when a file was added, removed or modified.
+STATIC_RELOAD_INTERVAL_S = float(os.getenv("STATIC_RELOAD_INTERVAL_S", "0"))
+STATIC_MAX_AGE_S = int(os.getenv("STATIC_MAX_AGE_S", "3600")) # For assets without a content hash in their name
+# Larger files are hashed, but not held in memory or compressed; they are sent from disk
+STATIC_MAX_INLINE_BYTES = int(os.getenv("STATIC_MAX_INLINE_BYTES", str(8 * 1024 * 1024)))
+_COMPRESS_MIN_BYTES = 1024
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml",
+                       "application/manifest+json", "image/svg+xml", "application/wasm")
+# Bundler output like "app.3f9a1c2b.js" or "index-B8xk2Q4a.css": the name changes with the content
+_FINGERPRINT_RE = re.compile(r"[.-][0-9A-Za-z_]{8,}\.[0-9A-Za-z]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# The index must be revalidated every time (cheap with its ETag), so new builds are picked up
+INDEX_CACHE_CONTROL = "no-cache"
+
+mimetypes.add_type("application/javascript", ".mjs")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+mimetypes.add_type("application/wasm", ".wasm")
+mimetypes.add_type("font/woff2", ".woff2")
+
+
+def _mime_type(path: str) -> str:
+    mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if mime_type.startswith("text/") or mime_type == "application/javascript":
+        mime_type += "; charset=utf-8"
+    return mime_type
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Content codings an Accept-Encoding header allows (those not given q=0)."""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+class StaticAsset:
+    """One file of the static folder: its identity body, compressed variants and response headers."""
+
+    def __init__(self, relative_path: str, full_path: str, data: bytes, digest: str, mtime_ns: int, size: int):
+        self.relative_path = relative_path
+        self.full_path = full_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.mime_type = _mime_type(relative_path)
+        self.etag = f'"{digest}"'
+        if relative_path == "index.html" or self.mime_type.startswith("text/html"):
+            self.cache_control = INDEX_CACHE_CONTROL
+        elif _FINGERPRINT_RE.search(os.path.basename(relative_path)):
+            self.cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            self.cache_control = f"public, max-age={STATIC_MAX_AGE_S}"
+        # coding -> body; "identity" is None for files sent from disk
+        self.bodies = {"identity": data}
+        if data is not None and len(data) >= _COMPRESS_MIN_BYTES and self.mime_type.startswith(_COMPRESSIBLE_TYPES):
+            variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants["br"] = brotli.compress(data, quality=11)
+            for coding, body in variants.items():
+                if len(body) < len(data) * 0.9: # Not worth a second representation otherwise
+                    self.bodies[coding] = body
+
+    @property
+    def in_memory(self) -> bool:
+        return self.bodies["identity"] is not None
+
+    @property
+    def compressed(self) -> bool:
+        return len(self.bodies) > 1
+
+    def select(self, accept_encoding: str) -> tuple[str, bytes]:
+        """The smallest representation the client accepts: (content coding, body)."""
+        accepted = _accepted_encodings(accept_encoding or "")
+        for coding in ("br", "gzip"):
+            if coding in self.bodies and (coding in accepted or "*" in accepted):
+                return coding, self.bodies[coding]
+        return "identity", self.bodies["identity"]
+
+    def etag_for(self, coding: str) -> str:
+        # Each representation needs its own strong ETag; all of them revalidate (see matches)
+        return self.etag if coding == "identity" else f"{self.etag[:-1]}-{coding}\""
+
+    def matches(self, if_none_match: str) -> bool:
+        """True if an If-None-Match header names any representation of this version of the file."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        version = self.etag[1:-1]
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/").strip('"')
+            if tag == version or tag.startswith(version + "-"):
+                return True
+        return False
+
+
+def _file_digest(path: str, data: bytes) -> str:
+    if data is not None:
+        return hashlib.blake2b(data, digest_size=12).hexdigest()
+    digest = hashlib.blake2b(digest_size=12)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StaticManifest:
+    """
+    In-memory manifest of a static folder: relative path ("js/app.js") -> StaticAsset.
+
+    Built by scan(); lookups never touch the filesystem. Like the lexicon store, reloads
+    are checked on access, at most every `reload_interval` seconds (never when it is 0), and
+    swap in a complete new manifest, so concurrent requests always see a consistent build.
+    Hidden files and directories are left out.
+    """
+
+    def __init__(self, directory: str, reload_interval: float = STATIC_RELOAD_INTERVAL_S):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._assets = None
+        self._signature = None
+        self._checked_at = 0.0
+
+    def _files(self):
+        """Yields (relative path, full path, stat result) for every file under the directory."""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if name.startswith("."):
+                    continue
+                full_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(full_path)
+                except FileNotFoundError: # Removed while walking
+                    continue
+                yield os.path.relpath(full_path, self.directory).replace(os.sep, "/"), full_path, stat
+
+    def _current_signature(self) -> frozenset:
+        return frozenset((path, stat.st_mtime_ns, stat.st_size) for path, _, stat in self._files())
+
+    def scan(self) -> dict:
+        """Rebuilds the manifest from the directory unconditionally and returns it."""
+        with self._lock:
+            started = time.perf_counter()
+            assets, signature = {}, set()
+            previous = self._assets or {}
+            for relative_path, full_path, stat in self._files():
+                signature.add((relative_path, stat.st_mtime_ns, stat.st_size))
+                old = previous.get(relative_path)
+                if old is not None and (old.mtime_ns, old.size) == (stat.st_mtime_ns, stat.st_size):
+                    assets[relative_path] = old # Unchanged: keep its hash and compressed bodies
+                    continue
+                try:
+                    data = None
+                    if stat.st_size <= STATIC_MAX_INLINE_BYTES:
+                        with open(full_path, "rb") as f:
+                            data = f.read()
+                    assets[relative_path] = StaticAsset(relative_path, full_path, data, _file_digest(full_path, data),
+                                                        stat.st_mtime_ns, stat.st_size)
+                except OSError as e:
+                    logger.warning("Could not read static file %s: %s", full_path, e)
+            self._assets = assets
+            self._signature = frozenset(signature)
+            self._checked_at = time.monotonic()
+            logger.info("Built static manifest for %s: %d files, %d compressed, in %.0f ms", self.directory,
+                        len(assets), sum(1 for a in assets.values() if a.compressed),
+                        (time.perf_counter() - started) * 1000)
+            return assets
+
+    def current(self) -> dict:
+        """Returns the current manifest, rescanning first if reloading is on and the folder changed."""
+        assets = self._assets
+        if assets is None:
+            return self.scan()
+        if self.reload_interval <= 0 or time.monotonic() - self._checked_at < self.reload_interval:
+            return assets
+        self._checked_at = time.monotonic()
+        if self._current_signature() != self._signature:
+            return self.scan()
+        return assets
+
+    def get(self, path: str):
+        """The StaticAsset for a request path ("" and unknown paths give None)."""
+        return self.current().get(path.strip("/")) if path else None
@@ -0,0 +1,13 @@
+# /home/ubuntu/fact_checker_backend/src/services/text_utils.py
+
+# English function words. They carry no signal for ranking passages or comparing claims, and
+# can be folded out of search cache keys (see search_cache.normalize_query).
+STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "of", "in", "on", "at", "to", "for",
+    "and", "or", "that", "this", "it", "its", "by", "with", "as", "from", "does", "do", "did",
+})
+
+
+def content_words(tokens) -> set[str]:
+    """The tokens that are not stopwords."""
+    return {token for token in tokens if token not in STOPWORDS}
@@ -0,0 +1,187 @@
+# /home/ubuntu/fact_checker_backend/src/services/verdict_store.py
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from sqlalchemy import create_engine, delete, event, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.models.verdict import Base, Verdict, VerdictBand
+from src.services.claim_index import band_keys, is_near_duplicate, minhash_signature, normalize_claim, shingles
+from src.services.shared_cache import SHARED_CACHE_MMAP_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Verification results are persisted here and reused for the same or near-duplicate claims.
+# Any SQLAlchemy URL works; set VERDICT_STORE_URL to "" to disable the store.
+_DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database", "verdicts.db")
+VERDICT_STORE_URL = os.getenv("VERDICT_STORE_URL", f"sqlite:///{_DEFAULT_DB_PATH}")
+VERDICT_TTL_S = float(os.getenv("VERDICT_TTL_S", str(24 * 3600))) # How long a verdict is served for re-checks
+VERDICT_SIMILARITY_THRESHOLD = float(os.getenv("VERDICT_SIMILARITY_THRESHOLD", "0.8")) # Shingle Jaccard
+VERDICT_MAX_CANDIDATES = 50 # Near-duplicate candidates compared exactly per lookup
+# Verdicts older than this are deleted, by a writer, at most every VERDICT_PURGE_INTERVAL_S.
+# Independent of the TTL, which a caller may lower to skip stored verdicts (bulk_verify --fresh).
+VERDICT_RETENTION_S = float(os.getenv("VERDICT_RETENTION_S", str(VERDICT_TTL_S)))
+VERDICT_PURGE_INTERVAL_S = 3600.0
+
+
+def _enable_sqlite_wal(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL") # Readers in other workers don't block the writer
+    cursor.execute(f"PRAGMA mmap_size={SHARED_CACHE_MMAP_BYTES}") # Read through the OS page cache, shared by workers
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+class VerdictStore:
+    """
+    Persists verdicts and finds fresh ones for a new claim before any search or browser work.
+
+    A claim matches a stored verdict if its normalized text is identical, or if the two are
+    near duplicates: MinHash LSH band keys (stored per verdict) select candidates with an
+    indexed lookup, which are then compared by exact shingle Jaccard similarity and must
+    have the same content words (see claim_index.is_near_duplicate). Only verdicts younger
+    than VERDICT_TTL_S are used; verdicts older than VERDICT_RETENTION_S are deleted.
+
+    Database calls run in a worker thread; errors are logged and treated as a miss, so the
+    store can never fail a verification.
+    """
+
+    def __init__(self, url: str = VERDICT_STORE_URL, ttl: float = VERDICT_TTL_S,
+                 threshold: float = VERDICT_SIMILARITY_THRESHOLD, retention: float = VERDICT_RETENTION_S):
+        self.url = url
+        self.ttl = ttl
+        self.threshold = threshold
+        self.retention = retention
+        self._purged_at = 0.0
+        self._sessionmaker = None
+        self._init_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self.counters = {"exact_hits": 0, "near_duplicate_hits": 0, "misses": 0, "stores": 0, "purged": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    def _count(self, name: str):
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    def _session(self):
+        with self._init_lock:
+            if self._sessionmaker is None:
+                is_sqlite = self.url.startswith("sqlite")
+                in_memory = is_sqlite and self.url in ("sqlite://", "sqlite:///:memory:")
+                options = {"connect_args": {"check_same_thread": False}} if is_sqlite else {}
+                if in_memory:
+                    options["poolclass"] = StaticPool # One connection, so every thread sees the same database
+                elif is_sqlite:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.url[len("sqlite:///"):])), exist_ok=True)
+                engine = create_engine(self.url, **options)
+                if is_sqlite:
+                    event.listen(engine, "connect", _enable_sqlite_wal)
+                Base.metadata.create_all(engine)
+                self._sessionmaker = sessionmaker(engine, expire_on_commit=False)
+            return self._sessionmaker()
+
+    def _lookup(self, statement: str):
+        normalized = normalize_claim(statement)
+        cutoff = time.time() - self.ttl
+        with self._session() as session:
+            exact = session.scalars(
+                select(Verdict).where(Verdict.normalized_statement == normalized, Verdict.created_at >= cutoff)
+                .order_by(Verdict.created_at.desc()).limit(1)).first()
+            if exact is not None:
+                self._count("exact_hits")
+                return {"verdict": exact.to_dict(), "similarity": 1.0}
+
+            keys = band_keys(minhash_signature(shingles(normalized)))
+            candidates = session.scalars(
+                select(Verdict).join(VerdictBand).where(VerdictBand.band_key.in_(keys), Verdict.created_at >= cutoff)
+                .distinct().order_by(Verdict.created_at.desc()).limit(VERDICT_MAX_CANDIDATES)).all()
+            best, best_similarity = None, 0.0
+            for candidate in candidates:
+                duplicate, similarity = is_near_duplicate(normalized, candidate.normalized_statement, self.threshold)
+                if duplicate and similarity > best_similarity:
+                    best, best_similarity = candidate, similarity
+            if best is None:
+                self._count("misses")
+                return None
+            self._count("near_duplicate_hits")
+            return {"verdict": best.to_dict(), "similarity": round(best_similarity, 4)}
+
+    def _save(self, statement: str, result: dict, source_scores: list[dict]):
+        normalized = normalize_claim(statement)
+        verdict = Verdict(
+            statement=statement,
+            normalized_statement=normalized,
+            is_true=result.get("is_true"),
+            confidence_score=result.get("confidence_score") or 0,
+            reasoning=result.get("reasoning", ""),
+            supporting_snippets=result.get("supporting_snippets", []),
+            sources=result.get("sources", []),
+            source_scores=source_scores,
+            created_at=time.time(),
+        )
+        verdict.bands = [VerdictBand(band_key=key) for key in set(band_keys(minhash_signature(shingles(normalized))))]
+        with self._session() as session:
+            session.add(verdict)
+            session.commit()
+        self._count("stores")
+        if time.time() - self._purged_at >= VERDICT_PURGE_INTERVAL_S:
+            self._purged_at = time.time()
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Deletes the verdicts older than the retention period (and their band keys); returns how many."""
+        expired = select(Verdict.id).where(Verdict.created_at < time.time() - self.retention)
+        with self._session() as session:
+            # Bands first: foreign key cascades are not enforced on every database
+            session.execute(delete(VerdictBand).where(VerdictBand.verdict_id.in_(expired)))
+            purged = session.execute(delete(Verdict).where(Verdict.id.in_(expired))).rowcount
+            session.commit()
+        if purged:
+            with self._counter_lock:
+                self.counters["purged"] += purged
+            logger.info("Purged %d verdicts older than %.0fs", purged, self.retention)
+        return purged
+
+    async def lookup(self, statement: str):
+        """
+        Finds a fresh verdict for the same or a near-duplicate claim.
+
+        Returns:
+            {"verdict": Verdict.to_dict(), "similarity": shingle Jaccard similarity (1.0 for
+            an exact match)}, or None.
+        """
+        if not self.enabled:
+            return None
+        try:
+            return await asyncio.to_thread(self._lookup, statement)
+        except SQLAlchemyError as e:
+            self._count("errors")
+            logger.error("Verdict lookup failed: %s", e)
+            return None
+
+    async def save(self, statement: str, result: dict, source_scores: list[dict]):
+        """Stores a verification result (the /api/verify response body) with its per-source scores."""
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self._save, statement, result, source_scores)
+        except SQLAlchemyError as e:
+            self._count("errors")
+            logger.error("Could not store verdict: %s", e)
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            counters = dict(self.counters)
+        counters["enabled"] = self.enabled
+        return counters
+
+
+# The process-wide verdict store used by verification_service
+verdict_store = VerdictStore()
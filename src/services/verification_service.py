@@ -0,0 +1,454 @@
+# /home/ubuntu/fact_checker_backend/src/services/verification_service.py
+
+import asyncio
+import logging
+import os
+from src.services.analysis_service import (
+    analyze_content_for_statement,
+    extract_statement_keywords,
+    score_source_async,
+    summarize_source_scores,
+)
+from src.services.claim_decomposition import decompose_statement
+from src.services.content_cache import normalize_url
+from src.services.content_retrieval_service import retrieve_page
+from src.services.host_scheduler import host_scheduler
+from src.services.metrics import span
+from src.services.search_service import perform_web_search
+from src.services.verdict_store import verdict_store
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of statements of one or more batches verified at the same time (per worker)
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+BATCH_MAX_STATEMENTS = int(os.getenv("BATCH_MAX_STATEMENTS", "100"))
+
+# Latency budgets (seconds). The search stage gets its own budget; retrieval gets whatever is
+# left of the overall deadline minus a small reserve for analysis.
+VERIFY_DEADLINE_S = float(os.getenv("VERIFY_DEADLINE_S", "20"))
+SEARCH_BUDGET_S = float(os.getenv("SEARCH_BUDGET_S", "8"))
+ANALYSIS_RESERVE_S = float(os.getenv("ANALYSIS_RESERVE_S", "1"))
+# Over-fetch: ask the search engine for more results than we analyze, and keep the fastest
+SEARCH_OVERFETCH_RESULTS = int(os.getenv("SEARCH_OVERFETCH_RESULTS", "6"))
+SOURCES_TO_ANALYZE = int(os.getenv("SOURCES_TO_ANALYZE", "3"))
+
+_batch_semaphore = None
+
+
+def _get_batch_semaphore() -> asyncio.Semaphore:
+    global _batch_semaphore
+    if _batch_semaphore is None:
+        _batch_semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    return _batch_semaphore
+
+
+class SharedPageFetcher:
+    """
+    Deduplicates page retrievals within one unit of work (e.g. a batch request).
+
+    The first caller for a (normalized) URL starts the retrieval; every later caller
+    awaits the same task, so a URL appearing in several statements' search results is
+    fetched only once.
+    """
+
+    def __init__(self):
+        self._tasks = {} # normalized URL -> asyncio.Task
+        self.requested = 0
+
+    async def fetch(self, url: str) -> dict:
+        self.requested += 1
+        key = normalize_url(url)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(retrieve_page(url))
+            self._tasks[key] = task
+        # shield: one caller being cancelled must not cancel the fetch for the others
+        page = await asyncio.shield(task)
+        return {**page, "url": url}
+
+    @property
+    def unique_fetches(self) -> int:
+        return len(self._tasks)
+
+
+class _SourceRace:
+    """
+    Retrieves over-fetched sources concurrently and keeps the first ones to arrive.
+
+    Retrieval stops as soon as `wanted` sources with usable content have arrived or the
+    deadline passes, whichever comes first; everything still running is cancelled. Sources
+    still pending when the deadline hit are reported as timed out.
+
+    Fetches are started fastest host first (by the host scheduler's latency EWMA), so when
+    browser pages or host slots are scarce the sources likely to arrive first get them.
+    """
+
+    def __init__(self, search_results: list[dict], fetch_page, wanted: int):
+        self.search_results = search_results
+        self.fetch_page = fetch_page
+        self.wanted = wanted
+        self.arrived = {} # index into search_results -> page dict
+        self.timed_out = [] # indices still pending at the deadline
+
+    async def _fetch(self, index):
+        url = self.search_results[index]["link"]
+        with span("fetch_source", url=url) as fetch_span:
+            page = await self.fetch_page(url)
+            fetch_span.fields["tier"] = page["tier"]
+        return index, page
+
+    async def arrivals(self, deadline: float):
+        """Async generator of (index, page) in completion order, until enough have arrived or time is up."""
+        loop = asyncio.get_running_loop()
+        launch_order = sorted(range(len(self.search_results)),
+                              key=lambda i: host_scheduler.expected_latency(self.search_results[i]["link"]))
+        pending = {asyncio.ensure_future(self._fetch(i)) for i in launch_order}
+        usable = 0
+        try:
+            while pending and usable < self.wanted:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, page = task.result()
+                    self.arrived[index] = page
+                    if page["content"] and not page["content"].startswith("Error:"):
+                        usable += 1
+                    yield index, page
+            if usable < self.wanted:
+                self.timed_out = sorted(index for index in range(len(self.search_results))
+                                        if index not in self.arrived)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def selected(self) -> list[int]:
+        """
+        Indices of the sources to analyze, in search result order: the first `wanted` usable
+        arrivals, topped up with failed ones (which still contribute their search snippet).
+        """
+        usable = [i for i, page in self.arrived.items() if page["content"] and not page["content"].startswith("Error:")]
+        failed = [i for i in self.arrived if i not in usable]
+        chosen = usable[:self.wanted]
+        chosen += failed[:max(0, self.wanted - len(chosen))]
+        return sorted(chosen)
+
+
+def _search_failed(search_results) -> bool:
+    return not search_results or (len(search_results) == 1 and search_results[0]["title"] == "Error")
+
+
+async def _search_within_budget(statement: str, deadline: float):
+    """Runs the search stage with its own budget, capped by the overall deadline; None on timeout."""
+    remaining = deadline - asyncio.get_running_loop().time()
+    try:
+        with span("search"):
+            return await asyncio.wait_for(perform_web_search(statement, num_results=SEARCH_OVERFETCH_RESULTS),
+                                          timeout=max(0, min(SEARCH_BUDGET_S, remaining)))
+    except asyncio.TimeoutError:
+        logger.warning("Search stage exceeded its budget for statement: %s", statement)
+        return None
+
+
+def _failed_search_response(timed_out: bool) -> dict:
+    return {
+        "is_true": None,
+        "confidence_score": 0,
+        "reasoning": "Web search timed out." if timed_out else "Failed to perform web search or no results found.",
+        "supporting_snippets": []
+    }
+
+
+def _stored_verdict_response(match: dict) -> dict:
+    verdict = match["verdict"]
+    return {
+        "is_true": verdict["is_true"],
+        "confidence_score": verdict["confidence_score"],
+        "reasoning": verdict["reasoning"],
+        "supporting_snippets": verdict["supporting_snippets"],
+        "sources": verdict["sources"],
+        "timed_out_sources": [],
+        # Which earlier check this verdict comes from
+        "stored_verdict": {"statement": verdict["statement"], "similarity": match["similarity"],
+                           "verified_at": verdict["verified_at"]},
+    }
+
+
+async def _lookup_stored_verdict(statement: str):
+    with span("verdict_lookup") as lookup_span:
+        match = await verdict_store.lookup(statement)
+        lookup_span.fields["hit"] = match is not None
+    return match
+
+
+async def _store_verdict(statement: str, response: dict, source_scores: list[dict], timed_out: bool):
+    # Verdicts built from a partial set of sources are not reused
+    if response["sources"] and not timed_out:
+        await verdict_store.save(statement, response, source_scores)
+
+
+def _valid_results(search_results: list[dict]) -> list[dict]:
+    valid_search_results = []
+    for res in search_results:
+        if res.get("link") and res["link"] != "N/A":
+            valid_search_results.append(res)
+        else:
+            # If a search result has no valid link, we can't retrieve content for it.
+            logger.info("Skipping content retrieval for result with no link: %s", res.get("title"))
+    return valid_search_results
+
+
+async def _verify_claim(statement: str, fetch_page, deadline: float) -> dict:
+    """The search -> retrieve -> analyze pipeline for one (atomic) claim; see verify_statement()."""
+    # 0. Reuse a fresh verdict for the same or a near-duplicate claim
+    match = await _lookup_stored_verdict(statement)
+    if match is not None:
+        return _stored_verdict_response(match)
+
+    # 1. Perform Web Search
+    search_results = await _search_within_budget(statement, deadline)
+    if _search_failed(search_results):
+        return _failed_search_response(timed_out=search_results is None)
+
+    # 2. Retrieve Content from URLs, keeping the first ones to arrive
+    valid_search_results_for_content = _valid_results(search_results)
+    race = _SourceRace(valid_search_results_for_content, fetch_page, SOURCES_TO_ANALYZE)
+    with span("retrieval") as retrieval_span:
+        async for _ in race.arrivals(deadline - ANALYSIS_RESERVE_S):
+            pass
+        retrieval_span.fields["timed_out_sources"] = len(race.timed_out)
+    selected = race.selected()
+
+    # 3. Analyze Content
+    # Each retrieved item is {"url", "content", "tier"}, in the same order as the selected search results
+    retrieved_contents_for_analysis = [race.arrived[i] for i in selected]
+    with span("analysis", sources=len(selected)):
+        analysis_result = await analyze_content_for_statement(
+            statement, [valid_search_results_for_content[i] for i in selected], retrieved_contents_for_analysis)
+
+    response = {
+        "is_true": analysis_result.get("is_true"),
+        "confidence_score": analysis_result.get("confidence_score"),
+        "reasoning": analysis_result.get("reasoning", "Analysis completed."),
+        "supporting_snippets": analysis_result.get("supporting_snippets", []),
+        "sources": [{"url": item["url"], "tier": item["tier"]} for item in retrieved_contents_for_analysis],
+        "timed_out_sources": [valid_search_results_for_content[i]["link"] for i in race.timed_out]
+    }
+    await _store_verdict(statement, response, analysis_result.get("source_scores", []), bool(race.timed_out))
+    return response
+
+
+def _merge_sub_claim_verdicts(sub_claims: list[str], results: list[dict]) -> dict:
+    """
+    Combines the verdicts of a statement's sub-claims into one /api/verify response body.
+
+    The statement is only as true as its weakest part: it is false if any sub-claim is
+    contradicted (with the confidence of the strongest contradiction), true if every
+    sub-claim is supported (with the lowest confidence among them), and inconclusive
+    otherwise. Snippets are taken from each sub-claim in turn; sources are deduplicated.
+    """
+    contradicted = [i for i, result in enumerate(results) if result["is_true"] is False]
+    supported = [i for i, result in enumerate(results) if result["is_true"] is True]
+    inconclusive = len(results) - len(contradicted) - len(supported)
+    reasoning = (f"Checked {len(results)} sub-claims: {len(supported)} supported, "
+                 f"{len(contradicted)} contradicted, {inconclusive} inconclusive. ")
+    if contradicted:
+        is_true = False
+        confidence = max(results[i]["confidence_score"] for i in contradicted)
+        reasoning += "Contradicted: " + "; ".join(f'"{sub_claims[i]}"' for i in contradicted) + "."
+    elif len(supported) == len(results):
+        is_true = True
+        confidence = min(result["confidence_score"] for result in results)
+        reasoning += "Every part of the statement is supported."
+    else:
+        is_true = None
+        confidence = min(result["confidence_score"] for result in results)
+        reasoning += "Not every part of the statement could be confirmed."
+
+    snippets, seen = [], set()
+    for rank in range(max(len(result["supporting_snippets"]) for result in results)):
+        for result in results:
+            if rank < len(result["supporting_snippets"]):
+                snippet = result["supporting_snippets"][rank]
+                key = (snippet["source_url"], snippet["snippet"])
+                if key not in seen:
+                    seen.add(key)
+                    snippets.append(snippet)
+    sources = list({source["url"]: source for result in results for source in result.get("sources", [])}.values())
+    timed_out = list(dict.fromkeys(url for result in results for url in result.get("timed_out_sources", [])))
+    return {
+        "is_true": is_true,
+        "confidence_score": confidence,
+        "reasoning": reasoning,
+        "supporting_snippets": snippets[:max(3, len(results))],
+        "sources": sources,
+        "timed_out_sources": timed_out,
+        "sub_claims": [{"statement": sub_claim, **result} for sub_claim, result in zip(sub_claims, results)],
+    }
+
+
+async def verify_statement(statement: str, fetch_page=None) -> dict:
+    """
+    Runs the search -> retrieve -> analyze pipeline for one statement.
+
+    A fresh stored verdict for the same or a near-duplicate statement is returned instead,
+    without any search or retrieval (with a "stored_verdict" field saying which). New
+    verdicts are stored unless some sources timed out.
+
+    Compound statements ("X was born in 1950 and later became mayor of Y") are split into
+    sub-claims (see claim_decomposition) that go through the pipeline concurrently, each
+    with its own search, sharing page retrievals and the deadline; their verdicts are
+    merged, with the per-sub-claim results in "sub_claims". Sub-claim verdicts are stored
+    and reused like any other; the merged one is not.
+
+    The whole pipeline runs under VERIFY_DEADLINE_S. Search gets SEARCH_BUDGET_S of it and
+    over-fetches SEARCH_OVERFETCH_RESULTS results; sources are then retrieved concurrently
+    and analysis starts with the first SOURCES_TO_ANALYZE that arrive, or with whatever has
+    arrived when the retrieval budget runs out.
+
+    Args:
+        statement: The statement to verify.
+        fetch_page: Coroutine function used to retrieve each source; defaults to retrieve_page,
+            a SharedPageFetcher's fetch() is passed in to share retrievals between statements.
+
+    Returns:
+        The /api/verify response body: "is_true", "confidence_score", "reasoning",
+        "supporting_snippets", "sources" and "timed_out_sources" ("stored_verdict" too
+        when the verdict was reused, "sub_claims" when the statement was split).
+    """
+    deadline = asyncio.get_running_loop().time() + VERIFY_DEADLINE_S
+    sub_claims = decompose_statement(statement)
+    if len(sub_claims) == 1:
+        return await _verify_claim(statement, fetch_page or retrieve_page, deadline)
+
+    # A verdict stored for the statement as a whole (e.g. with decomposition turned off)
+    match = await _lookup_stored_verdict(statement)
+    if match is not None:
+        return _stored_verdict_response(match)
+    fetch_page = fetch_page or SharedPageFetcher().fetch # Sub-claims often search up the same pages
+    with span("sub_claims", count=len(sub_claims)):
+        results = await asyncio.gather(*(_verify_claim(sub_claim, fetch_page, deadline) for sub_claim in sub_claims))
+    return _merge_sub_claim_verdicts(sub_claims, list(results))
+
+
+async def verify_statement_stream(statement: str, fetch_page=None):
+    """
+    Streaming variant of verify_statement(): an async generator of (event, data) pairs
+    emitted as the pipeline progresses, under the same deadlines.
+
+    Events:
+        - "search": {"results": [...]} once search results arrive
+        - "source": {"index", "url", "tier", "score", "stance", "snippet"} per source, as soon
+          as it has been retrieved and scored (completion order, not search order)
+        - "verdict": the same body verify_statement() returns
+
+    The verdict is computed from the selected sources in search result order, so it
+    matches the non-streaming endpoint exactly. A reused stored verdict is the only event.
+
+    A compound statement is verified as in verify_statement(), with these events instead
+    of "search" and "source":
+        - "sub_claims": {"statements": [...]} as soon as the statement has been split
+        - "sub_claim": {"index", "statement", ...its verdict} per sub-claim, as it finishes
+    """
+    deadline = asyncio.get_running_loop().time() + VERIFY_DEADLINE_S
+    sub_claims = decompose_statement(statement)
+
+    match = await _lookup_stored_verdict(statement)
+    if match is not None:
+        yield "verdict", _stored_verdict_response(match)
+        return
+
+    if len(sub_claims) > 1:
+        yield "sub_claims", {"statements": sub_claims}
+        fetch_page = fetch_page or SharedPageFetcher().fetch
+
+        async def _verify_sub_claim(index):
+            return index, await _verify_claim(sub_claims[index], fetch_page, deadline)
+
+        results = [None] * len(sub_claims)
+        tasks = [asyncio.ensure_future(_verify_sub_claim(i)) for i in range(len(sub_claims))]
+        try:
+            with span("sub_claims", count=len(sub_claims)):
+                for next_done in asyncio.as_completed(tasks):
+                    index, result = await next_done
+                    results[index] = result
+                    yield "sub_claim", {"index": index, "statement": sub_claims[index], **result}
+        finally:
+            for task in tasks: # The client went away, or a sub-claim failed
+                task.cancel()
+        yield "verdict", _merge_sub_claim_verdicts(sub_claims, results)
+        return
+
+    fetch_page = fetch_page or retrieve_page
+
+    search_results = await _search_within_budget(statement, deadline)
+    if _search_failed(search_results):
+        yield "search", {"results": []}
+        yield "verdict", _failed_search_response(timed_out=search_results is None)
+        return
+    yield "search", {"results": search_results}
+
+    valid_search_results = _valid_results(search_results)
+    statement_keywords = extract_statement_keywords(statement)
+    source_scores = {}
+    race = _SourceRace(valid_search_results, fetch_page, SOURCES_TO_ANALYZE)
+    async for index, page in race.arrivals(deadline - ANALYSIS_RESERVE_S):
+        source_score = await score_source_async(statement_keywords, valid_search_results[index], page["content"])
+        source_scores[index] = source_score
+        yield "source", {"index": index, "url": page["url"], "tier": page["tier"], "score": source_score["score"],
+                         "stance": source_score["stance"], "snippet": source_score["snippet"]}
+
+    selected = race.selected()
+    verdict = summarize_source_scores([source_scores[i] for i in selected])
+    response = {
+        "is_true": verdict.get("is_true"),
+        "confidence_score": verdict.get("confidence_score"),
+        "reasoning": verdict.get("reasoning", "Analysis completed."),
+        "supporting_snippets": verdict.get("supporting_snippets", []),
+        "sources": [{"url": race.arrived[i]["url"], "tier": race.arrived[i]["tier"]} for i in selected],
+        "timed_out_sources": [valid_search_results[i]["link"] for i in race.timed_out]
+    }
+    yield "verdict", response
+    await _store_verdict(statement, response, verdict.get("source_scores", []), bool(race.timed_out))
+
+
+async def verify_statements_batch(statements: list) -> dict:
+    """
+    Verifies several statements concurrently, sharing page retrievals between them.
+
+    At most BATCH_MAX_CONCURRENCY statements run at once across all batches in this worker.
+    A failing or invalid statement yields an {"error": ...} item instead of aborting the batch.
+
+    Args:
+        statements: The statements to verify.
+
+    Returns:
+        A dictionary containing:
+        - "results": one item per input statement, in input order, each with the
+          "statement" plus either the verification fields or an "error"
+        - "stats": counts of statements, source retrievals requested and unique URLs fetched
+    """
+    fetcher = SharedPageFetcher()
+    semaphore = _get_batch_semaphore()
+
+    async def _verify_one(statement):
+        if not isinstance(statement, str) or not statement.strip():
+            return {"statement": statement, "error": "Statement must be a non-empty string"}
+        async with semaphore:
+            try:
+                result = await verify_statement(statement, fetch_page=fetcher.fetch)
+            except Exception as e:
+                logger.exception("Error verifying batch statement %r: %s", statement, e)
+                return {"statement": statement, "error": f"An unexpected error occurred: {str(e)}"}
+        return {"statement": statement, **result}
+
+    results = await asyncio.gather(*(_verify_one(statement) for statement in statements))
+    return {
+        "results": results,
+        "stats": {
+            "statements": len(statements),
+            "sources_requested": fetcher.requested,
+            "unique_urls_fetched": fetcher.unique_fetches,
+        }
+    }
@@ -0,0 +1,187 @@
+# /home/ubuntu/fact_checker_backend/tests/test_cache.py
+"""
+Tests for the in-memory cache primitives (src/services/cache.py): TTLLRUCache expiry,
+LRU eviction and weights, and SingleFlight collapsing and cancellation.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.services.cache import SingleFlight, TTLLRUCache
+
+
+def test_ttl_lru_get_set_and_stats():
+    cache = TTLLRUCache(max_weight=10, default_ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.stats() == {"entries": 1, "weight": 1, "max_weight": 10, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_ttl_lru_expired_entries_are_misses_unless_stale_allowed():
+    cache = TTLLRUCache(max_weight=10, default_ttl=60)
+    cache.set("old", "value", ttl=-1)
+    assert cache.get("old", allow_stale=True) == "value"
+    assert cache.get("old") is None
+    assert len(cache) == 0 # Dropped on access
+    assert cache.get("old", allow_stale=True) is None
+
+
+def test_ttl_lru_evicts_least_recently_used():
+    cache = TTLLRUCache(max_weight=3, default_ttl=60)
+    for key in "abc":
+        cache.set(key, key)
+    cache.get("a") # b is now the least recently used
+    cache.set("d", "d")
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["a", "c", "d"]
+    assert cache.evictions == 1
+
+
+def test_ttl_lru_weight_budget():
+    cache = TTLLRUCache(max_weight=100, default_ttl=60)
+    cache.set("a", "a", weight=40)
+    cache.set("b", "b", weight=40)
+    cache.set("c", "c", weight=40) # Evicts a
+    assert cache.get("a") is None and cache.stats()["weight"] == 80
+    cache.set("b", "b2", weight=10) # Replacing an entry replaces its weight
+    assert cache.stats()["weight"] == 50
+    cache.set("huge", "x", weight=101) # Larger than the whole budget: not stored, nothing evicted
+    assert cache.get("huge") is None and len(cache) == 2
+    cache.delete("c")
+    assert cache.stats()["weight"] == 10
+
+
+async def _started(coro, *, ticks=3):
+    task = asyncio.ensure_future(coro)
+    for _ in range(ticks):
+        await asyncio.sleep(0)
+    return task
+
+
+def test_single_flight_collapses_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)), flight.do("other", work))
+        return results
+    assert asyncio.run(main()) == ["result"] * 6
+    assert len(calls) == 2
+    assert flight.collapsed == 4
+    assert flight.in_flight() == 0
+
+
+def test_single_flight_shares_exceptions():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+def test_single_flight_leader_cancellation_keeps_work_for_followers():
+    flight = SingleFlight()
+
+    async def main():
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "result"
+        leader = await _started(flight.do("key", work))
+        follower = await _started(flight.do("key", work))
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await follower == "result"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+    asyncio.run(main())
+    assert flight.in_flight() == 0
+
+
+def test_single_flight_cancels_work_when_last_waiter_leaves():
+    flight = SingleFlight()
+    cancelled = []
+
+    async def main():
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        leader = await _started(flight.do("key", work))
+        follower = await _started(flight.do("key", work))
+        leader.cancel() # The follower still waits: the work goes on
+        await asyncio.sleep(0.01)
+        assert not cancelled and flight.in_flight() == 1
+        follower.cancel() # The last waiter leaves: the orphaned work is cancelled
+        await asyncio.sleep(0.01)
+        assert cancelled == [True]
+        assert flight.in_flight() == 0
+        await asyncio.gather(leader, follower, return_exceptions=True)
+    asyncio.run(main())
+
+
+def test_single_flight_cancels_work_of_a_lone_leader():
+    flight = SingleFlight()
+    cancelled = []
+
+    async def main():
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(flight.do("key", work), timeout=0.01)
+        await asyncio.sleep(0.01)
+    asyncio.run(main())
+    assert cancelled == [True]
+    assert flight.in_flight() == 0
+
+
+def test_single_flight_follower_on_another_loop():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    results = {}
+
+    async def work():
+        started.set()
+        await asyncio.to_thread(release.wait)
+        return "result"
+
+    def follow():
+        started.wait()
+        async def follower():
+            task = asyncio.ensure_future(flight.do("key", work))
+            await asyncio.sleep(0.01)
+            release.set()
+            return await task
+        results["follower"] = asyncio.run(follower())
+
+    thread = threading.Thread(target=follow)
+    thread.start()
+    results["leader"] = asyncio.run(flight.do("key", work))
+    thread.join()
+    assert results == {"leader": "result", "follower": "result"}
+    assert flight.collapsed == 1
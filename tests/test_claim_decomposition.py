@@ -0,0 +1,131 @@
+# /home/ubuntu/fact_checker_backend/tests/test_claim_decomposition.py
+"""
+Tests for the claim splitter (src/services/claim_decomposition.py): which connectives split
+a statement and which join nouns, subjects given to verb phrases and pronouns, the
+DECOMPOSE_MAX_SUBCLAIMS merge, and how sub-claim verdicts are merged back into one
+(verification_service._merge_sub_claim_verdicts).
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import pytest
+
+from src.services import claim_decomposition
+from src.services.claim_decomposition import decompose_statement
+from src.services.verification_service import _merge_sub_claim_verdicts
+
+
+@pytest.mark.parametrize("statement", [
+    "Tom and Jerry is an animated series created by Hanna and Barbera",
+    "The conference was held in Paris, London and Berlin over three years",
+    "Salt and pepper are the most common seasonings in Europe and America",
+    "Romeo and Juliet was written by Shakespeare around 1595 in England",
+    "Water boils at 100 degrees", # Shorter than DECOMPOSE_MIN_WORDS
+    # Clauses starting with "it" or "they" could refer to anything before them
+    "Marie Curie won the Nobel Prize in 1903. It was shared with Pierre Curie and Henri Becquerel",
+    "Einstein was born in Ulm and they moved to Munich in 1880",
+])
+def test_not_split(statement):
+    assert decompose_statement(statement) == [statement]
+
+
+@pytest.mark.parametrize("statement, sub_claims", [
+    # A verb phrase after "and" gets the subject, adverbs included
+    ("Arnold Schwarzenegger was born in Austria in 1947 and later became governor of California",
+     ["Arnold Schwarzenegger was born in Austria in 1947", "Arnold Schwarzenegger later became governor of California"]),
+    ("Einstein was born in Ulm in 1879 and then moved to Munich with his family",
+     ["Einstein was born in Ulm in 1879", "Einstein then moved to Munich with his family"]),
+    # Short past tenses the "-ed" rule doesn't cover
+    ("Marie Curie was born in Warsaw in 1867 and died in France in 1934",
+     ["Marie Curie was born in Warsaw in 1867", "Marie Curie died in France in 1934"]),
+    ("Marie Curie was born in Warsaw in 1867 and fled to Paris in 1891",
+     ["Marie Curie was born in Warsaw in 1867", "Marie Curie fled to Paris in 1891"]),
+    ("Marie Curie was born in Warsaw in 1867 and studied physics in Paris",
+     ["Marie Curie was born in Warsaw in 1867", "Marie Curie studied physics in Paris"]),
+    # A noun list before the split stays together
+    ("The museum was founded in 1850 in Paris, London and Berlin and employed 500 people",
+     ["The museum was founded in 1850 in Paris, London and Berlin", "The museum employed 500 people"]),
+    # Commas before verb phrases
+    ("Napoleon was born in Corsica, became emperor of France in 1804, and died on Saint Helena in 1821",
+     ["Napoleon was born in Corsica", "Napoleon became emperor of France in 1804",
+      "Napoleon died on Saint Helena in 1821"]),
+    # Two clauses with their own subjects; capitalized "-ed" words are names, not verbs
+    ("Paris is the capital of France and Berlin is the capital of Germany",
+     ["Paris is the capital of France", "Berlin is the capital of Germany"]),
+    ("The Ford Motor Company was founded by Henry Ford and United Airlines is based in Chicago",
+     ["The Ford Motor Company was founded by Henry Ford", "United Airlines is based in Chicago"]),
+    ("Einstein never won an Oscar but he won the Nobel Prize in Physics",
+     ["Einstein never won an Oscar", "Einstein won the Nobel Prize in Physics"]),
+])
+def test_split(statement, sub_claims):
+    assert decompose_statement(statement) == sub_claims
+
+
+@pytest.mark.parametrize("statement, sub_claims", [
+    ("Marie Curie was born in Warsaw in 1867 and she won two Nobel Prizes",
+     ["Marie Curie was born in Warsaw in 1867", "Marie Curie won two Nobel Prizes"]),
+    ("Einstein was born in Ulm; he developed the theory of relativity in 1905",
+     ["Einstein was born in Ulm", "Einstein developed the theory of relativity in 1905"]),
+    # Across sentences
+    ("Marie Curie was born in Warsaw. She won two Nobel Prizes in physics and chemistry",
+     ["Marie Curie was born in Warsaw", "Marie Curie won two Nobel Prizes in physics and chemistry"]),
+    # "U.S." does not end a sentence, and "It" is not handed on to "meets"
+    ("The U.S. Senate was created in 1789. It has 100 members and meets in Washington",
+     ["The U.S. Senate was created in 1789. It has 100 members and meets in Washington"]),
+])
+def test_pronoun_resolution(statement, sub_claims):
+    assert decompose_statement(statement) == sub_claims
+
+
+@pytest.mark.parametrize("max_subclaims, sub_claims", [
+    (4, ["Einstein was born in Ulm", "Einstein moved to Munich", "Einstein studied in Zurich",
+         "Einstein taught in Berlin. Einstein died in Princeton"]),
+    (2, ["Einstein was born in Ulm",
+         "Einstein moved to Munich. Einstein studied in Zurich. Einstein taught in Berlin. Einstein died in Princeton"]),
+])
+def test_sub_claims_past_the_limit_are_merged_into_the_last(monkeypatch, max_subclaims, sub_claims):
+    monkeypatch.setattr(claim_decomposition, "DECOMPOSE_MAX_SUBCLAIMS", max_subclaims)
+    statement = "Einstein was born in Ulm. He moved to Munich. He studied in Zurich. He taught in Berlin. He died in Princeton."
+    assert decompose_statement(statement) == sub_claims
+
+
+def test_clauses_past_the_limit_stay_in_the_last_clause(monkeypatch):
+    monkeypatch.setattr(claim_decomposition, "DECOMPOSE_MAX_SUBCLAIMS", 2)
+    assert decompose_statement(
+        "Napoleon was born in Corsica, became emperor of France in 1804, and died on Saint Helena in 1821") == [
+        "Napoleon was born in Corsica", "Napoleon became emperor of France in 1804, and died on Saint Helena in 1821"]
+
+
+def test_decomposition_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(claim_decomposition, "DECOMPOSE_CLAIMS", False)
+    statement = "Paris is the capital of France and Berlin is the capital of Germany"
+    assert decompose_statement(statement) == [statement]
+
+
+def _result(is_true, confidence, snippets=(), sources=()):
+    return {"is_true": is_true, "confidence_score": confidence, "reasoning": "",
+            "supporting_snippets": [{"source_url": url, "snippet": text} for url, text in snippets],
+            "sources": [{"url": url, "tier": 2} for url in sources], "timed_out_sources": []}
+
+
+@pytest.mark.parametrize("verdicts, is_true, confidence", [
+    ([(True, 90), (True, 70)], True, 70), # As confident as the weakest part
+    ([(True, 90), (False, 60), (False, 80)], False, 80), # The strongest contradiction
+    ([(True, 90), (None, 20)], None, 20),
+    ([(None, 30), (False, 50)], False, 50),
+])
+def test_merge_sub_claim_verdicts(verdicts, is_true, confidence):
+    sub_claims = [f"claim {i}" for i in range(len(verdicts))]
+    merged = _merge_sub_claim_verdicts(sub_claims, [_result(*verdict) for verdict in verdicts])
+    assert (merged["is_true"], merged["confidence_score"]) == (is_true, confidence)
+    assert [sub_claim["statement"] for sub_claim in merged["sub_claims"]] == sub_claims
+
+
+def test_merge_interleaves_snippets_and_deduplicates_sources():
+    results = [_result(True, 90, snippets=[("a", "a1"), ("a", "a2")], sources=["a", "shared"]),
+               _result(False, 80, snippets=[("b", "b1"), ("a", "a1")], sources=["shared", "b"])]
+    merged = _merge_sub_claim_verdicts(["first", "second"], results)
+    assert [s["snippet"] for s in merged["supporting_snippets"]] == ["a1", "b1", "a2"]
+    assert [s["url"] for s in merged["sources"]] == ["a", "shared", "b"]
+    assert '"second"' in merged["reasoning"]
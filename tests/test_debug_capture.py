@@ -0,0 +1,60 @@
+# /home/ubuntu/fact_checker_backend/tests/test_debug_capture.py
+"""
+Tests for debug capture (src/services/debug_capture.py): sampling modes, and rotation
+deleting only the files the capture wrote.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import os
+import time
+
+from src.services.debug_capture import DebugCapture
+
+
+def _write(directory, name, size, age):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_should_capture_by_mode():
+    assert not DebugCapture(mode="off").enabled
+    assert DebugCapture(mode="always").should_capture(failed=False)
+    assert DebugCapture(mode="failure").should_capture(failed=True)
+    assert not DebugCapture(mode="failure").should_capture(failed=False)
+    sampled = DebugCapture(mode="sample", sample_rate=4)
+    assert [sampled.should_capture(failed=False) for _ in range(8)].count(True) == 2
+
+
+def test_capture_html_writes_named_file(tmp_path):
+    capture = DebugCapture(mode="always", directory=str(tmp_path))
+    capture.capture_html("search-error", "<html></html>")
+    capture.shutdown()
+    [name] = os.listdir(tmp_path)
+    assert name.endswith(".html") and "-search-error-" in name
+
+
+def test_rotate_deletes_old_and_excess_captures(tmp_path):
+    directory = str(tmp_path)
+    expired = _write(directory, "20260101-000000-search-0123abcd.html", 10, age=10_000)
+    oldest = _write(directory, "20260102-000000-search-1111abcd.png", 60, age=300)
+    newest = _write(directory, "20260103-000000-search-2222abcd.html", 60, age=100)
+    DebugCapture(directory=directory, max_bytes=100, max_age=1000).rotate()
+    assert not os.path.exists(expired) # Too old
+    assert not os.path.exists(oldest) # The oldest, to get under max_bytes
+    assert os.path.exists(newest)
+
+
+def test_rotate_leaves_other_files_alone(tmp_path):
+    directory = str(tmp_path)
+    others = [_write(directory, name, 1000, age=10_000) for name in
+              ("notes.txt", "report.html", "screenshot.png", "20260101-000000-search-0123abcd.html.bak")]
+    capture = _write(directory, "20260101-000000-search-0123abcd.html", 10, age=10_000)
+    DebugCapture(directory=directory, max_bytes=1, max_age=1).rotate()
+    assert not os.path.exists(capture)
+    assert all(os.path.exists(path) for path in others)
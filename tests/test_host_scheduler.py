@@ -0,0 +1,219 @@
+# /home/ubuntu/fact_checker_backend/tests/test_host_scheduler.py
+"""
+Tests for per-host admission control (src/services/host_scheduler.py): the circuit breaker
+(closed, open, half-open), AIMD concurrency limits and the token bucket rate limit.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.services.host_scheduler import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    HostScheduler,
+    HostUnavailableError,
+    host_of,
+)
+
+URL = "https://www.example.com/article"
+
+
+def _scheduler(**kwargs):
+    options = {"initial_concurrency": 2, "max_concurrency": 6, "rate": 0, "burst": 10,
+               "breaker_failures": 3, "breaker_cooldown": 60}
+    return HostScheduler(**{**options, **kwargs})
+
+
+async def _fetch(scheduler, outcome="ok"):
+    async with scheduler.slot(URL) as slot:
+        if outcome == "fail":
+            slot.fail("HTTP 503")
+        elif outcome == "raise":
+            raise TimeoutError("navigation timeout")
+        elif outcome == "discard":
+            slot.discard()
+
+
+async def _fetches(scheduler, outcomes):
+    for outcome in outcomes:
+        try:
+            await _fetch(scheduler, outcome)
+        except TimeoutError:
+            pass
+
+
+def _state(scheduler):
+    return scheduler.stats()["example.com"]
+
+
+def test_host_of_ignores_www_and_case():
+    assert host_of("https://WWW.Example.com:8443/a?b") == "example.com"
+    assert host_of("http://news.example.com/") == "news.example.com"
+
+
+def test_breaker_opens_after_consecutive_failures():
+    scheduler = _scheduler()
+    asyncio.run(_fetches(scheduler, ["fail", "raise", "ok", "fail", "fail"]))
+    assert _state(scheduler)["breaker"] == BREAKER_CLOSED # The success reset the count
+    asyncio.run(_fetches(scheduler, ["raise"]))
+    state = _state(scheduler)
+    assert state["breaker"] == BREAKER_OPEN and state["breaker_opened"] == 1
+    assert not scheduler.available(URL)
+    with pytest.raises(HostUnavailableError) as raised:
+        asyncio.run(_fetch(scheduler))
+    assert raised.value.host == "example.com" and 0 < raised.value.retry_after <= 60
+    assert _state(scheduler)["rejected"] == 1
+
+
+def test_discarded_fetches_do_not_count():
+    scheduler = _scheduler()
+    asyncio.run(_fetches(scheduler, ["discard"] * 5))
+    state = _state(scheduler)
+    assert state["breaker"] == BREAKER_CLOSED
+    assert (state["ok"], state["error"], state["cancelled"]) == (0, 0, 5)
+    assert state["concurrency_limit"] == 2
+
+
+def _open(scheduler):
+    asyncio.run(_fetches(scheduler, ["fail"] * 3))
+    assert _state(scheduler)["breaker"] == BREAKER_OPEN
+
+
+def test_half_open_probe_success_closes_the_breaker():
+    scheduler = _scheduler(breaker_cooldown=0.05)
+    _open(scheduler)
+    time.sleep(0.06)
+    assert scheduler.available(URL)
+
+    async def probe_and_second_fetch():
+        release = asyncio.Event()
+
+        async def probe():
+            async with scheduler.slot(URL):
+                assert _state(scheduler)["breaker"] == BREAKER_HALF_OPEN
+                await release.wait()
+        task = asyncio.ensure_future(probe())
+        await asyncio.sleep(0.01)
+        with pytest.raises(HostUnavailableError): # Only one probe at a time
+            await _fetch(scheduler)
+        release.set()
+        await task
+    asyncio.run(probe_and_second_fetch())
+    assert _state(scheduler)["breaker"] == BREAKER_CLOSED
+    asyncio.run(_fetch(scheduler))
+
+
+def test_half_open_probe_failure_reopens_the_breaker():
+    scheduler = _scheduler(breaker_cooldown=0.05)
+    _open(scheduler)
+    time.sleep(0.06)
+
+    async def failed_probe():
+        async with scheduler.slot(URL):
+            scheduler.breaker_cooldown = 60 # The next cooldown outlasts the test
+            raise TimeoutError("navigation timeout")
+    with pytest.raises(TimeoutError):
+        asyncio.run(failed_probe())
+    assert _state(scheduler)["breaker"] == BREAKER_OPEN
+    assert not scheduler.available(URL) # A new cooldown started
+    with pytest.raises(HostUnavailableError):
+        asyncio.run(_fetch(scheduler))
+
+
+def test_discarded_probe_lets_the_next_fetch_probe():
+    scheduler = _scheduler(breaker_cooldown=0.05)
+    _open(scheduler)
+    time.sleep(0.06)
+    asyncio.run(_fetches(scheduler, ["discard"]))
+    assert _state(scheduler)["breaker"] == BREAKER_HALF_OPEN
+    asyncio.run(_fetch(scheduler))
+    assert _state(scheduler)["breaker"] == BREAKER_CLOSED
+
+
+def test_aimd_grows_additively_and_halves_on_failure():
+    scheduler = _scheduler(initial_concurrency=2, max_concurrency=4, breaker_failures=100)
+    asyncio.run(_fetches(scheduler, ["ok"] * 2)) # 2 + 1/2 + 1/2.5: one slot per "limit" successes
+    assert _state(scheduler)["concurrency_limit"] == 2
+    asyncio.run(_fetches(scheduler, ["ok"]))
+    assert _state(scheduler)["concurrency_limit"] == 3
+    asyncio.run(_fetches(scheduler, ["ok"] * 20))
+    assert _state(scheduler)["concurrency_limit"] == 4 # Capped at max_concurrency
+    asyncio.run(_fetches(scheduler, ["fail"]))
+    assert _state(scheduler)["concurrency_limit"] == 2
+    asyncio.run(_fetches(scheduler, ["fail"] * 5))
+    assert _state(scheduler)["concurrency_limit"] == 1 # Never below one
+
+
+def test_concurrency_limit_queues_fetches():
+    scheduler = _scheduler(initial_concurrency=2)
+    peak = {"now": 0, "max": 0}
+
+    async def fetch():
+        async with scheduler.slot(URL):
+            peak["now"] += 1
+            peak["max"] = max(peak["max"], peak["now"])
+            await asyncio.sleep(0.02)
+            peak["now"] -= 1
+
+    async def main():
+        await asyncio.gather(*(fetch() for _ in range(6)))
+    asyncio.run(main())
+    assert peak["max"] == 2
+    state = _state(scheduler)
+    assert state["in_flight"] == 0 and state["waiting"] == 0
+
+
+def test_cancelled_waiter_gives_its_slot_back():
+    scheduler = _scheduler(initial_concurrency=1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot(URL):
+                await release.wait()
+        held = asyncio.ensure_future(holder())
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(_fetch(scheduler))
+        await asyncio.sleep(0.01)
+        assert _state(scheduler)["waiting"] == 1
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        release.set()
+        await held
+        await asyncio.wait_for(_fetch(scheduler), timeout=1)
+    asyncio.run(main())
+    assert _state(scheduler)["in_flight"] == 0
+
+
+def test_token_bucket_limits_the_rate_after_the_burst():
+    scheduler = _scheduler(rate=50, burst=2, initial_concurrency=6)
+
+    async def main():
+        started = time.perf_counter()
+        await asyncio.gather(*(_fetch(scheduler) for _ in range(2)))
+        burst = time.perf_counter() - started
+        await asyncio.gather(*(_fetch(scheduler) for _ in range(3))) # Tokens arrive every 20 ms
+        return burst, time.perf_counter() - started
+    burst, total = asyncio.run(main())
+    assert burst < 0.02
+    assert total >= 0.05
+
+
+def test_latency_ewma_uses_slot_latency():
+    scheduler = _scheduler()
+    assert scheduler.expected_latency(URL) == 2.0 # Unknown host
+
+    async def fetch(latency):
+        async with scheduler.slot(URL) as slot:
+            slot.latency = latency
+    asyncio.run(fetch(1.0))
+    assert scheduler.expected_latency(URL) == 1.0
+    asyncio.run(fetch(2.0))
+    assert scheduler.expected_latency(URL) == pytest.approx(0.3 * 2.0 + 0.7 * 1.0)
@@ -0,0 +1,226 @@
+# /home/ubuntu/fact_checker_backend/tests/test_http_fetch.py
+"""
+Tests for the plain HTTP fetch tier (http_client.fetch_url and the content retrieval
+service's _retrieve_with_http) against a local stub HTTP server; no network access needed.
+Also checks that a page escalated to the browser tier records one host outcome, not two.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.services import content_retrieval_service, http_client
+from src.services.cpu_executor import cpu_executor
+from src.services.host_scheduler import HostScheduler, host_of
+
+ARTICLE_TEXT = "The Eiffel Tower was completed in 1889 for the World's Fair in Paris. " * 10
+ARTICLE_HTML = (f"<html><head><title>Eiffel Tower</title></head><body><nav>Home | News</nav>"
+                f"<article><p>{ARTICLE_TEXT}</p></article><footer>Contact</footer></body></html>")
+SHORT_HTML = "<html><body><div id='app'>Loading...</div></body></html>"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/article" and self.headers.get("If-None-Match") == '"v1"':
+            self._send(304, b"", "text/html", {"ETag": '"v1"'})
+        elif self.path == "/article":
+            self._send(200, ARTICLE_HTML.encode(), "text/html; charset=utf-8", {"ETag": '"v1"'})
+        elif self.path == "/short":
+            self._send(200, SHORT_HTML.encode(), "text/html")
+        elif self.path == "/data.json":
+            self._send(200, b'{"text": "' + ARTICLE_TEXT.encode() + b'"}', "application/json")
+        elif self.path == "/redirect":
+            self._send(302, b"", "text/html", {"Location": "/article"})
+        elif self.path.startswith("/status/"):
+            status = int(self.path.rsplit("/", 1)[1])
+            self._send(status, ARTICLE_HTML.encode(), "text/html")
+        elif self.path == "/slow":
+            time.sleep(1.0)
+            self._send(200, ARTICLE_HTML.encode(), "text/html")
+        elif self.path == "/large":
+            self._send(200, b"<html><body>" + b"x" * 300_000 + b"</body></html>", "text/html")
+        else:
+            self._send(404, b"Not found", "text/plain")
+
+    def _send(self, status, body, content_type, headers=None):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if status != 304:
+                self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError): # The client gave up (timeout tests)
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_services(monkeypatch):
+    # A fresh host scheduler per test, so failures in one test don't trip the breaker for the next;
+    # text extraction runs inline instead of in worker processes
+    monkeypatch.setattr(content_retrieval_service, "host_scheduler", HostScheduler())
+    monkeypatch.setattr(cpu_executor, "kind", "inline")
+
+
+def _run(coro):
+    async def _with_client():
+        try:
+            return await coro
+        finally:
+            await http_client.close_http_client()
+    return asyncio.run(_with_client())
+
+
+def test_fetch_url_returns_status_headers_and_text(stub_server):
+    response = _run(http_client.fetch_url(f"{stub_server}/article"))
+    assert response["status"] == 200
+    assert response["url"] == f"{stub_server}/article"
+    assert response["headers"]["etag"] == '"v1"'
+    assert "Eiffel Tower was completed in 1889" in response["text"]
+    assert not response["truncated"]
+
+
+def test_fetch_url_follows_redirects(stub_server):
+    response = _run(http_client.fetch_url(f"{stub_server}/redirect"))
+    assert response["status"] == 200
+    assert response["url"] == f"{stub_server}/article"
+
+
+def test_fetch_url_returns_error_statuses(stub_server):
+    assert _run(http_client.fetch_url(f"{stub_server}/status/404"))["status"] == 404
+    assert _run(http_client.fetch_url(f"{stub_server}/status/503"))["status"] == 503
+
+
+def test_fetch_url_times_out(stub_server, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_FETCH_TIMEOUT", 0.2)
+    started = time.perf_counter()
+    with pytest.raises(httpx.TimeoutException):
+        _run(http_client.fetch_url(f"{stub_server}/slow"))
+    assert time.perf_counter() - started < 1.0
+
+
+def test_fetch_url_caps_the_body(stub_server, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_FETCH_MAX_BYTES", 100_000)
+    response = _run(http_client.fetch_url(f"{stub_server}/large"))
+    assert response["truncated"]
+    assert len(response["text"]) == 100_000
+
+
+def test_retrieve_with_http_extracts_main_content(stub_server):
+    result = _run(content_retrieval_service._retrieve_with_http(f"{stub_server}/article"))
+    assert result is not None
+    assert "Eiffel Tower was completed in 1889" in result["content"]
+    assert "Contact" not in result["content"] # Outside the <article>
+    assert result["etag"] == '"v1"'
+    assert not result["not_modified"]
+
+
+def test_retrieve_with_http_follows_redirects(stub_server):
+    result = _run(content_retrieval_service._retrieve_with_http(f"{stub_server}/redirect"))
+    assert result is not None
+    assert "Eiffel Tower was completed in 1889" in result["content"]
+
+
+@pytest.mark.parametrize("path", ["/status/404", "/status/500", "/status/503", "/status/429"])
+def test_retrieve_with_http_escalates_error_statuses(stub_server, path):
+    assert _run(content_retrieval_service._retrieve_with_http(f"{stub_server}{path}")) is None
+
+
+def test_retrieve_with_http_escalates_non_html(stub_server):
+    assert _run(content_retrieval_service._retrieve_with_http(f"{stub_server}/data.json")) is None
+
+
+def test_retrieve_with_http_escalates_too_little_text(stub_server):
+    assert _run(content_retrieval_service._retrieve_with_http(f"{stub_server}/short")) is None
+
+
+def test_retrieve_with_http_escalates_timeouts(stub_server, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_FETCH_TIMEOUT", 0.2)
+    assert _run(content_retrieval_service._retrieve_with_http(f"{stub_server}/slow")) is None
+
+
+def test_retrieve_with_http_revalidates_cached_entry(stub_server):
+    cached = {"content": "cached text", "etag": '"v1"', "last_modified": None, "is_error": False}
+    result = _run(content_retrieval_service._retrieve_with_http(f"{stub_server}/article", cached))
+    assert result == {"content": "cached text", "etag": '"v1"', "last_modified": None, "not_modified": True}
+
+
+class _FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+
+class _FakePage:
+    """Just enough of a Playwright page for _retrieve_with_browser()."""
+
+    def __init__(self, status=200, goto_error=None):
+        self.status = status
+        self.goto_error = goto_error
+
+    async def route(self, url, handler):
+        pass
+
+    async def goto(self, url, **kwargs):
+        if self.goto_error is not None:
+            raise self.goto_error
+        return _FakeResponse(self.status)
+
+    async def query_selector(self, selector):
+        return None
+
+
+def _host_counts(url):
+    return content_retrieval_service.host_scheduler.stats()[host_of(url)]
+
+
+@pytest.mark.parametrize("path", ["/status/503", "/status/404", "/data.json", "/short"])
+def test_escalated_http_fetch_records_no_host_outcome(stub_server, path):
+    assert _run(content_retrieval_service._retrieve_with_http(f"{stub_server}{path}")) is None
+    counts = _host_counts(stub_server)
+    assert (counts["ok"], counts["error"], counts["cancelled"]) == (0, 0, 1)
+
+
+def test_http_timeout_then_browser_failure_counts_one_failure(stub_server, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_FETCH_TIMEOUT", 0.2)
+
+    async def run(page_fn, **context_options):
+        return await page_fn(_FakePage(goto_error=TimeoutError("Navigation timeout")))
+    monkeypatch.setattr(content_retrieval_service.browser_pool, "run", run)
+
+    async def retrieve():
+        assert await content_retrieval_service._retrieve_with_http(f"{stub_server}/slow") is None
+        return await content_retrieval_service._retrieve_with_browser(f"{stub_server}/slow")
+    assert _run(retrieve()).startswith("Error:")
+    counts = _host_counts(stub_server)
+    assert (counts["ok"], counts["error"]) == (0, 1)
+
+
+def test_browser_tier_counts_server_errors(stub_server, monkeypatch):
+    async def run(page_fn, **context_options):
+        return await page_fn(_FakePage(status=503))
+    monkeypatch.setattr(content_retrieval_service.browser_pool, "run", run)
+    _run(content_retrieval_service._retrieve_with_browser(f"{stub_server}/status/503"))
+    assert _host_counts(stub_server)["error"] == 1
@@ -0,0 +1,233 @@
+# /home/ubuntu/fact_checker_backend/tests/test_job_queue.py
+"""
+Tests for the SQLite verification job queue (src/services/job_queue.py) against a temporary
+database file: claim order, priority lanes, depth limits (429), stale re-claims, the
+JOB_MAX_ATTEMPTS limit and the workers surviving database errors.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from src.routes import verify_api
+from src.services import job_queue as job_queue_module
+from src.services.job_queue import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+    JobQueue,
+    QueueFullError,
+    _JobTable,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+
+@pytest.fixture
+def table(db_path):
+    return _JobTable(db_path)
+
+
+def _claim_all(table, stale_before=0.0, max_attempts=3):
+    claimed = []
+    while (job := table.claim(stale_before, max_attempts)) is not None:
+        claimed.append(job[0])
+    return claimed
+
+
+def test_claims_by_lane_then_oldest_first(table):
+    for job_id, lane in [("low-1", "low"), ("normal-1", "normal"), ("high-1", "high"),
+                         ("normal-2", "normal"), ("high-2", "high"), ("low-2", "low")]:
+        assert table.insert(job_id, f"statement {job_id}", lane, 10, 10)
+        time.sleep(0.001) # Distinct created_at
+    assert _claim_all(table) == ["high-1", "high-2", "normal-1", "normal-2", "low-1", "low-2"]
+
+
+def test_claim_returns_statement_and_marks_running(table):
+    table.insert("a", "The moon is made of rock", "normal", 10, 10)
+    assert table.claim(0.0, 3) == ("a", "The moon is made of rock")
+    row, ahead = table.get("a")
+    assert row[3] == STATUS_RUNNING and ahead is None
+    assert table.claim(0.0, 3) is None # Running and not stale
+
+
+def test_queue_position_counts_jobs_ahead(table):
+    table.insert("n1", "s", "normal", 10, 10)
+    table.insert("n2", "s", "normal", 10, 10)
+    table.insert("h1", "s", "high", 10, 10)
+    assert table.get("n2")[1] == 2 # h1 and n1
+    assert table.get("h1")[1] == 0
+
+
+def test_insert_respects_lane_and_queue_depth(table):
+    assert table.insert("l1", "s", "low", 1, 3)
+    assert not table.insert("l2", "s", "low", 1, 3) # Lane full
+    assert table.insert("n1", "s", "normal", 3, 3)
+    assert table.insert("n2", "s", "normal", 3, 3)
+    assert not table.insert("n3", "s", "normal", 3, 3) # Queue full
+
+
+def test_stale_running_job_is_claimed_again(table):
+    table.insert("a", "s", "normal", 10, 10)
+    assert table.claim(0.0, 3)[0] == "a"
+    assert table.claim(time.time() - 60, 3) is None # Started just now: not stale yet
+    assert table.claim(time.time() + 1, 3)[0] == "a" # Everything started before now + 1 s is stale
+
+
+def test_job_fails_after_max_attempts(table):
+    table.insert("a", "s", "normal", 10, 10)
+    for _ in range(3):
+        assert table.claim(time.time() + 1, 3)[0] == "a"
+    assert table.claim(time.time() + 1, 3) is None
+    row, _ = table.get("a")
+    assert row[3] == STATUS_FAILED
+    assert row[5] == "The job did not finish in 3 attempts"
+
+
+def test_adds_attempts_column_to_existing_table(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE verify_jobs (id TEXT PRIMARY KEY, statement TEXT NOT NULL, lane TEXT NOT NULL,"
+        " priority INTEGER NOT NULL, status TEXT NOT NULL, result TEXT, error TEXT, created_at REAL NOT NULL,"
+        " started_at REAL, finished_at REAL)")
+    conn.execute("INSERT INTO verify_jobs VALUES ('old', 's', 'normal', 1, 'queued', NULL, NULL, 0, NULL, NULL)")
+    conn.commit()
+    conn.close()
+    table = _JobTable(db_path)
+    assert table.claim(0.0, 3) == ("old", "s")
+
+
+def test_purge_finished_keeps_recent_and_unfinished_jobs(table):
+    for job_id in ("done", "failed", "queued"):
+        table.insert(job_id, "s", "normal", 10, 10)
+    table.finish("done", STATUS_DONE, result="{}")
+    table.finish("failed", STATUS_FAILED, error="boom")
+    table.purge_finished(time.time() - 60)
+    assert table.get("done")[0] is not None
+    table.purge_finished(time.time() + 1)
+    assert table.get("done")[0] is None and table.get("failed")[0] is None
+    assert table.get("queued")[0] is not None
+
+
+def test_submit_rejects_unknown_and_non_string_priorities(db_path):
+    queue = JobQueue(db_path=db_path)
+    for lane in ("urgent", ["high"], None):
+        with pytest.raises(ValueError):
+            asyncio.run(queue.submit("s", lane))
+
+
+def test_submit_raises_queue_full_at_depth_limit(db_path, monkeypatch):
+    monkeypatch.setitem(job_queue_module.LANE_MAX_DEPTH, "low", 1)
+    queue = JobQueue(db_path=db_path, max_depth=2)
+
+    async def submit_all():
+        await queue.submit("s", "low")
+        with pytest.raises(QueueFullError):
+            await queue.submit("s", "low") # The low lane only gets part of the queue
+        await queue.submit("s", "high")
+        with pytest.raises(QueueFullError):
+            await queue.submit("s", "high")
+    asyncio.run(submit_all())
+    assert queue.rejected == 2
+
+
+def test_submit_route_answers_429_when_full(db_path, monkeypatch):
+    from src.main import app
+    monkeypatch.setattr(verify_api, "job_queue", JobQueue(db_path=db_path, max_depth=1))
+
+    async def post_twice():
+        client = app.test_client()
+        first = await client.post("/api/verify/jobs", json={"statement": "The sky is blue"})
+        second = await client.post("/api/verify/jobs", json={"statement": "The sky is green"})
+        bad = await client.post("/api/verify/jobs", json={"statement": "s", "priority": ["high"]})
+        return first, second, bad
+    first, second, bad = asyncio.run(post_twice())
+    assert first.status_code == 202
+    assert second.status_code == 429 and second.headers["Retry-After"] == "5"
+    assert bad.status_code == 400
+
+
+def _run_workers(queue, coro_fn):
+    async def main():
+        await queue.start()
+        try:
+            return await coro_fn()
+        finally:
+            await queue.stop()
+    return asyncio.run(main())
+
+
+async def _wait_for_status(queue, job_id, status, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await queue.get(job_id)
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} is still {job['status']}, expected {status}")
+
+
+def test_worker_runs_jobs_and_wakes_on_submit(db_path, monkeypatch):
+    async def verify(statement):
+        return {"statement": statement, "is_true": True}
+    monkeypatch.setattr(job_queue_module, "verify_statement", verify)
+    monkeypatch.setattr(job_queue_module, "JOB_POLL_INTERVAL_S", 30) # Only the wakeup can start the job in time
+    queue = JobQueue(db_path=db_path, workers=1)
+
+    async def scenario():
+        await asyncio.sleep(0.05) # The worker is idle, waiting
+        job_id = await queue.submit("The sky is blue")
+        job = await _wait_for_status(queue, job_id, STATUS_DONE)
+        assert job["result"] == {"statement": "The sky is blue", "is_true": True}
+    _run_workers(queue, scenario)
+
+
+def test_worker_records_failed_jobs(db_path, monkeypatch):
+    async def verify(statement):
+        raise RuntimeError("search backend down")
+    monkeypatch.setattr(job_queue_module, "verify_statement", verify)
+    queue = JobQueue(db_path=db_path, workers=1)
+
+    async def scenario():
+        job_id = await queue.submit("s")
+        job = await _wait_for_status(queue, job_id, STATUS_FAILED)
+        assert "search backend down" in job["error"]
+    _run_workers(queue, scenario)
+
+
+def test_worker_survives_database_errors(db_path, monkeypatch):
+    async def verify(statement):
+        return {"is_true": True}
+    monkeypatch.setattr(job_queue_module, "verify_statement", verify)
+    monkeypatch.setattr(job_queue_module, "JOB_ERROR_BACKOFF_S", 0.01)
+    monkeypatch.setattr(job_queue_module, "JOB_POLL_INTERVAL_S", 0.01)
+    queue = JobQueue(db_path=db_path, workers=1)
+    table = queue._get_table()
+    failures = {"claim": 2, "finish": 1}
+    claim, finish = table.claim, table.finish
+
+    def flaky(name, method):
+        def call(*args, **kwargs):
+            if failures[name]:
+                failures[name] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            return method(*args, **kwargs)
+        return call
+    monkeypatch.setattr(table, "claim", flaky("claim", claim))
+    monkeypatch.setattr(table, "finish", flaky("finish", finish))
+    monkeypatch.setattr(job_queue_module, "JOB_STALE_AFTER_S", 0.05) # The job whose finish failed is re-run
+
+    async def scenario():
+        job_id = await queue.submit("s")
+        await _wait_for_status(queue, job_id, STATUS_DONE)
+        assert failures == {"claim": 0, "finish": 0}
+        assert all(not task.done() for task in queue._tasks)
+    _run_workers(queue, scenario)
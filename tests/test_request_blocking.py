@@ -0,0 +1,72 @@
+# /home/ubuntu/fact_checker_backend/tests/test_request_blocking.py
+"""
+Tests for the browser request filter (src/services/request_blocking.py): blocking decisions,
+what install() routes by default and with route_by_url, and the opt-in URL pattern.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.lexicons import DomainIndex
+from src.services.request_blocking import ALLOWED, BLOCKED_HOST, BLOCKED_TYPE, RequestFilter
+
+BLOCKED_HOSTS = DomainIndex(["doubleclick.net", "google-analytics.com"])
+
+
+class _FakePage:
+    def __init__(self):
+        self.routes = []
+
+    async def route(self, url, handler):
+        self.routes.append(url)
+
+
+@pytest.mark.parametrize("resource_type, url, main_document, decision", [
+    ("image", "https://cdn.example.com/image?id=3", False, BLOCKED_TYPE),
+    ("stylesheet", "https://example.com/site.css", False, BLOCKED_TYPE),
+    ("font", "https://fonts.example.com/f", False, BLOCKED_TYPE),
+    ("script", "https://stats.g.doubleclick.net/x.js", False, BLOCKED_HOST),
+    ("script", "https://notdoubleclick.net/x.js", False, ALLOWED),
+    ("script", "https://example.com/app.js", False, ALLOWED),
+    ("xhr", "https://example.com/api/data", False, ALLOWED),
+    ("document", "https://doubleclick.net/landing", True, ALLOWED), # The page itself is always loaded
+])
+def test_decide(resource_type, url, main_document, decision):
+    assert RequestFilter(blocked_hosts=BLOCKED_HOSTS).decide(resource_type, url, main_document) == decision
+
+
+def test_install_routes_every_request_by_default():
+    page = _FakePage()
+    asyncio.run(RequestFilter(blocked_hosts=BLOCKED_HOSTS).install(page))
+    assert page.routes == ["**/*"]
+
+
+def test_install_routes_blockable_urls_with_route_by_url():
+    request_filter = RequestFilter(blocked_hosts=BLOCKED_HOSTS, route_by_url=True)
+    page = _FakePage()
+    asyncio.run(request_filter.install(page))
+    assert page.routes == [request_filter.route_pattern()]
+
+
+@pytest.mark.parametrize("url, routed", [
+    ("https://stats.g.doubleclick.net/x.js", True),
+    ("https://www.google-analytics.com:443/collect", True),
+    ("https://notdoubleclick.net/x.js", False),
+    ("https://doubleclick.net.evil.com/", False),
+    ("https://cdn.example.com/img.JPG?w=200", True),
+    ("https://example.com/a.css#x", True),
+    ("https://example.com/a.css/b", False),
+    ("https://example.com/app.js", False),
+    ("https://cdn.example.com/image?id=3", False), # Why route_by_url is opt-in: this image loads
+])
+def test_route_pattern(url, routed):
+    pattern = RequestFilter(blocked_hosts=BLOCKED_HOSTS, route_by_url=True).route_pattern()
+    assert bool(pattern.search(url)) == routed
+
+
+def test_route_pattern_is_none_when_nothing_can_be_blocked():
+    assert RequestFilter(blocked_types=(), blocked_hosts=DomainIndex([])).route_pattern() is None
@@ -0,0 +1,219 @@
+# /home/ubuntu/fact_checker_backend/tests/test_static_assets.py
+"""
+Tests for the static asset manifest (src/services/static_assets.py) and the static route in
+src/main.py against a temporary static folder: Accept-Encoding parsing, representation
+selection, per-encoding ETags, cache headers, 304 revalidation and reloading.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import asyncio
+import gzip
+import os
+
+import pytest
+
+from src import main
+from src.services import static_assets
+from src.services.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    INDEX_CACHE_CONTROL,
+    StaticManifest,
+    _accepted_encodings,
+)
+
+APP_JS = b"function hello() { return 'hello world'; }\n" * 100 # Compressible, over _COMPRESS_MIN_BYTES
+INDEX_HTML = b"<!doctype html><html><body><div id=app></div></body></html>"
+needs_brotli = pytest.mark.skipif(static_assets.brotli is None, reason="brotli is not installed")
+
+
+@pytest.fixture
+def static_folder(tmp_path):
+    (tmp_path / "index.html").write_bytes(INDEX_HTML)
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "app.3f9a1c2b.js").write_bytes(APP_JS)
+    (tmp_path / "logo.png").write_bytes(os.urandom(2048))
+    (tmp_path / ".env").write_text("SECRET=1")
+    return tmp_path
+
+
+@pytest.fixture
+def manifest(static_folder):
+    manifest = StaticManifest(str(static_folder), reload_interval=0)
+    manifest.scan()
+    return manifest
+
+
+@pytest.mark.parametrize("header, accepted", [
+    ("", set()),
+    ("gzip, deflate, br", {"gzip", "deflate", "br"}),
+    ("GZIP;q=0.5, br;q=1.0", {"gzip", "br"}),
+    ("gzip;q=0, br", {"br"}),
+    ("gzip; q=0.0, br;q=0.000", set()),
+    ("*;q=0.1", {"*"}),
+    ("gzip;q=abc, identity", {"identity"}), # An invalid q-value rejects the coding
+])
+def test_accepted_encodings(header, accepted):
+    assert _accepted_encodings(header) == accepted
+
+
+def test_manifest_skips_hidden_files_and_sets_types(manifest):
+    assets = manifest.current()
+    assert sorted(assets) == ["assets/app.3f9a1c2b.js", "index.html", "logo.png"]
+    assert assets["assets/app.3f9a1c2b.js"].mime_type.endswith("/javascript; charset=utf-8") # text/ on some systems
+    assert assets["index.html"].mime_type == "text/html; charset=utf-8"
+    assert manifest.get("/.env") is None and manifest.get("") is None
+
+
+def test_cache_control_by_kind_of_file(manifest):
+    assert manifest.get("index.html").cache_control == INDEX_CACHE_CONTROL
+    assert manifest.get("assets/app.3f9a1c2b.js").cache_control == IMMUTABLE_CACHE_CONTROL # Fingerprinted
+    assert manifest.get("logo.png").cache_control == f"public, max-age={static_assets.STATIC_MAX_AGE_S}"
+
+
+def test_only_compressible_files_get_variants(manifest):
+    app_js = manifest.get("assets/app.3f9a1c2b.js")
+    assert app_js.compressed and gzip.decompress(app_js.bodies["gzip"]) == APP_JS
+    assert not manifest.get("logo.png").compressed # Not a compressible type
+    assert not manifest.get("index.html").compressed # Too small to be worth it
+
+
+@pytest.mark.parametrize("accept_encoding, coding", [
+    ("", "identity"),
+    ("gzip", "gzip"),
+    ("gzip;q=0", "identity"),
+    ("deflate", "identity"),
+    ("*", "gzip"),
+    ("br", "identity"), # No br variant without brotli
+])
+def test_select_without_brotli(manifest, monkeypatch, accept_encoding, coding):
+    asset = manifest.get("assets/app.3f9a1c2b.js")
+    monkeypatch.delitem(asset.bodies, "br", raising=False)
+    selected, body = asset.select(accept_encoding)
+    assert selected == coding and body == asset.bodies[coding]
+
+
+@needs_brotli
+@pytest.mark.parametrize("accept_encoding, coding", [
+    ("gzip, br", "br"), # The smallest accepted
+    ("gzip, br;q=0", "gzip"),
+    ("*", "br"),
+])
+def test_select_prefers_brotli(manifest, accept_encoding, coding):
+    assert manifest.get("assets/app.3f9a1c2b.js").select(accept_encoding)[0] == coding
+
+
+def test_every_representation_etag_matches(manifest):
+    asset = manifest.get("assets/app.3f9a1c2b.js")
+    etags = [asset.etag_for(coding) for coding in ("identity", "gzip", "br")]
+    assert len(set(etags)) == 3 and etags[0] == asset.etag
+    for etag in etags:
+        assert asset.matches(etag)
+        assert asset.matches(f"W/{etag}") # Weak comparison, as proxies may rewrite the tag
+        assert asset.matches(f'"other", {etag}')
+    assert asset.matches("*")
+    assert not asset.matches("")
+    assert not asset.matches('"other", "other-gzip"')
+    assert not asset.matches(manifest.get("index.html").etag) # Another file
+    assert not asset.matches(f'"{asset.etag[1:-2]}-gzip"') # Another version sharing a prefix
+
+
+def test_changed_file_gets_a_new_etag_after_reload(static_folder):
+    manifest = StaticManifest(str(static_folder), reload_interval=0.01)
+    old = manifest.get("index.html")
+    unchanged = manifest.get("logo.png")
+    (static_folder / "index.html").write_bytes(INDEX_HTML.replace(b"app", b"root"))
+    os.utime(static_folder / "index.html", ns=(old.mtime_ns + 10**9, old.mtime_ns + 10**9))
+    asyncio.run(asyncio.sleep(0.02))
+    new = manifest.get("index.html")
+    assert new.etag != old.etag and not new.matches(old.etag)
+    assert manifest.get("logo.png") is unchanged # Unchanged files are not rebuilt
+
+
+def test_large_files_are_served_from_disk(static_folder, monkeypatch):
+    monkeypatch.setattr(static_assets, "STATIC_MAX_INLINE_BYTES", 1024)
+    manifest = StaticManifest(str(static_folder))
+    asset = manifest.get("assets/app.3f9a1c2b.js")
+    assert not asset.in_memory and not asset.compressed
+    assert asset.etag == f'"{static_assets._file_digest(asset.full_path, APP_JS)}"' # Same hash as in memory
+
+
+def _get(path, headers=None):
+    async def request():
+        return await main.app.test_client().get(path, headers=headers or {})
+    return asyncio.run(request())
+
+
+async def _body(response):
+    return await response.get_data()
+
+
+@pytest.fixture
+def served(manifest, monkeypatch):
+    monkeypatch.setattr(main, "static_manifest", manifest)
+    return manifest
+
+
+def test_route_serves_compressed_body_with_headers(served):
+    response = _get("/assets/app.3f9a1c2b.js", {"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["ETag"] == served.get("assets/app.3f9a1c2b.js").etag_for("gzip")
+    assert gzip.decompress(asyncio.run(_body(response))) == APP_JS
+
+
+def test_route_serves_identity_when_gzip_is_refused(served):
+    response = _get("/assets/app.3f9a1c2b.js", {"Accept-Encoding": "gzip;q=0"})
+    assert response.status_code == 200 and "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == served.get("assets/app.3f9a1c2b.js").etag
+    assert asyncio.run(_body(response)) == APP_JS
+
+
+def test_route_falls_back_to_index_for_client_side_routes(served):
+    response = _get("/claims/42")
+    assert response.status_code == 200 and asyncio.run(_body(response)) == INDEX_HTML
+    assert response.headers["Cache-Control"] == INDEX_CACHE_CONTROL
+    assert "Vary" not in response.headers
+
+
+@pytest.mark.parametrize("cached_coding, accept_encoding", [
+    ("gzip", "gzip"),
+    ("identity", "gzip"), # Cached before the client accepted gzip: still the same version
+    ("gzip", ""),
+])
+def test_route_answers_304_for_any_representation_etag(served, cached_coding, accept_encoding):
+    asset = served.get("assets/app.3f9a1c2b.js")
+    response = _get("/assets/app.3f9a1c2b.js", {"Accept-Encoding": accept_encoding,
+                                                 "If-None-Match": asset.etag_for(cached_coding)})
+    assert response.status_code == 304
+    assert asyncio.run(_body(response)) == b""
+    # The 304 carries the ETag of the representation the request would get, and the cache headers
+    expected_coding = "gzip" if accept_encoding else "identity"
+    assert response.headers["ETag"] == asset.etag_for(expected_coding)
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_route_answers_200_for_a_stale_etag(served):
+    response = _get("/index.html", {"If-None-Match": '"0123456789abcdef01234567"'})
+    assert response.status_code == 200 and asyncio.run(_body(response)) == INDEX_HTML
+
+
+def test_route_sends_large_files_from_disk(static_folder, monkeypatch):
+    monkeypatch.setattr(static_assets, "STATIC_MAX_INLINE_BYTES", 1024)
+    monkeypatch.setattr(main, "static_manifest", StaticManifest(str(static_folder)))
+    response = _get("/assets/app.3f9a1c2b.js", {"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and "Content-Encoding" not in response.headers
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["ETag"] == main.static_manifest.get("assets/app.3f9a1c2b.js").etag
+    assert asyncio.run(_body(response)) == APP_JS
+
+
+def test_route_without_static_files_reports_status(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "static_manifest", StaticManifest(str(tmp_path / "missing")))
+    response = _get("/")
+    assert response.status_code == 200
+    assert asyncio.run(response.get_json()) == {"status": "Fact Checker API is running"}
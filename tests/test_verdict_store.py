@@ -0,0 +1,153 @@
+# /home/ubuntu/fact_checker_backend/tests/test_verdict_store.py
+"""
+Tests for the persistent verdict store (src/services/verdict_store.py) and its claim index
+(src/services/claim_index.py) against an in-memory SQLite database: exact and MinHash LSH
+near-duplicate lookups, the same-content-words rule, TTL expiry and retention purges.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import OperationalError
+
+from src.models.verdict import Verdict, VerdictBand
+from src.services.claim_index import band_keys, is_near_duplicate, minhash_signature, normalize_claim, shingles
+from src.services.verdict_store import VerdictStore
+
+CLAIM = "The Great Wall of China is visible from space with the naked eye"
+RESULT = {"is_true": False, "confidence_score": 85, "reasoning": "Astronauts report it is not visible.",
+          "supporting_snippets": ["not visible to the naked eye"], "sources": [{"url": "https://nasa.gov/a", "tier": 1}]}
+SOURCE_SCORES = [{"url": "https://nasa.gov/a", "score": 0.9, "stance": "refutes"}]
+
+
+@pytest.fixture
+def store():
+    return VerdictStore(url="sqlite://", ttl=3600, threshold=0.8, retention=7200)
+
+
+def _keys(statement):
+    return set(band_keys(minhash_signature(shingles(normalize_claim(statement)))))
+
+
+def _age(store, seconds):
+    """Moves every stored verdict `seconds` into the past."""
+    with store._session() as session:
+        session.execute(update(Verdict).values(created_at=Verdict.created_at - seconds))
+        session.commit()
+
+
+def _count(store, model):
+    with store._session() as session:
+        return session.scalar(select(func.count()).select_from(model))
+
+
+def test_minhash_signature_is_deterministic():
+    signature = minhash_signature(shingles(normalize_claim(CLAIM)))
+    assert len(signature) == 64
+    assert (signature == minhash_signature(shingles(normalize_claim(CLAIM)))).all()
+    assert len(_keys(CLAIM)) == 16
+
+
+@pytest.mark.parametrize("statement, shared_bands", [
+    ("the great wall of china is visible from space with a naked eye", True), # Near duplicate
+    ("Water boils at 100 degrees Celsius at sea level", False),
+])
+def test_band_keys_collide_for_similar_claims_only(statement, shared_bands):
+    assert bool(_keys(CLAIM) & _keys(statement)) == shared_bands
+
+
+@pytest.mark.parametrize("statement, duplicate", [
+    ("the great wall of china is visible from space with a naked eye", True), # Function words only
+    ("The Great Wall of China is visible from the space with the naked eye", True),
+    ("The Great Wall of China is invisible from space with the naked eye", False), # Similarity 0.85, different word
+    ("The Great Wall of China is not visible from space with the naked eye", False), # Negations count
+    ("The Great Wall of China is visible from orbit with the naked eye", False),
+])
+def test_near_duplicates_need_the_same_content_words(statement, duplicate):
+    assert is_near_duplicate(normalize_claim(CLAIM), normalize_claim(statement), 0.8)[0] == duplicate
+
+
+def test_numbers_are_content_words():
+    a, b = normalize_claim("Einstein was born in March 1879"), normalize_claim("Einstein was born in March 1897")
+    assert not is_near_duplicate(a, b, 0.5)[0]
+
+
+def test_exact_lookup_ignores_case_and_punctuation(store):
+    async def scenario():
+        assert await store.lookup(CLAIM) is None
+        await store.save(CLAIM, RESULT, SOURCE_SCORES)
+        return await store.lookup("the great wall of china is visible from space, with the naked eye!")
+    match = asyncio.run(scenario())
+    assert match["similarity"] == 1.0
+    verdict = match["verdict"]
+    assert verdict["statement"] == CLAIM and verdict["is_true"] is False and verdict["confidence_score"] == 85
+    assert verdict["source_scores"] == SOURCE_SCORES
+    assert store.counters["misses"] == 1 and store.counters["exact_hits"] == 1 and store.counters["stores"] == 1
+
+
+def test_near_duplicate_lookup_uses_the_band_index(store):
+    async def scenario():
+        await store.save(CLAIM, RESULT, SOURCE_SCORES)
+        await store.save("Water boils at 100 degrees Celsius at sea level", {"is_true": True}, [])
+        return (await store.lookup("the great wall of china is visible from space with a naked eye"),
+                await store.lookup("The Great Wall of China is invisible from space with the naked eye"))
+    near, different = asyncio.run(scenario())
+    assert near["verdict"]["statement"] == CLAIM and 0.8 <= near["similarity"] < 1.0
+    assert different is None
+    assert store.counters["near_duplicate_hits"] == 1 and store.counters["misses"] == 1
+    assert _count(store, VerdictBand) == len(_keys(CLAIM)) + len(_keys("Water boils at 100 degrees Celsius at sea level"))
+
+
+def test_near_duplicate_lookup_prefers_the_most_similar_verdict(store):
+    closer = "The Great Wall of China is visible from the space with the naked eye"
+
+    async def scenario():
+        await store.save(CLAIM, RESULT, SOURCE_SCORES)
+        await store.save(closer, {"is_true": True}, [])
+        return await store.lookup("The Great Wall of China is visible from the space with a naked eye")
+    match = asyncio.run(scenario())
+    assert match["verdict"]["statement"] == closer
+
+
+def test_verdicts_older_than_the_ttl_are_not_served(store):
+    asyncio.run(store.save(CLAIM, RESULT, SOURCE_SCORES))
+    _age(store, 3000)
+    assert asyncio.run(store.lookup(CLAIM)) is not None
+    _age(store, 1000) # 4000 s old, TTL 3600 s
+    assert asyncio.run(store.lookup(CLAIM)) is None
+    assert asyncio.run(store.lookup("the great wall of china is visible from space with a naked eye")) is None
+    assert _count(store, Verdict) == 1 # Expired, but kept until the retention period ends
+
+
+def test_purge_expired_deletes_verdicts_past_retention_with_their_bands(store):
+    async def scenario():
+        await store.save(CLAIM, RESULT, SOURCE_SCORES)
+        _age(store, 8000) # Past the 7200 s retention
+        await store.save("Water boils at 100 degrees Celsius at sea level", {"is_true": True}, [])
+    asyncio.run(scenario())
+    assert store.purge_expired() == 1
+    assert _count(store, Verdict) == 1
+    assert _count(store, VerdictBand) == len(_keys("Water boils at 100 degrees Celsius at sea level"))
+    assert store.counters["purged"] == 1
+
+
+def test_disabled_store_is_a_miss():
+    store = VerdictStore(url="")
+    assert not store.enabled
+    asyncio.run(store.save(CLAIM, RESULT, SOURCE_SCORES))
+    assert asyncio.run(store.lookup(CLAIM)) is None
+    assert store.stats()["enabled"] is False and store.counters["stores"] == 0
+
+
+def test_database_errors_are_logged_as_misses(store, monkeypatch):
+    def broken(*args, **kwargs):
+        raise OperationalError("SELECT", {}, Exception("database is locked"))
+    monkeypatch.setattr(store, "_lookup", broken)
+    monkeypatch.setattr(store, "_save", broken)
+    asyncio.run(store.save(CLAIM, RESULT, SOURCE_SCORES))
+    assert asyncio.run(store.lookup(CLAIM)) is None
+    assert store.counters["errors"] == 2